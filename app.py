@@ -1,3 +1,5 @@
+import asyncio
+
 import telebot
 from telebot import custom_filters
 from telebot.storage import StateMemoryStorage
@@ -5,42 +7,106 @@ from telebot.storage import StateMemoryStorage
 from config.bot_config import BotConfig
 from config.logging_config import setup_logger
 from database.db_manager import db_manager
+from database.migrations import run_migrations
+from utils.helpers import locale_registry
+from utils.text_router import text_router
+from utils.image_store import image_store
+from utils.rate_limiter import outbound_limiter
+from utils.update_dispatcher import UpdateDispatcher
+from utils.webhook_server import WebhookServer
+from utils.handler_io import SyncHandlerIO
+from middlewares import request_context
+from middlewares.request_context import RequestContextMiddleware
 
 # Настройка логгера
 logger = setup_logger()
 
 # Инициализация бота
 state_storage = StateMemoryStorage()
-bot = telebot.TeleBot(BotConfig.TOKEN, state_storage=state_storage)
-
-# Удаляем вебхук перед запуском long polling
-bot.remove_webhook()
+# Обработчики выполняются потоками диспетчера, а не общим пулом бота
+bot = telebot.TeleBot(
+    BotConfig.TOKEN,
+    state_storage=state_storage,
+    use_class_middlewares=True,
+    threaded=False
+)
+# Обновления одного чата обрабатываются по порядку, разных чатов - параллельно
+dispatcher = UpdateDispatcher(bot)
 
 # Импортируем модели перед созданием таблиц
 from database.models import User, Product, Order, OrderItem, Payment, Feedback
 
-# Создание таблиц в БД, если их нет
+# Создание таблиц в БД, если их нет, и применение миграций схемы
 db_manager.create_tables()
+run_migrations(db_manager.engine)
+
+# Загрузка всех локализаций в память
+locale_registry.load()
 
 # Импорт обработчиков
-from handlers import admin_handlers, catalog_handlers, common_handlers, order_handlers, payment_handlers
+from handlers import admin_handlers, catalog_handlers, common_handlers, inline_handlers, order_handlers, payment_handlers
+from services.user_service import UserService
+from services.catalog_service import CatalogService
+from services.order_service import OrderService
 
-if __name__ == '__main__':
-    logger.info("Запуск бота магазина...")
+def start_bot():
+    """Запуск синхронного бота (polling или webhook)"""
+    if BotConfig.BOT_MODE == 'webhook' and not BotConfig.WEBHOOK_URL:
+        # setWebhook с пустым URL удаляет вебхук: сервер запустился бы, но не получил ни одного обновления
+        raise ValueError("WEBHOOK_URL is required for BOT_MODE=webhook")
+    
+    # Процессы обработки изображений запускаются до потоков бота
+    image_store.start()
     
     # Регистрация фильтров
     bot.add_custom_filter(custom_filters.StateFilter(bot))
     
-    # Регистрация обработчиков
-    common_handlers.register_common_handlers(bot)
-    catalog_handlers.register_catalog_handlers(bot)
-    admin_handlers.register_admin_handlers(bot)
+    # Профиль пользователя загружается один раз на обновление
+    bot.setup_middleware(RequestContextMiddleware())
+    
+    # Регистрация обработчиков (общих с asyncio-режимом) с синхронными ботом и сервисами
+    io = SyncHandlerIO(bot, UserService(), CatalogService(), OrderService(), request_context, text_router)
+    common_handlers.register_common_handlers(bot, io)
+    catalog_handlers.register_catalog_handlers(bot, io)
+    admin_handlers.register_admin_handlers(bot, io)
+    inline_handlers.register_inline_handlers(bot, io)
     
     # Добавьте регистрацию остальных обработчиков, когда они будут готовы
     order_handlers.register_order_handlers(bot)
     payment_handlers.register_payment_handlers(bot)
     
+    # Единый обработчик текстовых кнопок регистрируется последним,
+    # чтобы обработчики состояний имели приоритет
+    text_router.register(bot)
+    
+    # Исходящие сообщения проходят через ограничитель, чтобы не получать 429
+    if BotConfig.RATE_LIMIT_ENABLED:
+        outbound_limiter.install()
+    
+    dispatcher.install()
+    
     logger.info("Бот запущен...")
     
     # Запуск бота
-    bot.infinity_polling(skip_pending=True)
\ No newline at end of file
+    if BotConfig.BOT_MODE == 'webhook':
+        bot.set_webhook(
+            url=BotConfig.WEBHOOK_URL,
+            secret_token=BotConfig.WEBHOOK_SECRET,
+            max_connections=BotConfig.WEBHOOK_MAX_CONNECTIONS,
+            drop_pending_updates=True
+        )
+        WebhookServer(dispatcher).serve_forever()
+    else:
+        # Удаляем вебхук перед запуском long polling
+        bot.remove_webhook()
+        bot.infinity_polling(skip_pending=True)
+
+if __name__ == '__main__':
+    logger.info("Запуск бота магазина...")
+    
+    if BotConfig.BOT_MODE == 'async':
+        # Asyncio-режим: AsyncTeleBot с асинхронными сервисами поверх тех же локализаций и клавиатур
+        from async_app import run_async_bot
+        asyncio.run(run_async_bot())
+    else:
+        start_bot()
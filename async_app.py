@@ -0,0 +1,83 @@
+from telebot import asyncio_filters
+from telebot.async_telebot import AsyncTeleBot
+from telebot.asyncio_storage import StateMemoryStorage
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from database.async_db_manager import async_db_manager
+from handlers import admin_handlers, catalog_handlers, common_handlers, inline_handlers
+from middlewares import async_request_context
+from middlewares.async_request_context import AsyncRequestContextMiddleware
+from services.async_catalog_service import AsyncCatalogService
+from services.async_order_service import AsyncOrderService
+from services.async_user_service import AsyncUserService
+from utils.handler_io import AsyncHandlerIO
+from utils.rate_limiter import outbound_limiter
+from utils.text_router import async_text_router
+from utils.update_dispatcher import AsyncUpdateDispatcher
+
+# Настройка логгера
+logger = setup_logger()
+
+def setup_async_bot(bot):
+    """Фильтры, middleware, обработчики и диспетчер обновлений asyncio-режима.
+    
+    Обработчики общие с синхронным режимом. Возвращает (ввод-вывод обработчиков, диспетчер обновлений)
+    """
+    # Регистрация фильтров
+    bot.add_custom_filter(asyncio_filters.StateFilter(bot))
+    
+    # Профиль пользователя загружается один раз на обновление
+    bot.setup_middleware(AsyncRequestContextMiddleware())
+    
+    # Регистрация обработчиков с асинхронными сервисами
+    io = AsyncHandlerIO(
+        bot,
+        AsyncUserService(),
+        AsyncCatalogService(),
+        AsyncOrderService(),
+        async_request_context,
+        async_text_router
+    )
+    common_handlers.register_common_handlers(bot, io)
+    catalog_handlers.register_catalog_handlers(bot, io)
+    admin_handlers.register_admin_handlers(bot, io)
+    inline_handlers.register_inline_handlers(bot, io)
+    
+    # Единый обработчик текстовых кнопок регистрируется последним,
+    # чтобы обработчики состояний имели приоритет
+    async_text_router.register(bot)
+    
+    # Обновления одного чата (в том числе шаги FSM) обрабатываются по очереди
+    dispatcher = AsyncUpdateDispatcher(bot)
+    dispatcher.install()
+    return io, dispatcher
+
+async def run_async_bot():
+    """Запуск бота в asyncio-режиме (BOT_MODE=async).
+    
+    Обработчики - корутины, запросы к БД идут через пул соединений aiosqlite,
+    поэтому одновременные диалоги не требуют ни потоков, ни соединений на каждый.
+    Таблицы и миграции, как и в синхронном режиме, создаются в app.py.
+    """
+    bot = AsyncTeleBot(BotConfig.TOKEN, state_storage=StateMemoryStorage())
+    
+    # Проверяем драйвер БД до запуска: без aiosqlite режим не работает
+    async_db_manager.engine
+    
+    io, dispatcher = setup_async_bot(bot)
+    
+    # Исходящие сообщения проходят через ограничитель, чтобы не получать 429
+    if BotConfig.RATE_LIMIT_ENABLED:
+        outbound_limiter.install_async()
+    
+    logger.info("Бот запущен в asyncio-режиме...")
+    
+    try:
+        # Удаляем вебхук перед запуском long polling
+        await bot.delete_webhook()
+        await bot.infinity_polling(skip_pending=True)
+    finally:
+        await dispatcher.drain()
+        await bot.close_session()
+        await async_db_manager.dispose()
@@ -0,0 +1,98 @@
+"""Пропускная способность SQLite: записи и чтения через CatalogService из нескольких потоков.
+
+Сравнивает профиль SQLite из конфигурации (SQLITE_*) с журналом отката и synchronous=FULL.
+Каждый профиль запускается в отдельном процессе на новой базе во временном каталоге:
+
+    python -m benchmarks.db_throughput --seconds 5 --writers 4 --readers 4
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Переменные окружения профилей; 'config' - настройки из конфигурации как есть
+PROFILES = {
+    'rollback': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_CACHE_SIZE': '-2000',
+        'SQLITE_TEMP_STORE': 'DEFAULT',
+    },
+    'config': {},
+}
+
+def run_profile(seconds, writers, readers, products):
+    """Нагрузка в текущем процессе (база и профиль берутся из окружения). Возвращает число записей и чтений"""
+    from database.db_manager import db_manager
+    from database.migrations import run_migrations
+    from database.models import Product  # noqa: F401 - модели регистрируются перед созданием таблиц
+    from services.catalog_service import CatalogService
+
+    db_manager.create_tables()
+    run_migrations(db_manager.engine)
+    catalog = CatalogService()
+    ids = [catalog.create_product(f"Product {number}", 10.0, description="Benchmark product").id for number in range(products)]
+
+    counts = {'writes': 0, 'reads': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def write():
+        done = 0
+        while time.monotonic() < deadline:
+            catalog.update_product(random.choice(ids), price=round(random.uniform(1, 100), 2))
+            done += 1
+        with lock:
+            counts['writes'] += done
+
+    def read():
+        done = 0
+        while time.monotonic() < deadline:
+            catalog.get_products_page(after_id=random.choice(ids), available_only=False)
+            done += 1
+        with lock:
+            counts['reads'] += done
+
+    threads = [threading.Thread(target=write) for _ in range(writers)]
+    threads += [threading.Thread(target=read) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Пропускная способность SQLite при разных профилях")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Длительность нагрузки на профиль")
+    parser.add_argument('--writers', type=int, default=4, help="Потоков записи")
+    parser.add_argument('--readers', type=int, default=4, help="Потоков чтения")
+    parser.add_argument('--products', type=int, default=100, help="Товаров в каталоге")
+    parser.add_argument('--profile', choices=sorted(PROFILES), action='append', help="Профиль (по умолчанию все)")
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_profile(args.seconds, args.writers, args.readers, args.products)))
+        return 0
+
+    for name in args.profile or list(PROFILES):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}", **PROFILES[name])
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.db_throughput', '--run',
+                 '--seconds', str(args.seconds), '--writers', str(args.writers),
+                 '--readers', str(args.readers), '--products', str(args.products)],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+        counts = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:>8}: {counts['writes'] / args.seconds:8.0f} writes/s {counts['reads'] / args.seconds:8.0f} reads/s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
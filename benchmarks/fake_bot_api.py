@@ -0,0 +1,146 @@
+"""Локальная имитация Bot API для бенчмарков: отдает обновления через getUpdates
+и отвечает на остальные методы с заданной задержкой, считая отправленные сообщения.
+
+Бот направляется на нее через apihelper.API_URL = FakeBotAPI.api_url.
+"""
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'Benchmark', 'username': 'benchmark_bot'}
+
+def command_update(update_id, user_id, text):
+    """Обновление с командой text от пользователя user_id (в его личном чате)"""
+    return {'update_id': update_id, 'message': {
+        'message_id': update_id,
+        'date': int(time.time()),
+        'text': text,
+        'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}],
+        'chat': {'id': user_id, 'type': 'private'},
+        'from': {'id': user_id, 'is_bot': False, 'first_name': f"User {user_id}"},
+    }}
+
+class FakeBotAPIHandler(BaseHTTPRequestHandler):
+    """Запрос к методу Bot API: /bot<token>/<method>"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        api = self.server.api
+        url = urlsplit(self.path)
+        method = url.path.rsplit('/', 1)[-1]
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if body and self.headers.get('Content-Type', '').startswith('application/x-www-form-urlencoded'):
+            params.update(parse_qsl(body.decode()))
+
+        result = api.call(method, params)
+        content = json.dumps({'ok': True, 'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+class FakeBotAPIServer(ThreadingHTTPServer):
+    """HTTP-сервер имитации: поток на соединение"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Соединения обрываются, когда процесс бота останавливается
+        pass
+
+class FakeBotAPI:
+    """Имитация Bot API в фоновом потоке. latency - задержка ответа на методы, кроме getUpdates"""
+
+    def __init__(self, latency=0.0, host='127.0.0.1'):
+        self.latency = latency
+        self.httpd = FakeBotAPIServer((host, 0), FakeBotAPIHandler)
+        self.httpd.api = self
+
+        self._lock = threading.Condition()
+        self._updates = []
+        self._message_ids = itertools.count(1)
+        self.calls = {}
+        self.sent = 0
+
+    @property
+    def api_url(self):
+        """Шаблон адреса для apihelper.API_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/bot{{0}}/{{1}}"
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, name='fake-bot-api', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def push(self, updates):
+        """Добавить обновления для getUpdates"""
+        with self._lock:
+            self._updates.extend(updates)
+            self._lock.notify_all()
+
+    def wait_for_call(self, method, timeout):
+        """Дождаться первого вызова метода. Возвращает False по таймауту"""
+        with self._lock:
+            return self._lock.wait_for(lambda: self.calls.get(method), timeout)
+
+    def wait_sent(self, count, timeout):
+        """Дождаться count отправленных сообщений. Возвращает False по таймауту"""
+        with self._lock:
+            return self._lock.wait_for(lambda: self.sent >= count, timeout)
+
+    def call(self, method, params):
+        """Результат метода Bot API"""
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            self._lock.notify_all()
+
+        if method == 'getUpdates':
+            return self._get_updates(int(params.get('offset', 0)), float(params.get('timeout', 0)))
+        if method == 'getMe':
+            return BOT_USER
+
+        if self.latency:
+            time.sleep(self.latency)
+        if not method.startswith('send'):
+            return True
+        message = {
+            'message_id': next(self._message_ids),
+            'date': int(time.time()),
+            'chat': {'id': int(params.get('chat_id', 0)), 'type': 'private'},
+            'text': params.get('text', ''),
+        }
+        with self._lock:
+            self.sent += 1
+            self._lock.notify_all()
+        return message
+
+    def _get_updates(self, offset, timeout):
+        """Обновления начиная с offset; long polling - ждать их не дольше timeout"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                self._updates = [update for update in self._updates if update['update_id'] >= offset]
+                remaining = deadline - time.monotonic()
+                if self._updates or remaining <= 0:
+                    return self._updates[:100]
+                self._lock.wait(remaining)
@@ -0,0 +1,28 @@
+"""Статические reply-клавиатуры: сборка и сериализация на каждую отправку против готового JSON.
+
+    python -m benchmarks.keyboards --runs 20000 --language uk
+"""
+import argparse
+import sys
+import timeit
+
+from keyboards.reply_keyboards import KEYBOARD_BUILDERS, get_keyboard, rebuild_keyboards
+
+def main():
+    parser = argparse.ArgumentParser(description="Микробенчмарк статических клавиатур")
+    parser.add_argument('--runs', type=int, default=20000, help="Повторов на клавиатуру")
+    parser.add_argument('--language', default='uk', help="Язык клавиатур")
+    args = parser.parse_args()
+
+    rebuild_keyboards()
+    for name, build in KEYBOARD_BUILDERS.items():
+        built = timeit.timeit(lambda: build(args.language).to_json(), number=args.runs)
+        prebuilt = timeit.timeit(lambda: get_keyboard(name, args.language), number=args.runs)
+        print(
+            f"{name:>15}: build {built / args.runs * 1e6:6.2f} us, "
+            f"prebuilt {prebuilt / args.runs * 1e6:6.2f} us"
+        )
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Задержка поиска товаров (/search) на каталогах разного размера.
+
+Для каждого размера создается новая база SQLite с миграциями (индекс FTS5 заполняется триггерами),
+товары - случайные слова из украинского и английского словаря. Время - медиана запросов
+страницы результатов через ProductRepository.search_product_ids:
+
+    python -m benchmarks.search --sizes 10000 100000 1000000 --runs 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import database.models  # noqa: F401 - модели регистрируются в Base.metadata
+from config.bot_config import BotConfig
+from database.db_manager import Base
+from database.migrations import run_migrations
+from database.repositories.product_repository import ProductRepository
+
+BASE_WORDS = [
+    'чашка', 'чайник', 'кава', 'чай', 'керамічна', 'біла', 'чорна', 'велика', 'мала', 'подарунок',
+    'набір', 'ложка', 'тарілка', 'скло', 'дерево', 'ручна', 'робота', 'україна', 'сувенір', 'кухня',
+    'cup', 'mug', 'kettle', 'coffee', 'tea', 'ceramic', 'white', 'black', 'large', 'small',
+    'gift', 'set', 'spoon', 'plate', 'glass', 'wooden', 'handmade', 'souvenir', 'kitchen', 'steel',
+]
+SYLLABLES = ['ка', 'ра', 'ні', 'то', 'ле', 'ми', 'ст', 'ов', 'ба', 'ро', 'ma', 'ri', 'to', 'ne', 'la', 'so', 'ke', 'du']
+VOCABULARY_SIZE = 5000
+NAME_WORDS = 3
+DESCRIPTION_WORDS = 12
+
+def make_vocabulary(rng):
+    """Словарь: базовые слова и случайные слова из слогов"""
+    words = list(BASE_WORDS)
+    seen = set(words)
+    while len(words) < VOCABULARY_SIZE:
+        word = ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def fill_products(engine, size, rng, words, chunk=10000):
+    """Вставить size товаров пачками"""
+    sql = text(
+        "INSERT INTO products (name, description, price, available, created_at) "
+        "VALUES (:name, :description, :price, 1, CURRENT_TIMESTAMP)"
+    )
+    for start in range(0, size, chunk):
+        rows = []
+        for _ in range(min(chunk, size - start)):
+            chosen = rng.choices(words, k=NAME_WORDS + DESCRIPTION_WORDS)
+            rows.append({
+                'name': ' '.join(chosen[:NAME_WORDS]),
+                'description': ' '.join(chosen[NAME_WORDS:]),
+                'price': round(rng.uniform(1, 1000), 2),
+            })
+        with engine.begin() as connection:
+            connection.execute(sql, rows)
+
+def median_ms(engine, terms, runs):
+    """Медиана времени запроса первой страницы результатов в миллисекундах"""
+    limit = BotConfig.CATALOG_PAGE_SIZE + 1
+    timings = []
+    with Session(engine) as session:
+        repository = ProductRepository(session)
+        for _ in range(runs):
+            started = time.perf_counter()
+            repository.search_product_ids(terms, limit=limit)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка поиска товаров")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help="Размеры каталога")
+    parser.add_argument('--runs', type=int, default=20, help="Запросов на каждый поиск")
+    parser.add_argument('--seed', type=int, default=1, help="Зерно генератора товаров")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = make_vocabulary(rng)
+    # Каждое слово встречается примерно в (NAME_WORDS + DESCRIPTION_WORDS) / VOCABULARY_SIZE товаров
+    queries = {
+        'one word': [words[0]],
+        'two words': [words[0], words[len(BASE_WORDS) // 2]],
+        'prefix': [words[1][:4]],
+        'missing word': ['відсутнє'],
+    }
+
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, 'search.db')}")
+            Base.metadata.create_all(engine)
+            run_migrations(engine)
+            started = time.perf_counter()
+            fill_products(engine, size, rng, words)
+            print(f"{size} products generated in {time.perf_counter() - started:.1f}s")
+            for name, terms in queries.items():
+                print(f"  {name:>12} {' '.join(terms)!r}: {median_ms(engine, terms, args.runs):7.2f} ms")
+            engine.dispose()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""Пропускная способность приема обновлений: long polling против вебхука.
+
+Бот (app.start_bot) запускается в отдельном процессе против локальной имитации Bot API
+(benchmarks/fake_bot_api.py) с новой базой во временном каталоге. Каждый из --users пользователей
+отправляет /help; в режиме polling обновления отдаются через getUpdates, в режиме webhook -
+отправляются POST-запросами на сервер вебхука через --connections соединений, как это делает Telegram.
+Время - от выдачи первого обновления до последнего ответа бота. Ограничитель исходящих сообщений
+отключен: у имитации нет лимитов Telegram.
+
+    python -m benchmarks.webhook_vs_polling --users 200 --latency 0 0.02
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_bot_api import FakeBotAPI, command_update
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN = '123456:benchmark'
+WEBHOOK_SECRET = 'benchmark-secret'
+WEBHOOK_PATH = '/webhook'
+
+def serve(api_url):
+    """Запуск бота в дочернем процессе (режим и настройки - из окружения)"""
+    from telebot import apihelper
+    apihelper.API_URL = api_url
+
+    import app
+    # app.start_bot регистрирует и модули, обработчики которых еще не готовы - их пропускаем
+    for module, name in ((app.order_handlers, 'register_order_handlers'), (app.payment_handlers, 'register_payment_handlers')):
+        if not hasattr(module, name):
+            setattr(module, name, lambda bot: None)
+    app.start_bot()
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def post_updates(port, updates, connections):
+    """Отправить обновления на вебхук через connections постоянных соединений"""
+    def post_chunk(chunk):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        try:
+            for update in chunk:
+                body = json.dumps(update)
+                connection.request('POST', WEBHOOK_PATH, body, {
+                    'Content-Type': 'application/json',
+                    'X-Telegram-Bot-Api-Secret-Token': WEBHOOK_SECRET,
+                })
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(f"Webhook answered {response.status}")
+        finally:
+            connection.close()
+
+    chunks = [updates[number::connections] for number in range(connections)]
+    with ThreadPoolExecutor(connections) as pool:
+        list(pool.map(post_chunk, chunks))
+
+def wait_for_port(port, timeout):
+    """Дождаться, пока сервер вебхука начнет принимать соединения"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+def run_mode(mode, latency, users, connections, timeout):
+    """Прогон одного режима. Возвращает число обновлений в секунду"""
+    api = FakeBotAPI(latency).start()
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            PYTHONPATH=ROOT,
+            BOT_TOKEN=TOKEN,
+            BOT_MODE=mode,
+            DATABASE_URL=f"sqlite:///{os.path.join(directory, 'bench.db')}",
+            LOCALES_DIR=os.path.join(ROOT, 'locales'),
+            RATE_LIMIT_ENABLED='0',
+            WEBHOOK_URL=f"http://127.0.0.1:{port}{WEBHOOK_PATH}",
+            WEBHOOK_PORT=str(port),
+            WEBHOOK_SECRET=WEBHOOK_SECRET,
+        )
+        # Бот пишет логи в logs/ текущего каталога - запускаем его во временном
+        bot = subprocess.Popen(
+            [sys.executable, '-m', 'benchmarks.webhook_vs_polling', '--serve', api.api_url],
+            cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            ready_call = 'setWebhook' if mode == 'webhook' else 'getUpdates'
+            if not api.wait_for_call(ready_call, timeout):
+                raise RuntimeError(f"Bot did not start in {mode} mode")
+            if mode == 'webhook' and not wait_for_port(port, timeout):
+                raise RuntimeError("Webhook server did not start")
+
+            updates = [command_update(number, 1000 + number, '/help') for number in range(1, users + 1)]
+            started = time.monotonic()
+            if mode == 'webhook':
+                post_updates(port, updates, connections)
+            else:
+                api.push(updates)
+            if not api.wait_sent(users, timeout):
+                raise RuntimeError(f"Bot answered {api.sent} of {users} updates in {timeout}s")
+            return users / (time.monotonic() - started)
+        finally:
+            bot.terminate()
+            bot.wait()
+            api.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Прием обновлений: long polling против вебхука")
+    parser.add_argument('--users', type=int, default=200, help="Пользователей (по одному /help от каждого)")
+    parser.add_argument('--latency', type=float, nargs='+', default=[0.0, 0.02], help="Задержки ответа Bot API в секундах")
+    parser.add_argument('--connections', type=int, default=40, help="Соединений с вебхуком (max_connections)")
+    parser.add_argument('--timeout', type=float, default=60.0, help="Наибольшее время прогона в секундах")
+    parser.add_argument('--serve', metavar='API_URL', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return 0
+
+    for latency in args.latency:
+        for mode in ('polling', 'webhook'):
+            rate = run_mode(mode, latency, args.users, args.connections, args.timeout)
+            print(f"api latency {latency * 1000:3.0f}ms: {mode:>8} {rate:6.0f} upd/s")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
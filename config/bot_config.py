@@ -1,4 +1,6 @@
 import os
+import secrets
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,4 +11,102 @@ class BotConfig:
     ADMIN_IDS = list(map(int, os.getenv('ADMIN_IDS', '1').split(',')))
     DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///shop_bot.db')
     LANGUAGES = ['uk', 'en']
-    DEFAULT_LANGUAGE = 'uk'
\ No newline at end of file
+    
+    # Способ работы: polling (long polling), webhook или async (AsyncTeleBot с асинхронной БД)
+    BOT_MODE = os.getenv('BOT_MODE', 'polling').lower()
+    # Публичный HTTPS-адрес вебхука (обычно прокси с TLS, который передает запросы локальному серверу)
+    WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')
+    WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '127.0.0.1')
+    WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+    WEBHOOK_PATH = os.getenv('WEBHOOK_PATH') or urlparse(WEBHOOK_URL).path or '/webhook'
+    # Секрет для заголовка X-Telegram-Bot-Api-Secret-Token; если не задан, создается при каждом запуске
+    WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET') or secrets.token_urlsafe(32)
+    # Сколько одновременных соединений Telegram может открыть к вебхуку
+    WEBHOOK_MAX_CONNECTIONS = int(os.getenv('WEBHOOK_MAX_CONNECTIONS', '40'))
+    
+    # Шарды обработки обновлений: обновления одного чата обрабатываются по порядку одним потоком
+    DISPATCH_SHARDS = int(os.getenv('DISPATCH_SHARDS', '8'))
+    # Размер очереди каждого шарда
+    DISPATCH_QUEUE_SIZE = int(os.getenv('DISPATCH_QUEUE_SIZE', '256'))
+    
+    # Ограничение исходящих сообщений (лимиты Telegram): всего в секунду, в один чат в секунду,
+    # в группу или канал в минуту; BURST - сколько сообщений в чат можно отправить подряд без ожидания
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1').lower() in ('1', 'true', 'yes')
+    RATE_LIMIT_GLOBAL = float(os.getenv('RATE_LIMIT_GLOBAL', '30'))
+    RATE_LIMIT_CHAT = float(os.getenv('RATE_LIMIT_CHAT', '1'))
+    RATE_LIMIT_GROUP_PER_MINUTE = float(os.getenv('RATE_LIMIT_GROUP_PER_MINUTE', '20'))
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '3'))
+    # Повторы после 429 и наибольший retry_after (в секундах), который стоит ждать
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv('RATE_LIMIT_MAX_RETRIES', '3'))
+    RATE_LIMIT_MAX_RETRY_AFTER = float(os.getenv('RATE_LIMIT_MAX_RETRY_AFTER', '30'))
+    # Сколько секунд поток обработки обновлений может ждать токена чата; более долгие отправки
+    # откладываются в очередь чата (фоновые отправки с PRIORITY_LOW ждут в своем потоке)
+    RATE_LIMIT_MAX_CHAT_WAIT = float(os.getenv('RATE_LIMIT_MAX_CHAT_WAIT', '3'))
+    DEFAULT_LANGUAGE = 'uk'
+    
+    # Локализация
+    LOCALES_DIR = os.getenv('LOCALES_DIR', 'locales')
+    # Как часто (в секундах) проверять mtime файлов локализации; отрицательное значение отключает перезагрузку
+    LOCALE_RELOAD_INTERVAL = float(os.getenv('LOCALE_RELOAD_INTERVAL', '5'))
+    
+    # Кеш профилей пользователей
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '10000'))
+    USER_CACHE_TTL = float(os.getenv('USER_CACHE_TTL', '600'))
+    
+    # Обновления, обработка которых дольше этого порога (в секундах), попадают в лог
+    SLOW_UPDATE_THRESHOLD = float(os.getenv('SLOW_UPDATE_THRESHOLD', '1.0'))
+    # Если список не помещается в столько сообщений, он отправляется текстовым файлом
+    MESSAGE_DOCUMENT_THRESHOLD = int(os.getenv('MESSAGE_DOCUMENT_THRESHOLD', '5'))
+    
+    # Настройки SQLite, применяются к каждому новому соединению
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    # Отрицательное значение - размер в KiB, положительное - в страницах
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', '-65536'))
+    SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', '5000'))
+    
+    # Очередь записи: все транзакции на запись выполняются одним потоком с групповым commit
+    DB_WRITE_QUEUE = os.getenv('DB_WRITE_QUEUE', '0').lower() in ('1', 'true', 'yes')
+    DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', '64'))
+    # Сколько (в секундах) ждать следующие записи, чтобы закоммитить их вместе
+    DB_WRITE_BATCH_WINDOW = float(os.getenv('DB_WRITE_BATCH_WINDOW', '0.002'))
+    
+    # Пул соединений asyncio-режима: столько запросов к БД выполняется одновременно
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', '5'))
+    ASYNC_DB_MAX_OVERFLOW = int(os.getenv('ASYNC_DB_MAX_OVERFLOW', '5'))
+    
+    # Размеры страниц
+    CATALOG_PAGE_SIZE = int(os.getenv('CATALOG_PAGE_SIZE', '10'))
+    ORDERS_PAGE_SIZE = int(os.getenv('ORDERS_PAGE_SIZE', '20'))
+    # Сколько отрисованных страниц каталога хранить в памяти
+    CATALOG_RENDER_CACHE_SIZE = int(os.getenv('CATALOG_RENDER_CACHE_SIZE', '256'))
+    # Сколько отрисованных карточек товаров хранить в памяти
+    PRODUCT_CARD_CACHE_SIZE = int(os.getenv('PRODUCT_CARD_CACHE_SIZE', '2048'))
+    
+    # Inline-режим: результатов на страницу (не больше 50), сколько секунд Telegram кеширует ответ
+    # и сколько готовых страниц ответов хранить в памяти
+    INLINE_PAGE_SIZE = min(int(os.getenv('INLINE_PAGE_SIZE', '20')), 50)
+    INLINE_CACHE_TIME = int(os.getenv('INLINE_CACHE_TIME', '60'))
+    INLINE_CACHE_SIZE = int(os.getenv('INLINE_CACHE_SIZE', '4096'))
+    
+    # Общий файл снимка каталога для нескольких процессов бота; пустое значение - снимок только в памяти процесса
+    CATALOG_SNAPSHOT_PATH = os.getenv('CATALOG_SNAPSHOT_PATH', '')
+    # Как часто (в секундах) проверять, не обновил ли файл снимка другой процесс
+    CATALOG_SNAPSHOT_CHECK_INTERVAL = float(os.getenv('CATALOG_SNAPSHOT_CHECK_INTERVAL', '1'))
+    
+    # Пауза (в секундах) между отправками при прогреве file_id изображений командой /warm_images
+    IMAGE_WARM_INTERVAL = float(os.getenv('IMAGE_WARM_INTERVAL', '1'))
+    
+    # Локальное хранилище изображений товаров
+    MEDIA_DIR = os.getenv('MEDIA_DIR', 'media')
+    # Максимальная сторона изображения для отправки и миниатюры (в пикселях)
+    IMAGE_MAX_SIZE = int(os.getenv('IMAGE_MAX_SIZE', '1280'))
+    IMAGE_THUMBNAIL_SIZE = int(os.getenv('IMAGE_THUMBNAIL_SIZE', '320'))
+    IMAGE_JPEG_QUALITY = int(os.getenv('IMAGE_JPEG_QUALITY', '85'))
+    # Ограничение размера загружаемого файла (Telegram принимает фото до 10 МБ)
+    IMAGE_MAX_BYTES = int(os.getenv('IMAGE_MAX_BYTES', str(10 * 1024 * 1024)))
+    IMAGE_DOWNLOAD_TIMEOUT = float(os.getenv('IMAGE_DOWNLOAD_TIMEOUT', '15'))
+    # Количество процессов для уменьшения изображений
+    IMAGE_WORKERS = int(os.getenv('IMAGE_WORKERS', '2'))
@@ -0,0 +1,109 @@
+import threading
+from contextlib import asynccontextmanager
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from config.bot_config import BotConfig
+from database.db_manager import sqlite_pragmas
+
+try:
+    import aiosqlite
+except ImportError:
+    # Без aiosqlite asyncio-режим с SQLite недоступен, синхронный режим работает как обычно
+    aiosqlite = None
+
+# Асинхронные драйверы для URL из DATABASE_URL
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+}
+
+def async_database_url(database_url):
+    """URL базы данных с асинхронным драйвером"""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+class AsyncDatabaseManager:
+    """Подключение к базе данных для asyncio-режима.
+
+    Соединений не больше ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW, сколько бы диалогов
+    ни обрабатывалось одновременно. Синхронные репозитории выполняются через
+    AsyncSession.run_sync, поэтому запросы у обоих режимов общие.
+    """
+
+    def __init__(self, database_url=None):
+        self.url = async_database_url(database_url or BotConfig.DATABASE_URL)
+        self._lock = threading.Lock()
+        self._engine = None
+        self._session_factory = None
+
+    @property
+    def engine(self):
+        """Движок создается при первом обращении"""
+        self._get_session_factory()
+        return self._engine
+
+    def _get_session_factory(self):
+        """Фабрика сессий (вместе с движком создается при первом обращении)"""
+        if self._session_factory is None:
+            with self._lock:
+                if self._session_factory is None:
+                    self._engine = self._create_engine()
+                    # Объекты остаются доступными после commit и закрытия сессии
+                    self._session_factory = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._session_factory
+
+    def _create_engine(self):
+        """Создать асинхронный движок"""
+        is_sqlite = self.url.get_backend_name() == 'sqlite'
+        if is_sqlite and aiosqlite is None:
+            raise RuntimeError("aiosqlite is required for BOT_MODE=async with SQLite (pip install aiosqlite)")
+
+        engine = create_async_engine(
+            self.url,
+            pool_size=BotConfig.ASYNC_DB_POOL_SIZE,
+            max_overflow=BotConfig.ASYNC_DB_MAX_OVERFLOW
+        )
+        if is_sqlite:
+            self.pragmas = sqlite_pragmas()
+            event.listen(engine.sync_engine, 'connect', self._apply_sqlite_pragmas)
+        return engine
+
+    def _apply_sqlite_pragmas(self, dbapi_connection, connection_record):
+        """Применить профиль производительности SQLite к новому соединению"""
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    @asynccontextmanager
+    async def session(self):
+        """Асинхронная сессия базы данных"""
+        async with self._get_session_factory()() as session:
+            yield session
+
+    async def run_read(self, func):
+        """Выполнить чтение func(session) синхронным кодом (например, репозиторием) и вернуть результат"""
+        async with self.session() as session:
+            return await session.run_sync(func)
+
+    async def run_write(self, func):
+        """Выполнить транзакцию на запись func(session) синхронным кодом и закоммитить ее"""
+        async with self.session() as session:
+            try:
+                result = await session.run_sync(func)
+                await session.commit()
+                return result
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def dispose(self):
+        """Закрыть все соединения"""
+        if self._engine is not None:
+            await self._engine.dispose()
+
+# Создание экземпляра менеджера БД для asyncio-режима
+async_db_manager = AsyncDatabaseManager()
@@ -1,17 +1,236 @@
-from sqlalchemy import create_engine
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 from config.bot_config import BotConfig
 
 Base = declarative_base()
 
+# Допустимые значения PRAGMA, которые задаются строкой
+SQLITE_JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+SQLITE_SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+SQLITE_TEMP_STORES = {'DEFAULT', 'FILE', 'MEMORY'}
+
+def sqlite_pragmas():
+    """PRAGMA-настройки SQLite из конфигурации"""
+    journal_mode = BotConfig.SQLITE_JOURNAL_MODE.upper()
+    synchronous = BotConfig.SQLITE_SYNCHRONOUS.upper()
+    temp_store = BotConfig.SQLITE_TEMP_STORE.upper()
+    
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE: {journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS: {synchronous}")
+    if temp_store not in SQLITE_TEMP_STORES:
+        raise ValueError(f"Unsupported SQLITE_TEMP_STORE: {temp_store}")
+    
+    return [
+        ('busy_timeout', int(BotConfig.SQLITE_BUSY_TIMEOUT)),
+        ('journal_mode', journal_mode),
+        ('synchronous', synchronous),
+        ('mmap_size', int(BotConfig.SQLITE_MMAP_SIZE)),
+        ('cache_size', int(BotConfig.SQLITE_CACHE_SIZE)),
+        ('temp_store', temp_store),
+    ]
+
+# Ключ session.info для функций, которые нужно вызвать после commit
+AFTER_COMMIT_KEY = 'after_commit_callbacks'
+
+class WriteQueue:
+    """Единственный поток-писатель: выполняет транзакции на запись по очереди и коммитит их группами"""
+    
+    def __init__(self, session_factory, batch_size, batch_window):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        
+        # Счетчики
+        self.batches = 0
+        self.writes = 0
+        self.failures = 0
+    
+    def start(self):
+        """Запустить поток-писатель"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+                self._thread.start()
+    
+    def stop(self, timeout=None):
+        """Дописать очередь и остановить поток-писатель"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+    
+    def submit(self, func):
+        """Поставить транзакцию в очередь. func(session) выполняется в потоке-писателе"""
+        future = Future()
+        if self._thread is None:
+            self.start()
+        self._queue.put((func, future))
+        return future
+    
+    def stats(self):
+        """Статистика очереди записи"""
+        return {
+            'pending': self._queue.qsize(),
+            'batches': self.batches,
+            'writes': self.writes,
+            'failures': self.failures,
+        }
+    
+    def _run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is None:
+                break
+            
+            # Собираем записи, пришедшие почти одновременно, в одну транзакцию
+            batch = [job]
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+            
+            self._commit_batch(batch)
+    
+    def _commit_batch(self, batch):
+        """Выполнить пачку транзакций: каждая в своем SAVEPOINT, общий commit в конце"""
+        session = self.session_factory()
+        # Одиночной транзакции SAVEPOINT не нужен: при ошибке откатывается вся сессия
+        use_savepoints = len(batch) > 1
+        done = []
+        try:
+            for func, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if use_savepoints:
+                        with session.begin_nested():
+                            result = func(session)
+                    else:
+                        result = func(session)
+                except Exception as e:
+                    if not use_savepoints:
+                        session.rollback()
+                    self.failures += 1
+                    future.set_exception(e)
+                else:
+                    done.append((future, result))
+            
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            self.failures += len(done)
+            for future, _ in done:
+                future.set_exception(e)
+            return
+        finally:
+            session.close()
+        
+        self.batches += 1
+        self.writes += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+class UnitOfWork:
+    """Единица работы: одна сессия для чтений всех сервисов, вызванных в ее рамках.
+    
+    Записи в нее не попадают: каждая выполняется своей короткой транзакцией (см. DatabaseManager._write),
+    чтобы блокировка записи SQLite не удерживалась, пока обработчик обращается к Telegram.
+    """
+    
+    def __init__(self, manager):
+        self.manager = manager
+        self.session = manager.Session()
+    
+    def end_read(self):
+        """Закончить снимок чтения перед записью: следующие чтения увидят закоммиченные данные"""
+        self.session.commit()
+        self.session.expire_all()
+    
+    def complete(self, exception=None):
+        """Завершить единицу работы: commit при успехе, rollback при ошибке"""
+        try:
+            if exception is None:
+                self.session.commit()
+            else:
+                self.session.rollback()
+        except Exception:
+            self.session.rollback()
+            raise
+        finally:
+            self.session.close()
+            self.manager._local.unit_of_work = None
+
 class DatabaseManager:
     """Класс для управления подключением к базе данных"""
     
     def __init__(self):
         self.engine = create_engine(BotConfig.DATABASE_URL)
-        self.session_factory = sessionmaker(bind=self.engine)
+        if self.engine.dialect.name == 'sqlite':
+            self.pragmas = sqlite_pragmas()
+            event.listen(self.engine, 'connect', self._apply_sqlite_pragmas)
+            # pysqlite сам не начинает транзакцию перед SAVEPOINT, и RELEASE внешнего
+            # SAVEPOINT коммитит данные раньше времени. Поэтому BEGIN выдаем сами
+            event.listen(self.engine, 'begin', self._begin_sqlite_transaction)
+        
+        # Объекты остаются доступными после commit и закрытия сессии
+        self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        # Транзакции на запись сразу берут блокировку записи (BEGIN IMMEDIATE, с ожиданием busy_timeout).
+        # Отложенная транзакция, успевшая что-то прочитать (в том числе триггерами FTS5), получает
+        # "database is locked" без ожидания, если блокировку держит другое соединение
+        self.write_session_factory = sessionmaker(
+            bind=self.engine.execution_options(sqlite_begin='IMMEDIATE'),
+            expire_on_commit=False
+        )
         self.Session = scoped_session(self.session_factory)
+        self._local = threading.local()
+        for factory in (self.session_factory, self.write_session_factory):
+            event.listen(factory, 'after_commit', self._run_after_commit)
+            event.listen(factory, 'after_rollback', self._discard_after_commit)
+        
+        self.write_queue = None
+        if BotConfig.DB_WRITE_QUEUE:
+            self.write_queue = WriteQueue(
+                self.write_session_factory,
+                batch_size=BotConfig.DB_WRITE_BATCH_SIZE,
+                batch_window=BotConfig.DB_WRITE_BATCH_WINDOW
+            )
+    
+    def _apply_sqlite_pragmas(self, dbapi_connection, connection_record):
+        """Применить профиль производительности SQLite к новому соединению"""
+        # Отключаем собственное управление транзакциями драйвера (см. событие begin)
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+    
+    def _begin_sqlite_transaction(self, connection):
+        """Начать транзакцию SQLite (DEFERRED или режим из параметра выполнения sqlite_begin)"""
+        mode = connection.get_execution_options().get('sqlite_begin', 'DEFERRED')
+        connection.exec_driver_sql(f"BEGIN {mode}")
     
     def create_tables(self):
         """Создать все таблицы"""
@@ -22,8 +241,110 @@ class DatabaseManager:
         return self.Session()
     
     def close_session(self, session):
-        """Закрыть сессию базы данных"""
+        """Закрыть сессию базы данных (внутри единицы работы сессия остается открытой)"""
+        unit_of_work = self.current_unit_of_work()
+        if unit_of_work is not None and unit_of_work.session is session:
+            return
         session.close()
+    
+    def after_commit(self, session, callback):
+        """Вызвать callback() после commit внешней транзакции сессии (при rollback - не вызывать)"""
+        session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+    
+    def _run_after_commit(self, session):
+        # Событие приходит и при RELEASE SAVEPOINT, ждем commit внешней транзакции
+        if session.in_nested_transaction():
+            return
+        for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+            callback()
+    
+    def _discard_after_commit(self, session):
+        if not session.in_nested_transaction():
+            session.info.pop(AFTER_COMMIT_KEY, None)
+    
+    def current_unit_of_work(self):
+        """Активная единица работы текущего потока"""
+        return getattr(self._local, 'unit_of_work', None)
+    
+    def begin_unit_of_work(self):
+        """Начать единицу работы в текущем потоке.
+        
+        До вызова complete() все сервисы этого потока читают через одну сессию,
+        и объекты не отсоединяются. Записи коммитятся сразу, каждая в своей транзакции.
+        """
+        if self.current_unit_of_work() is not None:
+            raise RuntimeError("Unit of work is already active in this thread")
+        unit_of_work = UnitOfWork(self)
+        self._local.unit_of_work = unit_of_work
+        return unit_of_work
+    
+    @contextmanager
+    def unit_of_work(self):
+        """Контекстный менеджер единицы работы (вложенные вызовы используют внешнюю)"""
+        current = self.current_unit_of_work()
+        if current is not None:
+            yield current.session
+            return
+        
+        unit_of_work = self.begin_unit_of_work()
+        try:
+            yield unit_of_work.session
+        except BaseException as e:
+            unit_of_work.complete(e)
+            raise
+        unit_of_work.complete()
+    
+    def submit_write(self, func):
+        """Выполнить транзакцию на запись func(session) и вернуть Future с ее результатом.
+        
+        В режиме очереди записи транзакция выполняется потоком-писателем, иначе - в текущем потоке.
+        В обоих случаях она коммитится сразу, в том числе внутри единицы работы.
+        """
+        self._end_read()
+        if self.write_queue is not None:
+            return self.write_queue.submit(func)
+        
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._write(func))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def run_write(self, func):
+        """Выполнить транзакцию на запись func(session) и дождаться результата"""
+        self._end_read()
+        if self.write_queue is not None:
+            return self.write_queue.submit(func).result()
+        return self._write(func)
+    
+    def _end_read(self):
+        """Закончить снимок чтения единицы работы текущего потока (если она есть).
         
+        Иначе SQLite не даст превратить устаревшую транзакцию чтения в запись (SQLITE_BUSY_SNAPSHOT
+        без ожидания busy_timeout), а чтения после записи не увидят ее результат.
+        """
+        unit_of_work = self.current_unit_of_work()
+        if unit_of_work is not None:
+            unit_of_work.end_read()
+    
+    def _write(self, func):
+        """Выполнить транзакцию на запись в текущем потоке.
+        
+        Используется отдельная сессия, а не сессия единицы работы: транзакция коммитится
+        сразу и не держит блокировку записи до конца обработки обновления.
+        """
+        session = self.write_session_factory()
+        try:
+            result = func(session)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
 # Создание экземпляра менеджера БД
-db_manager = DatabaseManager()
\ No newline at end of file
+db_manager = DatabaseManager()
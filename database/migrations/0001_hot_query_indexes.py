@@ -0,0 +1,14 @@
+"""Индексы для истории заказов пользователя, состава заказа, платежей и каталога"""
+from sqlalchemy import text
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_orders_user_id ON orders (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_status_created_at ON orders (status, created_at)",
+    "CREATE INDEX IF NOT EXISTS ix_order_items_order_id ON order_items (order_id)",
+    "CREATE INDEX IF NOT EXISTS ix_payments_order_id ON payments (order_id)",
+    "CREATE INDEX IF NOT EXISTS ix_products_available ON products (available)",
+]
+
+def upgrade(connection):
+    for statement in INDEXES:
+        connection.execute(text(statement))
@@ -0,0 +1,15 @@
+"""Составные индексы (фильтр, id) для постраничной выборки товаров и заказов"""
+from sqlalchemy import text
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_products_available_id ON products (available, id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_user_id_id ON orders (user_id, id)",
+    "CREATE INDEX IF NOT EXISTS ix_orders_status_id ON orders (status, id)",
+    # Заменены составными индексами выше
+    "DROP INDEX IF EXISTS ix_products_available",
+    "DROP INDEX IF EXISTS ix_orders_user_id",
+]
+
+def upgrade(connection):
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,8 @@
+"""Колонка products.telegram_file_id для повторной отправки изображений товаров по file_id"""
+from sqlalchemy import inspect, text
+
+def upgrade(connection):
+    # На новой БД колонка уже создана create_all
+    columns = {column['name'] for column in inspect(connection).get_columns('products')}
+    if 'telegram_file_id' not in columns:
+        connection.execute(text("ALTER TABLE products ADD COLUMN telegram_file_id VARCHAR(255)"))
@@ -0,0 +1,35 @@
+"""Полнотекстовый поиск товаров: таблица FTS5 products_fts по name и description с триггерами синхронизации"""
+from sqlalchemy import text
+
+# porter приводит английские слова к основе, unicode61 разбивает на слова и приводит к нижнему регистру
+# любой алфавит (в том числе кириллицу) и убирает диакритику
+STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, description, content='products', content_rowid='id', "
+    "tokenize='porter unicode61 remove_diacritics 2')",
+    
+    "CREATE TRIGGER IF NOT EXISTS products_fts_insert AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description); "
+    "END",
+    
+    "CREATE TRIGGER IF NOT EXISTS products_fts_delete AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts (products_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "END",
+    
+    "CREATE TRIGGER IF NOT EXISTS products_fts_update AFTER UPDATE OF name, description ON products BEGIN "
+    "INSERT INTO products_fts (products_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO products_fts (rowid, name, description) VALUES (new.id, new.name, new.description); "
+    "END",
+    
+    # Индексируем уже существующие товары
+    "INSERT INTO products_fts (products_fts) VALUES ('rebuild')",
+]
+
+def upgrade(connection):
+    # FTS5 есть только в SQLite; на других СУБД поиск работает через LIKE
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in STATEMENTS:
+        connection.execute(text(statement))
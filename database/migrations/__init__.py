@@ -0,0 +1,83 @@
+import datetime
+import importlib
+import os
+import pkgutil
+from collections import namedtuple
+from sqlalchemy import text
+from config.logging_config import setup_logger
+
+logger = setup_logger()
+
+# Версионированная миграция: файл database/migrations/NNNN_<описание>.py с функцией upgrade(connection)
+Migration = namedtuple('Migration', ['version', 'name', 'description', 'upgrade'])
+
+SCHEMA_VERSION_TABLE = 'schema_version'
+
+def discover_migrations():
+    """Найти все миграции пакета, отсортированные по версии"""
+    migrations = []
+    package_dir = os.path.dirname(__file__)
+    for module_info in pkgutil.iter_modules([package_dir]):
+        prefix, _, _ = module_info.name.partition('_')
+        if not prefix.isdigit():
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(
+            version=int(prefix),
+            name=module_info.name,
+            description=(module.__doc__ or module_info.name).strip(),
+            upgrade=module.upgrade
+        ))
+    
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return migrations
+
+def ensure_version_table(connection):
+    """Создать таблицу версий схемы, если ее нет"""
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSION_TABLE} ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+def get_current_version(engine):
+    """Текущая версия схемы (0, если миграции не применялись)"""
+    with engine.begin() as connection:
+        ensure_version_table(connection)
+        version = connection.execute(text(f"SELECT MAX(version) FROM {SCHEMA_VERSION_TABLE}")).scalar()
+    return version or 0
+
+def run_migrations(engine, target=None):
+    """Применить все непримененные миграции (до версии target включительно).
+    
+    Каждая миграция выполняется в отдельной транзакции вместе с записью в schema_version.
+    Возвращает список примененных миграций.
+    """
+    current = get_current_version(engine)
+    applied = []
+    
+    for migration in discover_migrations():
+        if migration.version <= current:
+            continue
+        if target is not None and migration.version > target:
+            break
+        
+        logger.info(f"Applying migration {migration.name}")
+        with engine.begin() as connection:
+            migration.upgrade(connection)
+            connection.execute(
+                text(f"INSERT INTO {SCHEMA_VERSION_TABLE} (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {
+                    'version': migration.version,
+                    'description': migration.description[:255],
+                    'applied_at': datetime.datetime.utcnow()
+                }
+            )
+        applied.append(migration)
+    
+    return applied
@@ -0,0 +1,33 @@
+from collections import namedtuple
+from sqlalchemy import text
+
+# Частый запрос и индекс, которым он должен обслуживаться
+HotQuery = namedtuple('HotQuery', ['name', 'sql', 'index'])
+
+HOT_QUERIES = [
+    HotQuery('user orders', "SELECT * FROM orders WHERE user_id = 1", 'ix_orders_user_id_id'),
+    HotQuery('user orders page', "SELECT * FROM orders WHERE user_id = 1 AND id > 100 ORDER BY id LIMIT 21", 'ix_orders_user_id_id'),
+    HotQuery('orders page by status', "SELECT * FROM orders WHERE status = 'NEW' AND id > 100 ORDER BY id LIMIT 21", 'ix_orders_status_id'),
+    HotQuery('orders by status', "SELECT * FROM orders WHERE status = 'NEW' ORDER BY created_at", 'ix_orders_status_created_at'),
+    HotQuery('order items', "SELECT * FROM order_items WHERE order_id = 1", 'ix_order_items_order_id'),
+    HotQuery('order payments', "SELECT * FROM payments WHERE order_id = 1", 'ix_payments_order_id'),
+    HotQuery('available products', "SELECT * FROM products WHERE available = 1", 'ix_products_available_id'),
+    HotQuery('products page', "SELECT * FROM products WHERE available = 1 AND id > 100 ORDER BY id LIMIT 11", 'ix_products_available_id'),
+]
+
+def check_query_plans(engine, queries=HOT_QUERIES):
+    """Проверить через EXPLAIN QUERY PLAN, что частые запросы используют свои индексы (только SQLite).
+    
+    Возвращает список (запрос, план, ok).
+    """
+    if engine.dialect.name != 'sqlite':
+        return []
+    
+    results = []
+    with engine.connect() as connection:
+        for query in queries:
+            rows = connection.execute(text(f"EXPLAIN QUERY PLAN {query.sql}")).fetchall()
+            plan = '; '.join(row[-1] for row in rows)
+            ok = f"INDEX {query.index}" in plan and 'USE TEMP B-TREE' not in plan
+            results.append((query, plan, ok))
+    return results
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Enum, Index
 from sqlalchemy.orm import relationship
 from database.db_manager import Base
 import enum
@@ -28,12 +28,17 @@ class User(Base):
 class Product(Base):
     """Модель товара"""
     __tablename__ = 'products'
+    __table_args__ = (
+        Index('ix_products_available_id', 'available', 'id'),
+    )
     
     id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     price = Column(Float, nullable=False)
     image_url = Column(String(1024), nullable=True)
+    # file_id изображения в Telegram после первой отправки; сбрасывается при смене image_url
+    telegram_file_id = Column(String(255), nullable=True)
     available = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     
@@ -52,6 +57,11 @@ class OrderStatus(enum.Enum):
 class Order(Base):
     """Модель заказа"""
     __tablename__ = 'orders'
+    __table_args__ = (
+        Index('ix_orders_user_id_id', 'user_id', 'id'),
+        Index('ix_orders_status_id', 'status', 'id'),
+        Index('ix_orders_status_created_at', 'status', 'created_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
@@ -70,6 +80,9 @@ class Order(Base):
 class OrderItem(Base):
     """Модель элемента заказа"""
     __tablename__ = 'order_items'
+    __table_args__ = (
+        Index('ix_order_items_order_id', 'order_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
@@ -90,6 +103,9 @@ class PaymentStatus(enum.Enum):
 class Payment(Base):
     """Модель платежа"""
     __tablename__ = 'payments'
+    __table_args__ = (
+        Index('ix_payments_order_id', 'order_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey('orders.id'), nullable=False)
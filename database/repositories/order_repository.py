@@ -1,5 +1,8 @@
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.exc import NoResultFound
 from database.models import Order, OrderItem, OrderStatus
+from database.repositories.pagination import keyset_page
 
 class OrderRepository:
     """Репозиторий для работы с заказами"""
@@ -7,20 +10,47 @@ class OrderRepository:
     def __init__(self, session):
         self.session = session
     
-    def get_all_orders(self):
+    def get_all_orders(self, with_items=False):
         """Получить все заказы"""
-        return self.session.query(Order).all()
+        return self._orders_query(with_items).all()
     
-    def get_by_id(self, order_id):
+    def get_by_id(self, order_id, with_items=False):
         """Получить заказ по ID"""
         try:
-            return self.session.query(Order).filter(Order.id == order_id).one()
+            return self._orders_query(with_items).filter(Order.id == order_id).one()
         except NoResultFound:
             return None
     
-    def get_user_orders(self, user_id):
+    def get_user_orders(self, user_id, with_items=False):
         """Получить заказы пользователя"""
-        return self.session.query(Order).filter(Order.user_id == user_id).all()
+        return self._orders_query(with_items).filter(Order.user_id == user_id).all()
+    
+    def get_orders_page(self, after_id=None, limit=20, status=None, with_items=False):
+        """Получить страницу заказов после заказа after_id (опционально с фильтром по статусу)"""
+        query = self._orders_query(with_items)
+        if status is not None:
+            query = query.filter(Order.status == OrderStatus(status))
+        return keyset_page(query, Order.id, after_id, limit)
+    
+    def get_user_orders_page(self, user_id, after_id=None, limit=20, status=None, with_items=False):
+        """Получить страницу заказов пользователя после заказа after_id"""
+        query = self._orders_query(with_items).filter(Order.user_id == user_id)
+        if status is not None:
+            query = query.filter(Order.status == OrderStatus(status))
+        return keyset_page(query, Order.id, after_id, limit)
+    
+    def _orders_query(self, with_items=False):
+        """Запрос заказов; with_items=True загружает позиции и товары заранее.
+        
+        Позиции и товары всех заказов выбираются двумя дополнительными запросами
+        (SELECT ... WHERE ... IN), независимо от количества заказов.
+        """
+        query = self.session.query(Order)
+        if with_items:
+            query = query.options(
+                selectinload(Order.items).selectinload(OrderItem.product)
+            )
+        return query
     
     def create_order(self, user_id):
         """Создать новый заказ"""
@@ -29,7 +59,7 @@ class OrderRepository:
             status=OrderStatus.NEW
         )
         self.session.add(order)
-        self.session.commit()
+        self.session.flush()
         return order
     
     def add_item_to_order(self, order_id, product_id, quantity, price):
@@ -41,7 +71,7 @@ class OrderRepository:
             price=price
         )
         self.session.add(order_item)
-        self.session.commit()
+        self.session.flush()
         
         # Обновление общей суммы заказа
         self._update_order_total(order_id)
@@ -52,7 +82,7 @@ class OrderRepository:
         order = self.get_by_id(order_id)
         if order:
             order.status = OrderStatus(status)
-            self.session.commit()
+            self.session.flush()
             return order
         return None
     
@@ -60,6 +90,9 @@ class OrderRepository:
         """Обновить общую сумму заказа"""
         order = self.get_by_id(order_id)
         if order:
-            total = sum(item.price * item.quantity for item in order.items)
+            # Сумма считается в SQL: загруженная ранее коллекция order.items может не содержать новых позиций
+            total = self.session.query(
+                func.coalesce(func.sum(OrderItem.price * OrderItem.quantity), 0)
+            ).filter(OrderItem.order_id == order_id).scalar()
             order.total_amount = total
-            self.session.commit()
\ No newline at end of file
+            self.session.flush()
\ No newline at end of file
@@ -0,0 +1,19 @@
+from collections import namedtuple
+
+# Страница результатов: элементы и курсор следующей страницы (None, если страница последняя)
+Page = namedtuple('Page', ['items', 'next_cursor'])
+
+def keyset_page(query, id_column, after_id=None, limit=20):
+    """Получить страницу по ключу (WHERE id > after_id ORDER BY id LIMIT n) вместо OFFSET.
+    
+    Стоимость запроса не зависит от номера страницы, если фильтр и id покрыты индексом.
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    
+    # Берем на одну строку больше, чтобы узнать, есть ли следующая страница
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return Page(rows, getattr(rows[-1], id_column.key))
+    return Page(rows, None)
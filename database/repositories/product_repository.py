@@ -1,5 +1,21 @@
+from sqlalchemy import and_, inspect, or_, text, update
 from sqlalchemy.orm.exc import NoResultFound
 from database.models import Product
+from database.repositories.pagination import keyset_page
+
+FTS_TABLE = 'products_fts'
+
+# Есть ли таблица полнотекстового поиска: движок -> bool
+_fts_available = {}
+
+# Поиск по FTS5: bm25 с весом 10 для названия и 1 для описания (меньше - релевантнее)
+FTS_SEARCH_SQL = text(
+    f"SELECT products.id FROM {FTS_TABLE} "
+    f"JOIN products ON products.id = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH :match AND products.available = 1 "
+    f"ORDER BY bm25({FTS_TABLE}, 10.0, 1.0), products.id "
+    "LIMIT :limit OFFSET :offset"
+)
 
 class ProductRepository:
     """Репозиторий для работы с товарами"""
@@ -14,6 +30,51 @@ class ProductRepository:
             query = query.filter(Product.available == True)
         return query.all()
     
+    def get_products_page(self, after_id=None, limit=20, available_only=True):
+        """Получить страницу товаров после товара after_id"""
+        query = self.session.query(Product)
+        if available_only:
+            query = query.filter(Product.available == True)
+        return keyset_page(query, Product.id, after_id, limit)
+    
+    def search_product_ids(self, terms, limit=20, offset=0):
+        """Найти ID доступных товаров, в названии или описании которых есть все слова terms.
+        
+        В SQLite с таблицей products_fts результаты упорядочены по релевантности (bm25),
+        иначе - по ID (поиск по подстроке).
+        """
+        if not terms:
+            return []
+        
+        if self._has_fts():
+            # Последнее слово ищется как префикс ("телеф" найдет "телефон"), остальные - целиком
+            quoted = ['"{}"'.format(term.replace('"', '""')) for term in terms]
+            match = ' '.join(quoted[:-1] + [quoted[-1] + '*'])
+            rows = self.session.execute(FTS_SEARCH_SQL, {'match': match, 'limit': limit, 'offset': offset})
+            return [row[0] for row in rows]
+        
+        conditions = [
+            or_(Product.name.ilike(f"%{term}%"), Product.description.ilike(f"%{term}%"))
+            for term in terms
+        ]
+        query = (
+            self.session.query(Product.id)
+            .filter(Product.available == True, and_(*conditions))
+            .order_by(Product.id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return [row[0] for row in query]
+    
+    def _has_fts(self):
+        """Создана ли таблица полнотекстового поиска (проверяется один раз на движок)"""
+        engine = self.session.get_bind()
+        available = _fts_available.get(engine)
+        if available is None:
+            available = engine.dialect.name == 'sqlite' and inspect(engine).has_table(FTS_TABLE)
+            _fts_available[engine] = available
+        return available
+    
     def get_by_id(self, product_id):
         """Получить товар по ID"""
         try:
@@ -30,25 +91,45 @@ class ProductRepository:
             image_url=image_url
         )
         self.session.add(product)
-        self.session.commit()
+        self.session.flush()
         return product
     
     def update_product(self, product_id, **kwargs):
         """Обновить товар"""
         product = self.get_by_id(product_id)
         if product:
+            # Сохраненный file_id относится к старому изображению
+            if 'image_url' in kwargs and kwargs['image_url'] != product.image_url:
+                product.telegram_file_id = None
             for key, value in kwargs.items():
                 if hasattr(product, key):
                     setattr(product, key, value)
-            self.session.commit()
+            self.session.flush()
             return product
         return None
     
+    def get_telegram_file_id(self, product_id, image_url):
+        """Получить file_id изображения, если он сохранен для текущего image_url"""
+        return self.session.query(Product.telegram_file_id).filter(
+            Product.id == product_id,
+            Product.image_url == image_url
+        ).scalar()
+    
+    def set_telegram_file_id(self, product_id, image_url, file_id):
+        """Сохранить file_id изображения, если image_url товара не изменился с момента отправки"""
+        result = self.session.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.image_url == image_url)
+            .values(telegram_file_id=file_id)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
     def delete_product(self, product_id):
         """Удалить товар (установить available=False)"""
         product = self.get_by_id(product_id)
         if product:
             product.available = False
-            self.session.commit()
+            self.session.flush()
             return True
         return False
\ No newline at end of file
@@ -1,6 +1,12 @@
+import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm.exc import NoResultFound
 from database.models import User, UserLanguage
 
+# Сколько строк вставлять одним запросом при массовом upsert
+UPSERT_BATCH_SIZE = 500
+
 class UserRepository:
     """Репозиторий для работы с пользователями"""
     
@@ -29,18 +35,83 @@ class UserRepository:
             user.is_admin = True
             
         self.session.add(user)
-        self.session.commit()
+        self.session.flush()
+        return user
+    
+    def upsert_user(self, telegram_id, username=None, first_name=None, last_name=None):
+        """Создать пользователя или обновить его имя одним запросом (INSERT ... ON CONFLICT)"""
+        stmt = self._upsert_statement([self._user_values(telegram_id, username, first_name, last_name)])
+        user = self.session.scalars(
+            stmt.returning(User),
+            execution_options={'populate_existing': True}
+        ).one()
+        self.session.flush()
         return user
     
+    def upsert_users(self, users):
+        """Массовый upsert пользователей (например, при импорте).
+        
+        users - последовательность словарей с ключами telegram_id, username, first_name, last_name.
+        Возвращает количество обработанных записей.
+        """
+        rows = [
+            self._user_values(
+                user['telegram_id'],
+                user.get('username'),
+                user.get('first_name'),
+                user.get('last_name')
+            )
+            for user in users
+        ]
+        
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            self.session.execute(self._upsert_statement(rows[start:start + UPSERT_BATCH_SIZE]))
+        self.session.flush()
+        return len(rows)
+    
     def update_language(self, telegram_id, language):
         """Обновить язык пользователя"""
         user = self.get_by_telegram_id(telegram_id)
         if user:
             user.language = UserLanguage(language)
-            self.session.commit()
+            self.session.flush()
             return True
         return False
     
     def get_all_admins(self):
         """Получить всех админов"""
-        return self.session.query(User).filter(User.is_admin == True).all()
\ No newline at end of file
+        return self.session.query(User).filter(User.is_admin == True).all()
+    
+    def _user_values(self, telegram_id, username, first_name, last_name):
+        """Значения строки users для вставки"""
+        from config.bot_config import BotConfig
+        return {
+            'telegram_id': telegram_id,
+            'username': username,
+            'first_name': first_name,
+            'last_name': last_name,
+            'language': UserLanguage.UK,
+            'is_admin': telegram_id in BotConfig.ADMIN_IDS,
+            'created_at': datetime.datetime.utcnow()
+        }
+    
+    def _upsert_statement(self, rows):
+        """INSERT ... ON CONFLICT (telegram_id) DO UPDATE для текущего диалекта"""
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            insert = postgresql.insert
+        elif dialect == 'sqlite':
+            insert = sqlite.insert
+        else:
+            raise NotImplementedError(f"Upsert is not supported for dialect '{dialect}'")
+        
+        stmt = insert(User).values(rows)
+        # Язык и права не трогаем, а пустые значения не затирают уже известные
+        return stmt.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={
+                'username': func.coalesce(stmt.excluded.username, User.username),
+                'first_name': func.coalesce(stmt.excluded.first_name, User.first_name),
+                'last_name': func.coalesce(stmt.excluded.last_name, User.last_name)
+            }
+        )
@@ -1,410 +1,476 @@
 from telebot import TeleBot
 from telebot.types import Message, CallbackQuery
-from services.user_service import UserService
-from services.catalog_service import CatalogService
-from services.order_service import OrderService
-from keyboards.reply_keyboards import get_admin_keyboard, get_cancel_keyboard, get_main_keyboard
+from keyboards.reply_keyboards import get_admin_keyboard, get_admin_products_keyboard, get_cancel_keyboard, get_main_keyboard
+from keyboards.inline_keyboards import get_orders_page_keyboard
 from utils.validators import admin_required, validate_price
 from utils.helpers import get_message
+from utils.product_images import warm_product_images
+from utils.image_store import image_store
+from utils.message_builder import MessageBuilder
 from states.user_states import AdminProductStates
+from config.bot_config import BotConfig
 from config.logging_config import setup_logger
-import telebot
 
 logger = setup_logger()
-user_service = UserService()
-catalog_service = CatalogService()
-order_service = OrderService()
 
-def register_admin_handlers(bot: TeleBot):
-    """Регистрация обработчиков для администраторов"""
+def _format_order(order, language):
+    """Текст заказа для списка заказов (Markdown)"""
+    order_info = (
+        f"*{get_message('order_id', language)}: {order.id}*\n"
+        f"{get_message('order_status', language)}: {order.status.value}\n"
+        f"{get_message('order_total', language)}: {order.total_amount} грн\n"
+        f"{get_message('order_date', language)}: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
+        f"{get_message('order_items', language)}:\n"
+    )
+    
+    for item in order.items:
+        order_info += f"- {item.product.name} x{item.quantity} = {item.price * item.quantity} грн\n"
+    
+    if order.shipping_address:
+        order_info += f"\n{get_message('shipping_address', language)}: {order.shipping_address}\n"
+    
+    if order.contact_phone:
+        order_info += f"{get_message('contact_phone', language)}: {order.contact_phone}\n"
+    
+    return order_info
+
+async def _send_orders_page(io, user_id, language, after_id=None):
+    """Отправить одну страницу заказов после заказа after_id с кнопкой следующей страницы.
+    
+    Загружается только эта страница (вместе с позициями и товарами), поэтому время ответа
+    не зависит от общего количества заказов. Возвращает False, если заказов нет.
+    """
+    page = await io.orders.get_orders_page(after_id=after_id, with_items=True)
+    if not page.items:
+        return False
+    
+    # Заказы страницы собираются в как можно меньшее число сообщений
+    builder = MessageBuilder(parse_mode='Markdown', separator='\n\n')
+    builder.extend(_format_order(order, language) for order in page.items)
+    
+    markup = None
+    if page.next_cursor is not None:
+        markup = get_orders_page_keyboard(page.next_cursor, language)
+    
+    await builder.send(
+        io.bot,
+        user_id,
+        reply_markup=markup,
+        document_name='orders.txt',
+        document_caption=get_message('orders_document_caption', language)
+    )
+    return True
+
+# Фоновые загрузки изображений новых товаров: (ID пользователя, ID чата) -> Future.
+# Хранятся вне данных состояния, потому что хранилище состояний копирует данные
+_pending_images = {}
+
+async def _resolve_image_url(io, user_id, chat_id, data):
+    """Ссылка на изображение нового товара: копия в локальном хранилище, если загрузка удалась, иначе исходная"""
+    future = _pending_images.pop((user_id, chat_id), None)
+    if future is None:
+        return data.get('image_url')
+    
+    try:
+        stored = await io.wait(future, BotConfig.IMAGE_DOWNLOAD_TIMEOUT)
+        return image_store.reference(stored.digest)
+    except Exception as e:
+        logger.warning(f"Cannot store product image {data.get('image_url')}: {e}")
+        return data.get('image_url')
+
+async def _cancel_if_requested(io, message, language):
+    """Отменить ввод товара, если нажата кнопка отмены. Возвращает True, если ввод отменен"""
+    if message.text != get_message('cancel_btn', language):
+        return False
+    
+    _pending_images.pop((message.from_user.id, message.chat.id), None)
+    await io.bot.delete_state(message.from_user.id, message.chat.id)
+    await io.bot.send_message(
+        message.from_user.id,
+        get_message('operation_cancelled', language),
+        reply_markup=get_admin_keyboard(language)
+    )
+    return True
+
+@admin_required
+async def handle_admin(io, message: Message):
+    """Обработка команды /admin"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('admin_welcome', language),
+        reply_markup=get_admin_keyboard(language)
+    )
+    
+    logger.info(f"Admin {user_id} opened admin panel")
+
+# Обработчики добавления товара
+@admin_required
+async def handle_add_item(io, message: Message):
+    """Обработка команды /add_item"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('enter_product_name', language),
+        reply_markup=get_cancel_keyboard(language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_name, message.chat.id)
+    
+    logger.info(f"Admin {user_id} started adding a new product")
+
+async def handle_product_name(io, message: Message):
+    """Обработка ввода имени товара"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
+    
+    # Сохраняем имя товара в память
+    async with io.bot.retrieve_data(user_id, message.chat.id) as data:
+        data['name'] = message.text
+    
+    # Запрашиваем описание
+    await io.bot.send_message(
+        user_id,
+        get_message('enter_product_description', language),
+        reply_markup=get_cancel_keyboard(language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_description, message.chat.id)
+
+async def handle_product_description(io, message: Message):
+    """Обработка ввода описания товара"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
     
-    @bot.message_handler(commands=['admin'])
-    @admin_required
-    def handle_admin(message: Message):
-        """Обработка команды /admin"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        bot.send_message(
+    # Сохраняем описание товара в память
+    async with io.bot.retrieve_data(user_id, message.chat.id) as data:
+        data['description'] = message.text
+    
+    # Запрашиваем цену
+    await io.bot.send_message(
+        user_id,
+        get_message('enter_product_price', language),
+        reply_markup=get_cancel_keyboard(language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_price, message.chat.id)
+
+async def handle_product_price(io, message: Message):
+    """Обработка ввода цены товара"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
+    
+    # Валидация цены
+    is_valid, result = validate_price(message.text)
+    
+    if not is_valid:
+        await io.bot.send_message(
             user_id,
-            get_message('admin_welcome', language),
-            reply_markup=get_admin_keyboard(language)
+            result  # Сообщение об ошибке
         )
-        
-        logger.info(f"Admin {user_id} opened admin panel")
-    
-    # Обработчики добавления товара
-    @bot.message_handler(commands=['add_item'])
-    @admin_required
-    def handle_add_item(message: Message):
-        """Обработка команды /add_item"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        bot.send_message(
-            user_id,
-            get_message('enter_product_name', language),
-            reply_markup=get_cancel_keyboard(language)
+        return
+    
+    # Сохраняем цену товара в память
+    async with io.bot.retrieve_data(user_id, message.chat.id) as data:
+        data['price'] = result
+    
+    # Запрашиваем URL изображения (опционально)
+    await io.bot.send_message(
+        user_id,
+        get_message('enter_product_image', language),
+        reply_markup=get_cancel_keyboard(language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_image, message.chat.id)
+
+async def handle_product_image(io, message: Message):
+    """Обработка ввода URL изображения товара или фото"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
+    
+    # Сохраняем изображение в память. Скачивание и уменьшение выполняются в фоне,
+    # результат забирается при подтверждении
+    async with io.bot.retrieve_data(user_id, message.chat.id) as data:
+        key = (user_id, message.chat.id)
+        if message.photo:
+            # Если сохранить фото не удастся, товар получит его file_id
+            data['image_url'] = message.photo[-1].file_id
+            data['image_label'] = get_message('image_uploaded', language)
+            _pending_images[key] = io.ingest_telegram_file(message.photo[-1].file_id)
+        elif message.text != "-":
+            data['image_url'] = data['image_label'] = message.text
+            _pending_images[key] = image_store.submit(image_store.ingest_url, message.text)
+        else:
+            data['image_url'] = data['image_label'] = None
+            _pending_images.pop(key, None)
+    
+        # Формируем сообщение с информацией о товаре для подтверждения
+        product_info = (
+            f"*{get_message('product_name', language)}:* {data['name']}\n"
+            f"*{get_message('product_description', language)}:* {data['description']}\n"
+            f"*{get_message('product_price', language)}:* {data['price']} грн\n"
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_name, message.chat.id)
-        
-        logger.info(f"Admin {user_id} started adding a new product")
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_name)
-    def handle_product_name(message: Message):
-        """Обработка ввода имени товара"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
+    
+        if data.get('image_label'):
+            product_info += f"*{get_message('product_image', language)}:* {data['image_label']}\n"
+    
+    # Запрашиваем подтверждение
+    await io.bot.send_message(
+        user_id,
+        get_message('confirm_product_info', language) + "\n\n" + product_info,
+        parse_mode='Markdown',
+        reply_markup=get_cancel_keyboard(language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_confirm, message.chat.id)
+
+async def handle_product_confirmation(io, message: Message):
+    """Обработка подтверждения добавления товара"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
+    
+    # Если подтверждено
+    if message.text.lower() in ['да', 'yes', '+']:
+        async with io.bot.retrieve_data(user_id, message.chat.id) as data:
+            # Создаем товар
+            product = await io.catalog.create_product(
+                name=data['name'],
+                price=data['price'],
+                description=data['description'],
+                image_url=await _resolve_image_url(io, user_id, message.chat.id, data)
             )
-            return
-        
-        # Сохраняем имя товара в память
-        with bot.retrieve_data(user_id, message.chat.id) as data:
-            data['name'] = message.text
-        
-        # Запрашиваем описание
-        bot.send_message(
+    
+        await io.bot.send_message(
             user_id,
-            get_message('enter_product_description', language),
-            reply_markup=get_cancel_keyboard(language)
+            get_message('product_added_success', language),
+            reply_markup=get_admin_keyboard(language)
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_description, message.chat.id)
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_description)
-    def handle_product_description(message: Message):
-        """Обработка ввода описания товара"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Сохраняем описание товара в память
-        with bot.retrieve_data(user_id, message.chat.id) as data:
-            data['description'] = message.text
-        
-        # Запрашиваем цену
-        bot.send_message(
+    
+        logger.info(f"Admin {user_id} added new product ID: {product.id}")
+    else:
+        await io.bot.send_message(
             user_id,
-            get_message('enter_product_price', language),
-            reply_markup=get_cancel_keyboard(language)
+            get_message('operation_cancelled', language),
+            reply_markup=get_admin_keyboard(language)
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_price, message.chat.id)
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_price)
-    def handle_product_price(message: Message):
-        """Обработка ввода цены товара"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Валидация цены
-        is_valid, result = validate_price(message.text)
-        
-        if not is_valid:
-            bot.send_message(
-                user_id,
-                result  # Сообщение об ошибке
-            )
-            return
-        
-        # Сохраняем цену товара в память
-        with bot.retrieve_data(user_id, message.chat.id) as data:
-            data['price'] = result
-        
-        # Запрашиваем URL изображения (опционально)
-        bot.send_message(
+    
+    # Очищаем состояние
+    _pending_images.pop((user_id, message.chat.id), None)
+    await io.bot.delete_state(user_id, message.chat.id)
+
+# Обработчики удаления товара
+@admin_required
+async def handle_remove_item(io, message: Message):
+    """Обработка команды /remove_item"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Получаем все товары
+    products = await io.catalog.get_all_products(available_only=False)
+    
+    if not products:
+        await io.bot.send_message(
             user_id,
-            get_message('enter_product_image', language),
-            reply_markup=get_cancel_keyboard(language)
+            get_message('empty_catalog', language),
+            reply_markup=get_admin_keyboard(language)
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_image, message.chat.id)
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_image)
-    def handle_product_image(message: Message):
-        """Обработка ввода URL изображения товара"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Сохраняем URL изображения в память
-        with bot.retrieve_data(user_id, message.chat.id) as data:
-            data['image_url'] = message.text if message.text != "-" else None
-            
-            # Формируем сообщение с информацией о товаре для подтверждения
-            product_info = (
-                f"*{get_message('product_name', language)}:* {data['name']}\n"
-                f"*{get_message('product_description', language)}:* {data['description']}\n"
-                f"*{get_message('product_price', language)}:* {data['price']} грн\n"
-            )
-            
-            if data.get('image_url'):
-                product_info += f"*{get_message('product_image', language)}:* {data['image_url']}\n"
-        
-        # Запрашиваем подтверждение
-        bot.send_message(
+        return
+    
+    # Формируем список товаров: длинный каталог делится на несколько сообщений
+    builder = MessageBuilder()
+    builder.add(get_message('select_product_to_remove', language))
+    builder.extend(f"{p.id}. {p.name} - {p.price} грн" for p in products)
+    
+    await builder.send(
+        io.bot,
+        user_id,
+        reply_markup=get_cancel_keyboard(language),
+        document_name='products.txt',
+        document_caption=get_message('select_product_to_remove', language)
+    )
+    
+    await io.bot.set_state(user_id, AdminProductStates.waiting_for_product_id, message.chat.id)
+    
+    logger.info(f"Admin {user_id} started removing a product")
+
+async def handle_product_id_for_removal(io, message: Message):
+    """Обработка ввода ID товара для удаления"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Проверка на отмену
+    if await _cancel_if_requested(io, message, language):
+        return
+    
+    # Проверка ID товара
+    try:
+        product_id = int(message.text)
+    except ValueError:
+        await io.bot.send_message(
             user_id,
-            get_message('confirm_product_info', language) + "\n\n" + product_info,
-            parse_mode='Markdown',
-            reply_markup=get_cancel_keyboard(language)
+            get_message('invalid_product_id', language)
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_confirm, message.chat.id)
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_confirm)
-    def handle_product_confirmation(message: Message):
-        """Обработка подтверждения добавления товара"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Если подтверждено
-        if message.text.lower() in ['да', 'yes', '+']:
-            with bot.retrieve_data(user_id, message.chat.id) as data:
-                # Создаем товар
-                product = catalog_service.create_product(
-                    name=data['name'],
-                    price=data['price'],
-                    description=data['description'],
-                    image_url=data.get('image_url')
-                )
-            
-            bot.send_message(
-                user_id,
-                get_message('product_added_success', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            
-            logger.info(f"Admin {user_id} added new product ID: {product.id}")
-        else:
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-        
-        # Очищаем состояние
-        bot.delete_state(user_id, message.chat.id)
-    
-    # Обработчики удаления товара
-    @bot.message_handler(commands=['remove_item'])
-    @admin_required
-    def handle_remove_item(message: Message):
-        """Обработка команды /remove_item"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Получаем все товары
-        products = catalog_service.get_all_products(available_only=False)
-        
-        if not products:
-            bot.send_message(
-                user_id,
-                get_message('empty_catalog', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Формируем список товаров
-        product_list = "\n".join([f"{p.id}. {p.name} - {p.price} грн" for p in products])
-        
-        bot.send_message(
+        return
+    
+    # Удаляем товар
+    result = await io.catalog.delete_product(product_id)
+    
+    if result:
+        await io.bot.send_message(
             user_id,
-            get_message('select_product_to_remove', language) + "\n\n" + product_list,
-            reply_markup=get_cancel_keyboard(language)
+            get_message('product_removed_success', language),
+            reply_markup=get_admin_keyboard(language)
         )
-        
-        bot.set_state(user_id, AdminProductStates.waiting_for_product_id, message.chat.id)
-        
-        logger.info(f"Admin {user_id} started removing a product")
-    
-    @bot.message_handler(state=AdminProductStates.waiting_for_product_id)
-    def handle_product_id_for_removal(message: Message):
-        """Обработка ввода ID товара для удаления"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Проверка на отмену
-        if message.text == get_message('cancel_btn', language):
-            bot.delete_state(user_id, message.chat.id)
-            bot.send_message(
-                user_id,
-                get_message('operation_cancelled', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Проверка ID товара
-        try:
-            product_id = int(message.text)
-        except ValueError:
-            bot.send_message(
-                user_id,
-                get_message('invalid_product_id', language)
-            )
-            return
-        
-        # Удаляем товар
-        result = catalog_service.delete_product(product_id)
-        
-        if result:
-            bot.send_message(
-                user_id,
-                get_message('product_removed_success', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            
-            logger.info(f"Admin {user_id} removed product ID: {product_id}")
-        else:
-            bot.send_message(
-                user_id,
-                get_message('product_not_found', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-        
-        # Очищаем состояние
-        bot.delete_state(user_id, message.chat.id)
-    
-    # Обработчик просмотра заказов
-    @bot.message_handler(commands=['orders'])
-    @admin_required
-    def handle_orders(message: Message):
-        """Обработка команды /orders"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Получаем все заказы
-        orders = order_service.get_all_orders()
-        
-        if not orders:
-            bot.send_message(
-                user_id,
-                get_message('no_orders', language),
-                reply_markup=get_admin_keyboard(language)
-            )
-            return
-        
-        # Формируем список заказов
-        for order in orders:
-            order_info = (
-                f"*{get_message('order_id', language)}: {order.id}*\n"
-                f"{get_message('order_status', language)}: {order.status.value}\n"
-                f"{get_message('order_total', language)}: {order.total_amount} грн\n"
-                f"{get_message('order_date', language)}: {order.created_at.strftime('%d.%m.%Y %H:%M')}\n\n"
-                f"{get_message('order_items', language)}:\n"
-            )
-            
-            for item in order.items:
-                order_info += f"- {item.product.name} x{item.quantity} = {item.price * item.quantity} грн\n"
-            
-            if order.shipping_address:
-                order_info += f"\n{get_message('shipping_address', language)}: {order.shipping_address}\n"
-            
-            if order.contact_phone:
-                order_info += f"{get_message('contact_phone', language)}: {order.contact_phone}\n"
-            
-            # Отправляем информацию о заказе
-            bot.send_message(
-                user_id,
-                order_info,
-                parse_mode='Markdown'
-            )
-        
-        # Отправляем клавиатуру админа
-        bot.send_message(
+    
+        logger.info(f"Admin {user_id} removed product ID: {product_id}")
+    else:
+        await io.bot.send_message(
             user_id,
-            get_message('admin_menu', language),
+            get_message('product_not_found', language),
             reply_markup=get_admin_keyboard(language)
         )
-        
-        logger.info(f"Admin {user_id} viewed all orders")
-    
-    # Обработчик для текстовых сообщений соответствующих кнопкам
-    @bot.message_handler(func=lambda message: message.text == get_message('admin_products_btn', user_service.get_language(message.from_user.id)))
-    @admin_required
-    def handle_admin_products(message: Message):
-        """Обработка кнопки управления товарами"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        keyboard = telebot.types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-        keyboard.add(
-            telebot.types.KeyboardButton('/add_item'),
-            telebot.types.KeyboardButton('/remove_item'),
-            telebot.types.KeyboardButton(get_message('back_btn', language))
-        )
-        
-        bot.send_message(
+    
+    # Очищаем состояние
+    await io.bot.delete_state(user_id, message.chat.id)
+
+# Обработчик просмотра заказов
+@admin_required
+async def handle_orders(io, message: Message):
+    """Обработка команды /orders"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Отправляем первую страницу заказов, следующие - по кнопке
+    if not await _send_orders_page(io, user_id, language):
+        await io.bot.send_message(
             user_id,
-            get_message('select_product_action', language),
-            reply_markup=keyboard
+            get_message('no_orders', language),
+            reply_markup=get_admin_keyboard(language)
         )
+        return
     
-    @bot.message_handler(func=lambda message: message.text == get_message('admin_orders_btn', user_service.get_language(message.from_user.id)))
-    @admin_required
-    def handle_admin_orders(message: Message):
-        """Обработка кнопки управления заказами"""
-        handle_orders(message)
-    
-    @bot.message_handler(func=lambda message: message.text == get_message('back_btn', user_service.get_language(message.from_user.id)))
-    def handle_back_button(message: Message):
-        """Обработка кнопки назад"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        if user_service.is_admin(user_id):
-            keyboard = get_admin_keyboard(language)
-        else:
-            keyboard = get_main_keyboard(language)
-        
-        bot.send_message(
-            user_id,
-            get_message('main_menu_message', language),
-            reply_markup=keyboard
-        )
\ No newline at end of file
+    # Отправляем клавиатуру админа
+    await io.bot.send_message(
+        user_id,
+        get_message('admin_menu', language),
+        reply_markup=get_admin_keyboard(language)
+    )
+    
+    logger.info(f"Admin {user_id} viewed orders")
+
+async def handle_orders_page(io, call: CallbackQuery):
+    """Обработка перехода на следующую страницу заказов"""
+    user_id = call.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    if not await io.context.is_admin(user_id):
+        await io.bot.answer_callback_query(call.id)
+        return
+    
+    after_id = int(call.data.split('_')[2])
+    await io.bot.answer_callback_query(call.id)
+    if not await _send_orders_page(io, user_id, language, after_id):
+        await io.bot.send_message(user_id, get_message('no_orders', language))
+    
+    logger.info(f"Admin {user_id} viewed orders after {after_id}")
+
+# Прогрев file_id изображений товаров
+@admin_required
+async def handle_warm_images(io, message: Message):
+    """Обработка команды /warm_images"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    if warm_product_images(io, message.chat.id, language) is None:
+        await io.bot.send_message(user_id, get_message('warm_images_running', language))
+        return
+    
+    await io.bot.send_message(user_id, get_message('warm_images_started', language))
+    
+    logger.info(f"Admin {user_id} started image warm-up")
+
+# Обработчики для текстовых сообщений соответствующих кнопкам
+@admin_required
+async def handle_admin_products(io, message: Message):
+    """Обработка кнопки управления товарами"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('select_product_action', language),
+        reply_markup=get_admin_products_keyboard(language)
+    )
+
+async def handle_back_button(io, message: Message):
+    """Обработка кнопки назад"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    if await io.context.is_admin(user_id):
+        keyboard = get_admin_keyboard(language)
+    else:
+        keyboard = get_main_keyboard(language)
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('main_menu_message', language),
+        reply_markup=keyboard
+    )
+
+def register_admin_handlers(bot: TeleBot, io):
+    """Регистрация обработчиков для администраторов"""
+    bot.register_message_handler(io.handler(handle_admin), commands=['admin'])
+    
+    # Добавление товара
+    bot.register_message_handler(io.handler(handle_add_item), commands=['add_item'])
+    bot.register_message_handler(io.handler(handle_product_name), state=AdminProductStates.waiting_for_name)
+    bot.register_message_handler(io.handler(handle_product_description), state=AdminProductStates.waiting_for_description)
+    bot.register_message_handler(io.handler(handle_product_price), state=AdminProductStates.waiting_for_price)
+    bot.register_message_handler(
+        io.handler(handle_product_image),
+        state=AdminProductStates.waiting_for_image,
+        content_types=['text', 'photo']
+    )
+    bot.register_message_handler(io.handler(handle_product_confirmation), state=AdminProductStates.waiting_for_confirm)
+    
+    # Удаление товара
+    bot.register_message_handler(io.handler(handle_remove_item), commands=['remove_item'])
+    bot.register_message_handler(io.handler(handle_product_id_for_removal), state=AdminProductStates.waiting_for_product_id)
+    
+    # Заказы и прогрев изображений
+    bot.register_message_handler(io.handler(handle_orders), commands=['orders'])
+    bot.register_callback_query_handler(
+        io.handler(handle_orders_page),
+        func=lambda call: call.data.startswith('orders_page_')
+    )
+    bot.register_message_handler(io.handler(handle_warm_images), commands=['warm_images'])
+    
+    # Текстовые кнопки
+    io.text_router.add_route('admin_products_btn', io.handler(handle_admin_products))
+    io.text_router.add_route('admin_orders_btn', io.handler(handle_orders))
+    io.text_router.add_route('back_btn', io.handler(handle_back_button))
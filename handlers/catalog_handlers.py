@@ -1,105 +1,233 @@
 from telebot import TeleBot
+from telebot.util import extract_arguments
 from telebot.types import Message, CallbackQuery
 from services.catalog_service import CatalogService
-from services.user_service import UserService
-from keyboards.inline_keyboards import get_catalog_keyboard, get_product_detail_keyboard
+from keyboards.inline_keyboards import get_catalog_keyboard
 from utils.helpers import get_message
+from config.bot_config import BotConfig
 from config.logging_config import setup_logger
+from utils.cache import LRUCache
+from utils.handler_io import API_ERRORS
+from utils.product_images import send_product_photo
+from utils.product_cards import get_product_card
 
 logger = setup_logger()
 catalog_service = CatalogService()
-user_service = UserService()
 
-def register_catalog_handlers(bot: TeleBot):
-    """Регистрация обработчиков каталога"""
+# Отрисованные страницы каталога: (язык, страница, версия каталога) -> (номер страницы, JSON клавиатуры)
+catalog_page_cache = LRUCache(maxsize=BotConfig.CATALOG_RENDER_CACHE_SIZE)
+
+def render_catalog_page(language, page):
+    """Отрисовать страницу каталога.
     
-    @bot.message_handler(commands=['catalog'])
-    def handle_catalog(message: Message):
-        """Обработка команды /catalog"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Получаем все товары
-        products = catalog_service.get_all_products()
-        
-        if not products:
-            bot.send_message(
-                user_id,
-                get_message('empty_catalog', language)
-            )
-            return
-        
-        # Отправляем сообщение с каталогом
-        bot.send_message(
+    Возвращает (номер страницы, JSON клавиатуры) или (номер страницы, None), если каталог пуст.
+    Пока каталог не изменился, страница берется из кеша без запросов к БД.
+    """
+    key = (language, page, catalog_service.get_version())
+    rendered = catalog_page_cache.get(key)
+    if rendered is None:
+        number, result = catalog_service.get_catalog_page(page)
+        markup = None
+        if result.items:
+            markup = get_catalog_keyboard(
+                result.items,
+                language,
+                page=number,
+                has_next=result.next_cursor is not None
+            ).to_json()
+        rendered = (number, markup)
+        catalog_page_cache.set(key, rendered)
+    return rendered
+
+async def load_catalog_page(io, language, page):
+    """Отрисовать страницу каталога, загрузив снимок каталога через сервис io (в asyncio-режиме - без блокировки цикла событий)"""
+    await io.catalog.get_snapshot()
+    return render_catalog_page(language, page)
+
+# Последний поисковый запрос пользователя (для кнопок перехода по страницам результатов)
+search_queries = LRUCache(maxsize=BotConfig.USER_CACHE_SIZE, ttl=BotConfig.USER_CACHE_TTL)
+
+async def render_search_page(io, language, query, page):
+    """Отрисовать страницу результатов поиска: (текст, JSON клавиатуры или None)"""
+    number, result = await io.catalog.search_products(query, page)
+    return build_search_page(language, query, number, result)
+
+def build_search_page(language, query, number, result):
+    """Текст и JSON клавиатуры для найденной страницы результатов поиска"""
+    if not result.items:
+        return get_message('search_no_results', language), None
+    
+    markup = get_catalog_keyboard(
+        result.items,
+        language,
+        page=number,
+        has_next=result.next_cursor is not None,
+        page_callback='search_page'
+    ).to_json()
+    return get_message('search_results', language).format(query=query), markup
+
+async def handle_catalog(io, message: Message):
+    """Обработка команды /catalog"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Получаем первую страницу каталога
+    _, markup = await load_catalog_page(io, language, 0)
+    
+    if markup is None:
+        await io.bot.send_message(
             user_id,
-            get_message('catalog_title', language),
-            reply_markup=get_catalog_keyboard(products, language)
-        )
-        
-        logger.info(f"User {user_id} opened catalog")
-    
-    @bot.callback_query_handler(func=lambda call: call.data.startswith('product_'))
-    def handle_product_selection(call: CallbackQuery):
-        """Обработка выбора товара из каталога"""
-        user_id = call.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Получаем ID товара
-        product_id = int(call.data.split('_')[1])
-        
-        # Получаем информацию о товаре
-        product = catalog_service.get_product(product_id)
-        
-        if not product:
-            bot.answer_callback_query(call.id, get_message('product_not_found', language))
-            return
-        
-        # Формируем сообщение с информацией о товаре
-        product_info = (
-            f"*{product.name}*\n\n"
-            f"{product.description}\n\n"
-            f"_{get_message('price_label', language)}: {product.price} грн_"
+            get_message('empty_catalog', language)
         )
-        
-        # Отправляем сообщение с информацией о товаре
-        if product.image_url:
-            bot.send_photo(
-                user_id,
-                product.image_url,
-                caption=product_info,
-                parse_mode='Markdown',
-                reply_markup=get_product_detail_keyboard(product_id, language)
-            )
-        else:
-            bot.send_message(
+        return
+    
+    # Отправляем сообщение с каталогом
+    await io.bot.send_message(
+        user_id,
+        get_message('catalog_title', language),
+        reply_markup=markup
+    )
+    
+    logger.info(f"User {user_id} opened catalog")
+
+async def handle_product_selection(io, call: CallbackQuery):
+    """Обработка выбора товара из каталога"""
+    user_id = call.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Получаем ID товара
+    product_id = int(call.data.split('_')[1])
+    
+    # Получаем информацию о товаре
+    snapshot = await io.catalog.get_snapshot()
+    product = snapshot.get(product_id)
+    
+    if not product:
+        await io.bot.answer_callback_query(call.id, get_message('product_not_found', language))
+        return
+    
+    # Карточка товара отрисовывается один раз на версию каталога и язык
+    card = get_product_card(product, language, snapshot.version)
+    
+    # Отправляем сообщение с информацией о товаре.
+    # Изображение отправляется по file_id после первой отправки; если его не удалось
+    # отправить, показываем товар без изображения
+    sent = False
+    if product.image_url:
+        try:
+            await send_product_photo(
+                io,
                 user_id,
-                product_info,
-                parse_mode='Markdown',
-                reply_markup=get_product_detail_keyboard(product_id, language)
+                product,
+                caption=card.caption,
+                parse_mode=card.parse_mode,
+                reply_markup=card.reply_markup
             )
-        
-        logger.info(f"User {user_id} viewed product {product_id}")
-    
-    @bot.callback_query_handler(func=lambda call: call.data == 'back_to_catalog')
-    def handle_back_to_catalog(call: CallbackQuery):
-        """Обработка возврата к каталогу"""
-        user_id = call.from_user.id
-        language = user_service.get_language(user_id)
-        
-        # Получаем все товары
-        products = catalog_service.get_all_products()
-        
-        # Обновляем сообщение с каталогом
-        bot.edit_message_text(
-            get_message('catalog_title', language),
+            sent = True
+        except (*API_ERRORS, OSError) as e:
+            logger.warning(f"Cannot send image of product {product_id}: {e}")
+    
+    if not sent:
+        await io.bot.send_message(
             user_id,
-            call.message.message_id,
-            reply_markup=get_catalog_keyboard(products, language)
+            card.caption,
+            parse_mode=card.parse_mode,
+            reply_markup=card.reply_markup
         )
-        
-        logger.info(f"User {user_id} returned to catalog")
+    
+    logger.info(f"User {user_id} viewed product {product_id}")
+
+async def handle_back_to_catalog(io, call: CallbackQuery):
+    """Обработка возврата к каталогу"""
+    user_id = call.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    # Получаем первую страницу каталога
+    _, markup = await load_catalog_page(io, language, 0)
+    
+    # Обновляем сообщение с каталогом
+    await io.bot.edit_message_text(
+        get_message('catalog_title', language),
+        user_id,
+        call.message.message_id,
+        reply_markup=markup
+    )
+    
+    logger.info(f"User {user_id} returned to catalog")
+
+async def handle_catalog_page(io, call: CallbackQuery):
+    """Обработка перехода на другую страницу каталога"""
+    user_id = call.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    page = int(call.data.split('_')[2])
+    _, markup = await load_catalog_page(io, language, page)
+    
+    await io.bot.edit_message_text(
+        get_message('catalog_title', language),
+        user_id,
+        call.message.message_id,
+        reply_markup=markup
+    )
+    await io.bot.answer_callback_query(call.id)
+
+async def handle_search(io, message: Message):
+    """Обработка команды /search <запрос>"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    query = extract_arguments(message.text).strip()
+    if not query:
+        await io.bot.send_message(user_id, get_message('search_usage', language))
+        return
+    
+    search_queries.set(user_id, query)
+    text, markup = await render_search_page(io, language, query, 0)
+    await io.bot.send_message(user_id, text, reply_markup=markup)
+    
+    logger.info(f"User {user_id} searched for '{query}'")
+
+async def handle_search_page(io, call: CallbackQuery):
+    """Обработка перехода на другую страницу результатов поиска"""
+    user_id = call.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    query = search_queries.get(user_id)
+    if query is None:
+        await io.bot.answer_callback_query(call.id, get_message('search_usage', language))
+        return
+    
+    page = int(call.data.split('_')[2])
+    text, markup = await render_search_page(io, language, query, page)
+    
+    await io.bot.edit_message_text(
+        text,
+        user_id,
+        call.message.message_id,
+        reply_markup=markup
+    )
+    await io.bot.answer_callback_query(call.id)
+
+def register_catalog_handlers(bot: TeleBot, io):
+    """Регистрация обработчиков каталога"""
+    bot.register_message_handler(io.handler(handle_catalog), commands=['catalog'])
+    bot.register_callback_query_handler(
+        io.handler(handle_product_selection),
+        func=lambda call: call.data.startswith('product_')
+    )
+    bot.register_callback_query_handler(
+        io.handler(handle_back_to_catalog),
+        func=lambda call: call.data == 'back_to_catalog'
+    )
+    bot.register_callback_query_handler(
+        io.handler(handle_catalog_page),
+        func=lambda call: call.data.startswith('catalog_page_')
+    )
+    bot.register_message_handler(io.handler(handle_search), commands=['search'])
+    bot.register_callback_query_handler(
+        io.handler(handle_search_page),
+        func=lambda call: call.data.startswith('search_page_')
+    )
     
     # Обработчик для текстовых сообщений соответствующих кнопкам
-    @bot.message_handler(func=lambda message: message.text == get_message('catalog_btn', user_service.get_language(message.from_user.id)))
-    def handle_catalog_button(message: Message):
-        handle_catalog(message)
\ No newline at end of file
+    io.text_router.add_route('catalog_btn', io.handler(handle_catalog))
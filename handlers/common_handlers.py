@@ -1,105 +1,95 @@
 from telebot import TeleBot
 from telebot.types import Message, CallbackQuery
-from services.user_service import UserService
 from keyboards.reply_keyboards import get_main_keyboard, get_admin_keyboard
 from keyboards.inline_keyboards import get_language_keyboard
 from utils.helpers import get_message
 from config.logging_config import setup_logger
 
 logger = setup_logger()
-user_service = UserService()
 
-def register_common_handlers(bot: TeleBot):
-    """Регистрация обработчиков общих команд"""
+async def handle_start(io, message: Message):
+    """Обработка команды /start"""
+    user_id = message.from_user.id
+    # Пользователь создается (или загружается) middleware контекста
+    language = await io.context.get_language(user_id)
+    
+    # Приветственное сообщение
+    await io.bot.send_message(
+        user_id,
+        get_message('welcome_message', language),
+        reply_markup=get_language_keyboard()
+    )
     
-    @bot.message_handler(commands=['start'])
-    def handle_start(message: Message):
-        """Обработка команды /start"""
-        user_id = message.from_user.id
-        user = user_service.get_user(
-            telegram_id=user_id,
-            username=message.from_user.username,
-            first_name=message.from_user.first_name,
-            last_name=message.from_user.last_name
-        )
-        
-        language = user_service.get_language(user_id)
-        
-        # Приветственное сообщение
-        bot.send_message(
-            user_id,
-            get_message('welcome_message', language),
-            reply_markup=get_language_keyboard()
-        )
-        
-        logger.info(f"User {user_id} started the bot")
+    logger.info(f"User {user_id} started the bot")
+
+async def handle_help(io, message: Message):
+    """Обработка команды /help"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
     
-    @bot.message_handler(commands=['help'])
-    def handle_help(message: Message):
-        """Обработка команды /help"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        bot.send_message(
-            user_id,
-            get_message('help_message', language),
-            parse_mode='Markdown'
-        )
-        
-        logger.info(f"User {user_id} requested help")
+    await io.bot.send_message(
+        user_id,
+        get_message('help_message', language),
+        parse_mode='Markdown'
+    )
     
-    @bot.message_handler(commands=['info'])
-    def handle_info(message: Message):
-        """Обработка команды /info"""
-        user_id = message.from_user.id
-        language = user_service.get_language(user_id)
-        
-        bot.send_message(
-            user_id,
-            get_message('info_message', language),
-            parse_mode='Markdown'
-        )
-        
-        logger.info(f"User {user_id} requested info")
+    logger.info(f"User {user_id} requested help")
+
+async def handle_info(io, message: Message):
+    """Обработка команды /info"""
+    user_id = message.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('info_message', language),
+        parse_mode='Markdown'
+    )
+    
+    logger.info(f"User {user_id} requested info")
+
+async def handle_language_selection(io, call: CallbackQuery):
+    """Обработка выбора языка"""
+    user_id = call.from_user.id
+    language = call.data.split('_')[1]
     
-    @bot.callback_query_handler(func=lambda call: call.data.startswith('language_'))
-    def handle_language_selection(call: CallbackQuery):
-        """Обработка выбора языка"""
-        user_id = call.from_user.id
-        language = call.data.split('_')[1]
-        
-        # Обновляем язык пользователя
-        user_service.set_language(user_id, language)
-        
-        # Отправляем сообщение на выбранном языке
-        bot.answer_callback_query(call.id, get_message('language_changed', language))
-        
-        # Отправляем главное меню
-        if user_service.is_admin(user_id):
-            keyboard = get_admin_keyboard(language)
-        else:
-            keyboard = get_main_keyboard(language)
-        
-        bot.edit_message_text(
-            get_message('language_selected_message', language),
-            user_id,
-            call.message.message_id,
-            reply_markup=None
-        )
-        
-        bot.send_message(
-            user_id,
-            get_message('main_menu_message', language),
-            reply_markup=keyboard
-        )
-        
-        logger.info(f"User {user_id} selected language: {language}")
+    # Обновляем язык пользователя
+    await io.users.set_language(user_id, language)
     
-    # Обработчик для текстовых сообщений соответствующих кнопкам
-    @bot.message_handler(func=lambda message: message.text == get_message('help_btn', user_service.get_language(message.from_user.id)))
-    def handle_help_button(message: Message):
-        handle_help(message)
+    # Отправляем сообщение на выбранном языке
+    await io.bot.answer_callback_query(call.id, get_message('language_changed', language))
+    
+    # Отправляем главное меню
+    if await io.context.is_admin(user_id):
+        keyboard = get_admin_keyboard(language)
+    else:
+        keyboard = get_main_keyboard(language)
+    
+    await io.bot.edit_message_text(
+        get_message('language_selected_message', language),
+        user_id,
+        call.message.message_id,
+        reply_markup=None
+    )
+    
+    await io.bot.send_message(
+        user_id,
+        get_message('main_menu_message', language),
+        reply_markup=keyboard
+    )
+    
+    logger.info(f"User {user_id} selected language: {language}")
+
+def register_common_handlers(bot: TeleBot, io):
+    """Регистрация обработчиков общих команд"""
+    bot.register_message_handler(io.handler(handle_start), commands=['start'])
+    bot.register_message_handler(io.handler(handle_help), commands=['help'])
+    bot.register_message_handler(io.handler(handle_info), commands=['info'])
+    bot.register_callback_query_handler(
+        io.handler(handle_language_selection),
+        func=lambda call: call.data.startswith('language_')
+    )
     
-    @bot.message_handler(func=lambda message: message.text == get_message('info_btn', user_service.get_language(message.from_user.id)))
-    def handle_info_button(message: Message):
-        handle_info(message)
\ No newline at end of file
+    # Обработчики для текстовых сообщений соответствующих кнопкам
+    io.text_router.add_route('help_btn', io.handler(handle_help))
+    io.text_router.add_route('info_btn', io.handler(handle_info))
@@ -0,0 +1,72 @@
+from telebot import TeleBot
+from telebot.types import InlineQuery, InlineQueryResultArticle, InputTextMessageContent
+from services.catalog_service import CatalogService
+from services.product_index import normalize_words
+from utils.cache import LRUCache
+from utils.product_cards import get_product_card
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+
+logger = setup_logger()
+catalog_service = CatalogService()
+
+# Готовые страницы ответов: (нормализованный запрос, язык, версия каталога, смещение) -> (результаты, next_offset)
+inline_results_cache = LRUCache(maxsize=BotConfig.INLINE_CACHE_SIZE)
+
+def build_inline_result(product, language, version):
+    """Результат inline-запроса: карточка товара, которую можно отправить в любой чат"""
+    card = get_product_card(product, language, version)
+    thumbnail_url = None
+    if product.image_url and product.image_url.startswith(('http://', 'https://')):
+        thumbnail_url = product.image_url
+    
+    return InlineQueryResultArticle(
+        id=str(product.id),
+        title=product.name,
+        description=f"{product.price} грн",
+        input_message_content=InputTextMessageContent(card.caption, parse_mode=card.parse_mode),
+        thumbnail_url=thumbnail_url
+    )
+
+def get_inline_results(query, language, offset):
+    """Страница результатов для inline-запроса: (результаты, next_offset)"""
+    version, products = catalog_service.find_products_by_name(query)
+    key = (' '.join(normalize_words(query)), language, version, offset)
+    page = inline_results_cache.get(key)
+    if page is None:
+        size = BotConfig.INLINE_PAGE_SIZE
+        results = [
+            build_inline_result(product, language, version)
+            for product in products[offset:offset + size]
+        ]
+        next_offset = str(offset + size) if offset + size < len(products) else ''
+        page = (results, next_offset)
+        inline_results_cache.set(key, page)
+    return page
+
+async def handle_inline_query(io, inline_query: InlineQuery):
+    """Обработка inline-запроса @bot <текст>"""
+    user_id = inline_query.from_user.id
+    language = await io.context.get_language(user_id)
+    
+    try:
+        offset = max(int(inline_query.offset or 0), 0)
+    except ValueError:
+        offset = 0
+    
+    # Снимок каталога загружается через сервис io, дальше поиск работает только с памятью
+    await io.catalog.get_snapshot()
+    results, next_offset = get_inline_results(inline_query.query, language, offset)
+    
+    # Подпись карточки зависит от языка пользователя, поэтому кеш Telegram - персональный
+    await io.bot.answer_inline_query(
+        inline_query.id,
+        results,
+        cache_time=BotConfig.INLINE_CACHE_TIME,
+        is_personal=True,
+        next_offset=next_offset
+    )
+
+def register_inline_handlers(bot: TeleBot, io):
+    """Регистрация обработчиков inline-режима"""
+    bot.register_inline_handler(io.handler(handle_inline_query), func=lambda query: True)
@@ -1,7 +1,7 @@
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-def get_catalog_keyboard(products, language='uk'):
-    """Клавиатура для каталога товаров"""
+def get_catalog_keyboard(products, language='uk', page=0, has_next=False, page_callback='catalog_page'):
+    """Клавиатура для каталога товаров (одна страница). page_callback - префикс callback кнопок навигации"""
     keyboard = InlineKeyboardMarkup(row_width=1)
     
     for product in products:
@@ -11,6 +11,37 @@ def get_catalog_keyboard(products, language='uk'):
             callback_data=f"product_{product.id}"
         ))
     
+    # Навигация по страницам
+    navigation = []
+    if page > 0 or has_next:
+        from utils.helpers import get_message
+        
+        if page > 0:
+            navigation.append(InlineKeyboardButton(
+                text=get_message('prev_page_btn', language),
+                callback_data=f"{page_callback}_{page - 1}"
+            ))
+        if has_next:
+            navigation.append(InlineKeyboardButton(
+                text=get_message('next_page_btn', language),
+                callback_data=f"{page_callback}_{page + 1}"
+            ))
+        keyboard.row(*navigation)
+    
+    return keyboard
+
+def get_orders_page_keyboard(next_cursor, language='uk'):
+    """Клавиатура страницы заказов: кнопка следующей страницы (курсор - ID последнего показанного заказа)"""
+    keyboard = InlineKeyboardMarkup(row_width=1)
+    
+    # Загружаем локализацию
+    from utils.helpers import get_message
+    
+    keyboard.add(InlineKeyboardButton(
+        text=get_message('next_page_btn', language),
+        callback_data=f"orders_page_{next_cursor}"
+    ))
+    
     return keyboard
 
 def get_product_detail_keyboard(product_id, language='uk'):
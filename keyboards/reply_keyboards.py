@@ -1,12 +1,11 @@
 from telebot.types import ReplyKeyboardMarkup, KeyboardButton
 
-def get_main_keyboard(language='uk'):
+from utils.helpers import get_message, locale_registry
+
+def build_main_keyboard(language='uk'):
     """Главная клавиатура"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     
-    # Загружаем локализацию
-    from utils.helpers import get_message
-    
     keyboard.add(
         KeyboardButton(get_message('catalog_btn', language)),
         KeyboardButton(get_message('info_btn', language)),
@@ -16,13 +15,10 @@ def get_main_keyboard(language='uk'):
     
     return keyboard
 
-def get_admin_keyboard(language='uk'):
+def build_admin_keyboard(language='uk'):
     """Админская клавиатура"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
     
-    # Загружаем локализацию
-    from utils.helpers import get_message
-    
     # Добавляем обычные кнопки
     keyboard.add(
         KeyboardButton(get_message('catalog_btn', language)),
@@ -39,13 +35,74 @@ def get_admin_keyboard(language='uk'):
     
     return keyboard
 
-def get_cancel_keyboard(language='uk'):
+def build_admin_products_keyboard(language='uk'):
+    """Клавиатура управления товарами"""
+    keyboard = ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
+    
+    keyboard.add(
+        KeyboardButton('/add_item'),
+        KeyboardButton('/remove_item'),
+        KeyboardButton(get_message('back_btn', language))
+    )
+    
+    return keyboard
+
+def build_cancel_keyboard(language='uk'):
     """Клавиатура отмены"""
     keyboard = ReplyKeyboardMarkup(resize_keyboard=True)
     
-    # Загружаем локализацию
-    from utils.helpers import get_message
-    
     keyboard.add(KeyboardButton(get_message('cancel_btn', language)))
     
-    return keyboard
\ No newline at end of file
+    return keyboard
+
+# Статические клавиатуры, которые собираются заранее для каждого языка
+KEYBOARD_BUILDERS = {
+    'main': build_main_keyboard,
+    'admin': build_admin_keyboard,
+    'admin_products': build_admin_products_keyboard,
+    'cancel': build_cancel_keyboard,
+}
+
+# Готовые клавиатуры: (название, язык) -> JSON разметки. Словарь заменяется целиком
+_prebuilt = {}
+
+def rebuild_keyboards():
+    """Собрать JSON всех статических клавиатур для всех языков (после загрузки локализаций)"""
+    global _prebuilt
+    
+    languages = set(locale_registry.languages) | {locale_registry.default_language}
+    prebuilt = {
+        (name, language): build(language).to_json()
+        for name, build in KEYBOARD_BUILDERS.items()
+        for language in languages
+    }
+    _prebuilt = prebuilt
+
+def get_keyboard(name, language='uk'):
+    """Готовый JSON клавиатуры (для неизвестного языка - на языке по умолчанию)"""
+    if not _prebuilt:
+        rebuild_keyboards()
+    prebuilt = _prebuilt
+    markup = prebuilt.get((name, language))
+    if markup is None:
+        markup = prebuilt[(name, locale_registry.default_language)]
+    return markup
+
+def get_main_keyboard(language='uk'):
+    """Главная клавиатура"""
+    return get_keyboard('main', language)
+
+def get_admin_keyboard(language='uk'):
+    """Админская клавиатура"""
+    return get_keyboard('admin', language)
+
+def get_admin_products_keyboard(language='uk'):
+    """Клавиатура управления товарами"""
+    return get_keyboard('admin_products', language)
+
+def get_cancel_keyboard(language='uk'):
+    """Клавиатура отмены"""
+    return get_keyboard('cancel', language)
+
+# Клавиатуры пересобираются при перезагрузке локализаций
+locale_registry.add_reload_listener(rebuild_keyboards)
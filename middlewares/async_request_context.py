@@ -0,0 +1,84 @@
+import time
+from contextvars import ContextVar
+from telebot.asyncio_handler_backends import BaseMiddleware
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from services.async_user_service import AsyncUserService
+from middlewares.request_context import is_start_command
+
+logger = setup_logger()
+user_service = AsyncUserService()
+
+# Контекст текущего обновления (обработчик выполняется в той же задаче asyncio, что и middleware)
+_context = ContextVar('request_context', default=None)
+
+class AsyncRequestContext:
+    """Контекст обработки одного обновления в asyncio-режиме"""
+    
+    def __init__(self, profile):
+        self.profile = profile
+        self.started_at = time.perf_counter()
+    
+    @property
+    def user_id(self):
+        return self.profile.telegram_id
+    
+    @property
+    def language(self):
+        return self.profile.language
+    
+    @property
+    def is_admin(self):
+        return self.profile.is_admin or self.user_id in BotConfig.ADMIN_IDS
+    
+    def elapsed(self):
+        """Время с начала обработки обновления в секундах"""
+        return time.perf_counter() - self.started_at
+
+def get_context():
+    """Получить контекст текущего обновления"""
+    return _context.get()
+
+async def get_language(user_id):
+    """Язык пользователя из контекста обновления"""
+    context = get_context()
+    if context and context.user_id == user_id:
+        return context.language
+    return await user_service.get_language(user_id)
+
+async def is_admin(user_id):
+    """Права администратора из контекста обновления"""
+    context = get_context()
+    if context and context.user_id == user_id:
+        return context.is_admin
+    return await user_service.is_admin(user_id)
+
+class AsyncRequestContextMiddleware(BaseMiddleware):
+    """Загружает профиль пользователя один раз на обновление"""
+    
+    def __init__(self):
+        super().__init__()
+        self.update_types = ['message', 'callback_query', 'inline_query']
+    
+    async def pre_process(self, message, data):
+        user = message.from_user
+        profile = await user_service.get_profile(
+            telegram_id=user.id,
+            refresh=is_start_command(message),
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name
+        )
+        data['request_context_token'] = _context.set(AsyncRequestContext(profile))
+    
+    async def post_process(self, message, data, exception):
+        token = data.pop('request_context_token', None)
+        if token is None:
+            return
+        
+        context = get_context()
+        _context.reset(token)
+        
+        elapsed = context.elapsed()
+        if elapsed >= BotConfig.SLOW_UPDATE_THRESHOLD:
+            logger.warning(f"Slow update from user {context.user_id}: {elapsed:.3f}s")
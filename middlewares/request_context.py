@@ -0,0 +1,109 @@
+import threading
+import time
+from telebot.handler_backends import BaseMiddleware
+from telebot.util import extract_command
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from database.db_manager import db_manager
+from services.user_service import UserService
+
+logger = setup_logger()
+user_service = UserService()
+
+# Контекст текущего обновления (обработчик выполняется в том же потоке, что и middleware)
+_local = threading.local()
+
+class RequestContext:
+    """Контекст обработки одного обновления"""
+    
+    def __init__(self, profile, unit_of_work):
+        self.profile = profile
+        self.unit_of_work = unit_of_work
+        self.started_at = time.perf_counter()
+    
+    @property
+    def user_id(self):
+        return self.profile.telegram_id
+    
+    @property
+    def language(self):
+        return self.profile.language
+    
+    @property
+    def is_admin(self):
+        return self.profile.is_admin or self.user_id in BotConfig.ADMIN_IDS
+    
+    @property
+    def session(self):
+        """Сессия БД, общая для всего обновления"""
+        return self.unit_of_work.session
+    
+    def elapsed(self):
+        """Время с начала обработки обновления в секундах"""
+        return time.perf_counter() - self.started_at
+    
+    def close(self, exception=None):
+        """Завершить единицу работы обновления"""
+        self.unit_of_work.complete(exception)
+
+def get_context():
+    """Получить контекст текущего обновления"""
+    return getattr(_local, 'context', None)
+
+def get_language(user_id):
+    """Язык пользователя из контекста обновления"""
+    context = get_context()
+    if context and context.user_id == user_id:
+        return context.language
+    return user_service.get_language(user_id)
+
+def is_admin(user_id):
+    """Права администратора из контекста обновления"""
+    context = get_context()
+    if context and context.user_id == user_id:
+        return context.is_admin
+    return user_service.is_admin(user_id)
+
+def is_start_command(message):
+    """Команда /start: при ней данные пользователя в БД обновляются (в остальных обновлениях - только читаются)"""
+    text = getattr(message, 'text', None)
+    return bool(text) and extract_command(text) == 'start'
+
+class RequestContextMiddleware(BaseMiddleware):
+    """Загружает профиль пользователя один раз на обновление и открывает для него единицу работы"""
+    
+    def __init__(self):
+        super().__init__()
+        self.update_types = ['message', 'callback_query']
+    
+    def pre_process(self, message, data):
+        # Контекст мог остаться от обновления, для которого не был вызван post_process
+        stale = get_context()
+        if stale is not None:
+            _local.context = None
+            stale.close(RuntimeError("Update context was not closed"))
+        
+        user = message.from_user
+        profile = user_service.get_profile(
+            telegram_id=user.id,
+            refresh=is_start_command(message),
+            username=user.username,
+            first_name=user.first_name,
+            last_name=user.last_name
+        )
+        # Профиль загружается до начала единицы работы: ошибка обработчика не должна откатить создание пользователя
+        _local.context = RequestContext(profile, db_manager.begin_unit_of_work())
+    
+    def post_process(self, message, data, exception):
+        context = get_context()
+        if context is None:
+            return
+        
+        try:
+            context.close(exception)
+        finally:
+            _local.context = None
+        
+        elapsed = context.elapsed()
+        if elapsed >= BotConfig.SLOW_UPDATE_THRESHOLD:
+            logger.warning(f"Slow update from user {context.user_id}: {elapsed:.3f}s")
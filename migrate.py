@@ -0,0 +1,44 @@
+import argparse
+import sys
+
+from database.db_manager import db_manager
+from database.migrations import discover_migrations, get_current_version, run_migrations
+from database.migrations.query_plans import check_query_plans
+
+# Импортируем модели перед созданием таблиц
+from database.models import User, Product, Order, OrderItem, Payment, Feedback
+
+def main():
+    parser = argparse.ArgumentParser(description="Миграции схемы базы данных")
+    parser.add_argument('--target', type=int, default=None, help="Применить миграции до указанной версии")
+    parser.add_argument('--status', action='store_true', help="Показать текущую версию и непримененные миграции")
+    parser.add_argument('--check', action='store_true', help="Проверить планы частых запросов (EXPLAIN QUERY PLAN)")
+    args = parser.parse_args()
+    
+    if args.status:
+        current = get_current_version(db_manager.engine)
+        print(f"Current schema version: {current}")
+        for migration in discover_migrations():
+            mark = 'x' if migration.version <= current else ' '
+            print(f"[{mark}] {migration.name}: {migration.description}")
+        return 0
+    
+    if args.check:
+        failed = 0
+        for query, plan, ok in check_query_plans(db_manager.engine):
+            print(f"{'OK  ' if ok else 'FAIL'} {query.name}: {plan}")
+            if not ok:
+                failed += 1
+        return 1 if failed else 0
+    
+    # Создание таблиц в БД, если их нет
+    db_manager.create_tables()
+    
+    applied = run_migrations(db_manager.engine, target=args.target)
+    for migration in applied:
+        print(f"Applied {migration.name}")
+    print(f"Schema version: {get_current_version(db_manager.engine)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
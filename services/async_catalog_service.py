@@ -0,0 +1,96 @@
+import asyncio
+
+from database.async_db_manager import async_db_manager
+from database.repositories.product_repository import ProductRepository
+from database.repositories.pagination import Page
+from config.bot_config import BotConfig
+from services.catalog_service import (
+    catalog_snapshot, image_file_ids, search_page, search_terms
+)
+
+class AsyncCatalogService:
+    """Сервис каталога для asyncio-режима: тот же снимок каталога в памяти, запросы к БД - асинхронные"""
+    
+    async def get_snapshot(self):
+        """Текущий снимок каталога (при первом обращении загружается из БД)"""
+        snapshot = catalog_snapshot.current()
+        if snapshot is None:
+            snapshot = await asyncio.to_thread(catalog_snapshot.rebuild)
+        return snapshot
+    
+    async def get_all_products(self, available_only=True):
+        """Получить все товары (доступные - из снимка каталога в памяти)"""
+        if available_only:
+            return (await self.get_snapshot()).products
+        return await async_db_manager.run_read(
+            lambda session: ProductRepository(session).get_all_products(available_only=False)
+        )
+    
+    async def search_products(self, query, page=0):
+        """Поиск доступных товаров по названию и описанию.
+        
+        Возвращает (номер страницы, Page), где next_cursor - номер следующей страницы или None.
+        """
+        page = max(page, 0)
+        terms = search_terms(query)
+        if not terms:
+            return page, Page((), None)
+        
+        limit = BotConfig.CATALOG_PAGE_SIZE
+        # Берем на одну строку больше, чтобы узнать, есть ли следующая страница
+        ids = await async_db_manager.run_read(
+            lambda session: ProductRepository(session).search_product_ids(terms, limit=limit + 1, offset=page * limit)
+        )
+        return search_page(await self.get_snapshot(), page, ids, limit)
+    
+    async def get_image_file_id(self, product):
+        """file_id изображения товара в Telegram (None, если изображение еще не отправлялось)"""
+        entry = image_file_ids.get(product.id)
+        if entry is None or entry[0] != product.image_url:
+            file_id = await async_db_manager.run_read(
+                lambda session: ProductRepository(session).get_telegram_file_id(product.id, product.image_url)
+            )
+            entry = (product.image_url, file_id)
+            image_file_ids[product.id] = entry
+        return entry[1]
+    
+    async def save_image_file_id(self, product, file_id):
+        """Сохранить file_id изображения товара (None - забыть сохраненный)"""
+        image_file_ids[product.id] = (product.image_url, file_id)
+        return await async_db_manager.run_write(
+            lambda session: ProductRepository(session).set_telegram_file_id(
+                product.id, product.image_url, file_id
+            )
+        )
+    
+    async def create_product(self, name, price, description=None, image_url=None):
+        """Создать новый товар"""
+        return await self._write(
+            lambda session: ProductRepository(session).create_product(
+                name=name,
+                price=price,
+                description=description,
+                image_url=image_url
+            )
+        )
+    
+    async def update_product(self, product_id, **kwargs):
+        """Обновить товар"""
+        return await self._write(
+            lambda session: ProductRepository(session).update_product(product_id, **kwargs)
+        )
+    
+    async def delete_product(self, product_id):
+        """Удалить товар"""
+        return await self._write(
+            lambda session: ProductRepository(session).delete_product(product_id)
+        )
+    
+    async def _write(self, func):
+        """Транзакция на запись в каталог: после ее commit снимок каталога пересобирается.
+        
+        Товары для снимка загружаются под его блокировками (в потоке, чтобы не блокировать цикл событий)
+        """
+        result = await async_db_manager.run_write(func)
+        await asyncio.to_thread(catalog_snapshot.rebuild)
+        return result
@@ -0,0 +1,17 @@
+from database.async_db_manager import async_db_manager
+from database.repositories.order_repository import OrderRepository
+from config.bot_config import BotConfig
+
+class AsyncOrderService:
+    """Сервис для работы с заказами в asyncio-режиме"""
+    
+    async def get_orders_page(self, after_id=None, limit=None, status=None, with_items=False):
+        """Получить страницу заказов (заказы и курсор следующей страницы)"""
+        return await async_db_manager.run_read(
+            lambda session: OrderRepository(session).get_orders_page(
+                after_id=after_id,
+                limit=limit or BotConfig.ORDERS_PAGE_SIZE,
+                status=status,
+                with_items=with_items
+            )
+        )
@@ -0,0 +1,53 @@
+from database.async_db_manager import async_db_manager
+from database.repositories.user_repository import UserRepository
+from config.bot_config import BotConfig
+from services.user_service import profile_cache, make_profile
+
+class AsyncUserService:
+    """Сервис для работы с пользователями в asyncio-режиме (кеш профилей общий с UserService)"""
+    
+    async def get_profile(self, telegram_id, refresh=False, **user_data):
+        """Получить профиль пользователя (из кеша, если он там есть); refresh - как в UserService.get_profile"""
+        profile = None if refresh else profile_cache.get(telegram_id)
+        if profile is None:
+            user = None
+            if not refresh:
+                # Существующего пользователя достаточно прочитать, без блокировки записи
+                user = await async_db_manager.run_read(
+                    lambda session: UserRepository(session).get_by_telegram_id(telegram_id)
+                )
+            if user is None:
+                # Создание или обновление одним запросом, без гонки между SELECT и INSERT
+                user = await async_db_manager.run_write(
+                    lambda session: UserRepository(session).upsert_user(
+                        telegram_id=telegram_id,
+                        username=user_data.get('username'),
+                        first_name=user_data.get('first_name'),
+                        last_name=user_data.get('last_name')
+                    )
+                )
+            profile = make_profile(user)
+            profile_cache.set(telegram_id, profile)
+        return profile
+    
+    async def set_language(self, telegram_id, language):
+        """Установить язык пользователя"""
+        updated = await async_db_manager.run_write(
+            lambda session: UserRepository(session).update_language(telegram_id, language)
+        )
+        
+        profile = profile_cache.pop(telegram_id)
+        if updated and profile:
+            profile_cache.set(telegram_id, profile._replace(language=language))
+        
+        return updated
+    
+    async def get_language(self, telegram_id):
+        """Получить язык пользователя"""
+        profile = await self.get_profile(telegram_id)
+        return profile.language if profile else BotConfig.DEFAULT_LANGUAGE
+    
+    async def is_admin(self, telegram_id):
+        """Проверить, является ли пользователь админом"""
+        profile = await self.get_profile(telegram_id)
+        return bool(profile and profile.is_admin)
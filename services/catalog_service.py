@@ -1,55 +1,310 @@
+import os
+import re
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
 from database.repositories.product_repository import ProductRepository
+from database.repositories.pagination import Page
 from database.db_manager import db_manager
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from services.product_index import product_index
+from services.shared_catalog import (
+    SharedCatalogFile, catalog_file_lock, file_key, read_catalog_version, write_catalog_file
+)
+
+logger = setup_logger()
+
+# Товар в снимке каталога (неизменяемый, не привязан к сессии БД)
+ProductView = namedtuple('ProductView', ['id', 'name', 'description', 'price', 'image_url'])
+
+def load_product_views(session):
+    """Доступные товары для снимка каталога, упорядоченные по ID"""
+    products = ProductRepository(session).get_all_products(available_only=True)
+    return [
+        ProductView(
+            id=product.id,
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            image_url=product.image_url
+        )
+        for product in sorted(products, key=lambda product: product.id)
+    ]
+
+class CatalogSnapshot:
+    """Неизменяемый снимок доступных товаров с индексом по ID"""
+    
+    def __init__(self, version, products):
+        self.version = version
+        self.products = tuple(products)
+        self.by_id = MappingProxyType({product.id: product for product in self.products})
+    
+    def get(self, product_id):
+        """Получить товар по ID"""
+        return self.by_id.get(product_id)
+    
+    def page(self, number, size):
+        """Получить страницу по номеру: (номер страницы, Page). Номер ограничивается последней страницей"""
+        last = max((len(self.products) - 1) // size, 0)
+        number = min(max(number, 0), last)
+        start = number * size
+        items = self.products[start:start + size]
+        next_cursor = items[-1].id if start + size < len(self.products) else None
+        return number, Page(items, next_cursor)
+
+class MappedCatalogSnapshot(CatalogSnapshot):
+    """Снимок каталога поверх общего файла: товары читаются из mmap по запросу"""
+    
+    def __init__(self, catalog_file):
+        self.version = catalog_file.version
+        self.products = catalog_file
+        self.file_key = catalog_file.key
+    
+    def get(self, product_id):
+        """Получить товар по ID"""
+        return self.products.lookup(product_id)
+
+class CatalogSnapshotStore:
+    """Хранит текущий снимок каталога и атомарно заменяет его после изменения товаров"""
+    
+    def __init__(self, shared_path=None, check_interval=None):
+        # Если задан путь, снимок общий для всех процессов бота и хранится в файле
+        self.shared_path = BotConfig.CATALOG_SNAPSHOT_PATH if shared_path is None else shared_path
+        self.check_interval = BotConfig.CATALOG_SNAPSHOT_CHECK_INTERVAL if check_interval is None else check_interval
+        
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._last_check = 0.0
+        
+        # Счетчики
+        self.rebuilds = 0
+        self.reloads = 0
+    
+    def get(self):
+        """Текущий снимок (при первом обращении загружается из БД)"""
+        snapshot = self.current()
+        if snapshot is None:
+            snapshot = self.rebuild()
+        return snapshot
+    
+    def current(self):
+        """Текущий снимок без загрузки из БД (None, если он еще не загружен)"""
+        if self.shared_path:
+            self._refresh_shared()
+        return self._snapshot
+    
+    def rebuild(self):
+        """Заменить снимок новой версией из доступных товаров в БД.
+        
+        Товары загружаются под блокировкой (в общем режиме - под межпроцессной блокировкой файла),
+        чтобы список, прочитанный до чужого изменения, не вышел с более новой версией.
+        """
+        with self._lock:
+            if self.shared_path:
+                snapshot = self._publish_shared()
+            else:
+                products = self._load_products()
+                previous = self._snapshot
+                version = previous.version + 1 if previous else 1
+                snapshot = CatalogSnapshot(version, products)
+            self._snapshot = snapshot
+            self.rebuilds += 1
+        return snapshot
+    
+    def _publish_shared(self):
+        """Загрузить товары и записать общий файл снимка под межпроцессной блокировкой. Вызывается под self._lock"""
+        with catalog_file_lock(self.shared_path):
+            products = self._load_products()
+            try:
+                current = read_catalog_version(self.shared_path) or 0
+            except ValueError:
+                current = 0
+            previous = self._snapshot.version if self._snapshot else 0
+            write_catalog_file(self.shared_path, products, max(current, previous) + 1)
+            return MappedCatalogSnapshot(SharedCatalogFile(self.shared_path, ProductView._make))
+    
+    def _refresh_shared(self):
+        """Подхватить файл снимка, записанный другим процессом (проверка не чаще check_interval)"""
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        
+        try:
+            key = file_key(os.stat(self.shared_path))
+        except FileNotFoundError:
+            return
+        
+        with self._lock:
+            current = self._snapshot
+            if current is not None and current.file_key == key:
+                return
+            try:
+                snapshot = MappedCatalogSnapshot(SharedCatalogFile(self.shared_path, ProductView._make))
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning(f"Cannot load catalog snapshot {self.shared_path}: {e}")
+                return
+            if current is None or snapshot.version != current.version:
+                self.reloads += 1
+            self._snapshot = snapshot
+    
+    def _load_products(self):
+        """Загрузить доступные товары отдельной сессией"""
+        session = db_manager.session_factory()
+        try:
+            return load_product_views(session)
+        finally:
+            session.close()
+
+# Слова поискового запроса (буквы и цифры любого алфавита)
+SEARCH_TERM_RE = re.compile(r'[^\W_]+')
+MAX_SEARCH_TERMS = 8
+
+def search_terms(query):
+    """Слова поискового запроса (не больше MAX_SEARCH_TERMS)"""
+    return SEARCH_TERM_RE.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+def search_page(snapshot, page, ids, limit):
+    """Страница результатов поиска из ID, найденных в БД (на один больше limit, если есть следующая)"""
+    items = tuple(product for product in map(snapshot.get, ids[:limit]) if product is not None)
+    return page, Page(items, page + 1 if len(ids) > limit else None)
+
+# Снимок каталога общий для всех экземпляров сервиса
+catalog_snapshot = CatalogSnapshotStore()
+
+# file_id изображений товаров: ID товара -> (image_url, file_id или None).
+# Хранятся отдельно от снимка, чтобы сохранение file_id не меняло версию каталога
+image_file_ids = {}
 
 class CatalogService:
     """Сервис для работы с каталогом товаров"""
     
     def get_all_products(self, available_only=True):
-        """Получить все товары"""
+        """Получить все товары (доступные - из снимка каталога в памяти)"""
+        if available_only:
+            return catalog_snapshot.get().products
+        
         session = db_manager.get_session()
         try:
             product_repo = ProductRepository(session)
-            return product_repo.get_all_products(available_only)
+            return product_repo.get_all_products(available_only=False)
         finally:
             db_manager.close_session(session)
     
-    def get_product(self, product_id):
-        """Получить товар по ID"""
+    def get_products_page(self, after_id=None, limit=None, available_only=True):
+        """Получить страницу товаров (товары и курсор следующей страницы)"""
         session = db_manager.get_session()
         try:
             product_repo = ProductRepository(session)
-            return product_repo.get_by_id(product_id)
+            return product_repo.get_products_page(
+                after_id=after_id,
+                limit=limit or BotConfig.CATALOG_PAGE_SIZE,
+                available_only=available_only
+            )
         finally:
             db_manager.close_session(session)
     
-    def create_product(self, name, price, description=None, image_url=None):
-        """Создать новый товар"""
+    def get_catalog_page(self, page):
+        """Получить страницу каталога по номеру из снимка в памяти.
+        
+        Возвращает (номер страницы, Page): если страницы с таким номером нет, возвращается последняя.
+        """
+        return catalog_snapshot.get().page(page, BotConfig.CATALOG_PAGE_SIZE)
+    
+    def get_version(self):
+        """Текущая версия каталога"""
+        return catalog_snapshot.get().version
+    
+    def get_snapshot(self):
+        """Текущий снимок каталога"""
+        return catalog_snapshot.get()
+    
+    def get_product(self, product_id):
+        """Получить доступный товар по ID (из снимка каталога в памяти)"""
+        return catalog_snapshot.get().get(product_id)
+    
+    def search_products(self, query, page=0):
+        """Поиск доступных товаров по названию и описанию.
+        
+        Возвращает (номер страницы, Page), где next_cursor - номер следующей страницы или None.
+        """
+        page = max(page, 0)
+        terms = search_terms(query)
+        if not terms:
+            return page, Page((), None)
+        
+        limit = BotConfig.CATALOG_PAGE_SIZE
         session = db_manager.get_session()
         try:
             product_repo = ProductRepository(session)
-            return product_repo.create_product(
+            # Берем на одну строку больше, чтобы узнать, есть ли следующая страница
+            ids = product_repo.search_product_ids(terms, limit=limit + 1, offset=page * limit)
+        finally:
+            db_manager.close_session(session)
+        
+        # Сами товары берем из снимка каталога
+        return search_page(catalog_snapshot.get(), page, ids, limit)
+    
+    def find_products_by_name(self, query):
+        """Поиск по названиям товаров в памяти (для inline-режима).
+        
+        Возвращает (версия каталога, список товаров, от более подходящих к менее).
+        """
+        snapshot = catalog_snapshot.get()
+        return snapshot.version, product_index.get(snapshot).search(query)
+    
+    def get_image_file_id(self, product):
+        """file_id изображения товара в Telegram (None, если изображение еще не отправлялось)"""
+        entry = image_file_ids.get(product.id)
+        if entry is None or entry[0] != product.image_url:
+            session = db_manager.get_session()
+            try:
+                product_repo = ProductRepository(session)
+                file_id = product_repo.get_telegram_file_id(product.id, product.image_url)
+            finally:
+                db_manager.close_session(session)
+            entry = (product.image_url, file_id)
+            image_file_ids[product.id] = entry
+        return entry[1]
+    
+    def save_image_file_id(self, product, file_id):
+        """Сохранить file_id изображения товара (None - забыть сохраненный)"""
+        image_file_ids[product.id] = (product.image_url, file_id)
+        return db_manager.run_write(
+            lambda session: ProductRepository(session).set_telegram_file_id(
+                product.id, product.image_url, file_id
+            )
+        )
+    
+    def create_product(self, name, price, description=None, image_url=None):
+        """Создать новый товар"""
+        return self._write(
+            lambda session: ProductRepository(session).create_product(
                 name=name,
                 price=price,
                 description=description,
                 image_url=image_url
             )
-        finally:
-            db_manager.close_session(session)
+        )
     
     def update_product(self, product_id, **kwargs):
         """Обновить товар"""
-        session = db_manager.get_session()
-        try:
-            product_repo = ProductRepository(session)
-            return product_repo.update_product(product_id, **kwargs)
-        finally:
-            db_manager.close_session(session)
+        return self._write(
+            lambda session: ProductRepository(session).update_product(product_id, **kwargs)
+        )
     
     def delete_product(self, product_id):
         """Удалить товар"""
-        session = db_manager.get_session()
-        try:
-            product_repo = ProductRepository(session)
-            return product_repo.delete_product(product_id)
-        finally:
-            db_manager.close_session(session)
\ No newline at end of file
+        return self._write(
+            lambda session: ProductRepository(session).delete_product(product_id)
+        )
+    
+    def _write(self, func):
+        """Транзакция на запись в каталог: после ее commit снимок каталога пересобирается"""
+        def write(session):
+            db_manager.after_commit(session, catalog_snapshot.rebuild)
+            return func(session)
+        
+        return db_manager.run_write(write)
@@ -1,65 +1,86 @@
 from database.repositories.order_repository import OrderRepository
 from database.db_manager import db_manager
 from database.models import OrderStatus
+from config.bot_config import BotConfig
 
 class OrderService:
     """Сервис для работы с заказами"""
     
     def create_order(self, user_id):
         """Создать новый заказ"""
-        session = db_manager.get_session()
-        try:
-            order_repo = OrderRepository(session)
-            return order_repo.create_order(user_id)
-        finally:
-            db_manager.close_session(session)
+        return db_manager.run_write(
+            lambda session: OrderRepository(session).create_order(user_id)
+        )
     
     def add_product_to_order(self, order_id, product_id, quantity, price):
         """Добавить товар к заказу"""
-        session = db_manager.get_session()
-        try:
-            order_repo = OrderRepository(session)
-            return order_repo.add_item_to_order(
+        return db_manager.run_write(
+            lambda session: OrderRepository(session).add_item_to_order(
                 order_id=order_id,
                 product_id=product_id,
                 quantity=quantity,
                 price=price
             )
-        finally:
-            db_manager.close_session(session)
+        )
     
     def update_order_status(self, order_id, status):
         """Обновить статус заказа"""
+        return db_manager.run_write(
+            lambda session: OrderRepository(session).update_order_status(order_id, status)
+        )
+    
+    def get_order(self, order_id, with_items=False):
+        """Получить заказ по ID"""
         session = db_manager.get_session()
         try:
             order_repo = OrderRepository(session)
-            return order_repo.update_order_status(order_id, status)
+            return order_repo.get_by_id(order_id, with_items=with_items)
         finally:
             db_manager.close_session(session)
     
-    def get_order(self, order_id):
-        """Получить заказ по ID"""
+    def get_user_orders(self, user_id, with_items=False):
+        """Получить заказы пользователя"""
         session = db_manager.get_session()
         try:
             order_repo = OrderRepository(session)
-            return order_repo.get_by_id(order_id)
+            return order_repo.get_user_orders(user_id, with_items=with_items)
         finally:
             db_manager.close_session(session)
     
-    def get_user_orders(self, user_id):
-        """Получить заказы пользователя"""
+    def get_all_orders(self, with_items=False):
+        """Получить все заказы (with_items=True - вместе с позициями и товарами)"""
         session = db_manager.get_session()
         try:
             order_repo = OrderRepository(session)
-            return order_repo.get_user_orders(user_id)
+            return order_repo.get_all_orders(with_items=with_items)
         finally:
             db_manager.close_session(session)
     
-    def get_all_orders(self):
-        """Получить все заказы"""
+    def get_orders_page(self, after_id=None, limit=None, status=None, with_items=False):
+        """Получить страницу заказов (заказы и курсор следующей страницы)"""
         session = db_manager.get_session()
         try:
             order_repo = OrderRepository(session)
-            return order_repo.get_all_orders()
+            return order_repo.get_orders_page(
+                after_id=after_id,
+                limit=limit or BotConfig.ORDERS_PAGE_SIZE,
+                status=status,
+                with_items=with_items
+            )
+        finally:
+            db_manager.close_session(session)
+    
+    def get_user_orders_page(self, user_id, after_id=None, limit=None, status=None, with_items=False):
+        """Получить страницу заказов пользователя (заказы и курсор следующей страницы)"""
+        session = db_manager.get_session()
+        try:
+            order_repo = OrderRepository(session)
+            return order_repo.get_user_orders_page(
+                user_id,
+                after_id=after_id,
+                limit=limit or BotConfig.ORDERS_PAGE_SIZE,
+                status=status,
+                with_items=with_items
+            )
         finally:
             db_manager.close_session(session)
\ No newline at end of file
@@ -6,8 +6,7 @@ class PaymentService:
     
     def create_payment(self, order_id, amount, payment_method):
         """Создать новый платеж"""
-        session = db_manager.get_session()
-        try:
+        def create(session):
             payment = Payment(
                 order_id=order_id,
                 amount=amount,
@@ -15,30 +14,28 @@ class PaymentService:
                 status=PaymentStatus.PENDING
             )
             session.add(payment)
-            session.commit()
+            session.flush()
             return payment
-        finally:
-            db_manager.close_session(session)
+        
+        return db_manager.run_write(create)
     
     def update_payment_status(self, payment_id, status):
         """Обновить статус платежа"""
-        session = db_manager.get_session()
-        try:
+        def update(session):
             payment = session.query(Payment).filter(Payment.id == payment_id).first()
             if payment:
                 payment.status = PaymentStatus(status)
-                session.commit()
                 
                 # Если платеж выполнен, то обновляем статус заказа
                 if status == PaymentStatus.COMPLETED.value:
                     order = payment.order
                     order.status = OrderStatus.PAID
-                    session.commit()
                 
+                session.flush()
                 return payment
             return None
-        finally:
-            db_manager.close_session(session)
+        
+        return db_manager.run_write(update)
     
     def get_payment(self, payment_id):
         """Получить платеж по ID"""
@@ -0,0 +1,122 @@
+import re
+import threading
+
+from utils.cache import LRUCache
+
+# Слова названия (буквы и цифры любого алфавита)
+WORD_RE = re.compile(r'[^\W_]+')
+EMPTY = frozenset()
+
+def normalize_words(text):
+    """Слова текста в нижнем регистре"""
+    return WORD_RE.findall(text.casefold())
+
+class ProductIndex:
+    """Индекс названий товаров из снимка каталога для поиска по мере ввода.
+
+    Слова из 1-2 символов ищутся как начало слова названия, более длинные - как подстрока
+    через индекс триграмм.
+    """
+
+    def __init__(self, version, products, cache_size=256):
+        self.version = version
+        self.products = tuple(products)
+        # Упорядоченные результаты последних запросов: следующие страницы не пересчитываются
+        self._results = LRUCache(maxsize=cache_size)
+        self._names = []
+        self._name_words = []
+        trigrams = {}
+        prefixes = {}
+
+        for position, product in enumerate(self.products):
+            words = normalize_words(product.name)
+            self._names.append(' '.join(words))
+            self._name_words.append(words)
+            for word in words:
+                for size in (1, 2):
+                    if len(word) >= size:
+                        prefixes.setdefault(word[:size], set()).add(position)
+                for i in range(len(word) - 2):
+                    trigrams.setdefault(word[i:i + 3], set()).add(position)
+
+        self._trigrams = {key: frozenset(value) for key, value in trigrams.items()}
+        self._prefixes = {key: frozenset(value) for key, value in prefixes.items()}
+
+    def search(self, query):
+        """Товары, в названии которых есть все слова запроса, от более подходящих к менее"""
+        words = normalize_words(query)
+        if not words:
+            return self.products
+
+        phrase = ' '.join(words)
+        results = self._results.get(phrase)
+        if results is None:
+            results = self._search(words, phrase)
+            self._results.set(phrase, results)
+        return results
+
+    def _search(self, words, phrase):
+        """Поиск без кеша"""
+        # Сначала самые длинные (обычно самые избирательные) слова
+        positions = None
+        for word in sorted(set(words), key=len, reverse=True):
+            candidates = self._candidates(word)
+            positions = set(candidates) if positions is None else positions & candidates
+            if not positions:
+                return ()
+
+        def rank(position):
+            name = self._names[position]
+            name_words = self._name_words[position]
+            # Совпадение с начала названия, затем совпадения с начала слов, затем подстроки
+            not_prefixed = sum(
+                not any(name_word.startswith(word) for name_word in name_words)
+                for word in words
+            )
+            return (not name.startswith(phrase), not_prefixed, name.find(words[0]), position)
+
+        return tuple(self.products[position] for position in sorted(positions, key=rank))
+
+    def _candidates(self, word):
+        """Позиции товаров, подходящих под одно слово запроса"""
+        if len(word) < 3:
+            return self._prefixes.get(word, EMPTY)
+
+        postings = []
+        for i in range(len(word) - 2):
+            posting = self._trigrams.get(word[i:i + 3])
+            if posting is None:
+                return EMPTY
+            postings.append(posting)
+        postings.sort(key=len)
+
+        # Триграммы могут совпасть в разных местах - проверяем подстроку
+        return frozenset(
+            position for position in postings[0].intersection(*postings[1:])
+            if word in self._names[position]
+        )
+
+class ProductIndexStore:
+    """Индекс для текущей версии каталога: пересобирается при первом поиске после изменения каталога"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+
+        # Счетчики
+        self.rebuilds = 0
+
+    def get(self, snapshot):
+        """Индекс для снимка каталога"""
+        index = self._index
+        if index is None or index.version != snapshot.version:
+            with self._lock:
+                index = self._index
+                if index is None or index.version != snapshot.version:
+                    index = ProductIndex(snapshot.version, snapshot.products)
+                    self._index = index
+                    self.rebuilds += 1
+        return index
+
+# Создание экземпляра хранилища индекса
+product_index = ProductIndexStore()
@@ -0,0 +1,159 @@
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # На платформах без fcntl межпроцессная блокировка не используется
+    fcntl = None
+
+# Формат файла (little-endian):
+#   заголовок   - magic, версия формата, версия каталога, количество товаров
+#   таблица     - по записи на товар, отсортирована по ID: id, цена и (смещение, длина)
+#                 для name, description, image_url
+#   строки      - UTF-8 без разделителей
+MAGIC = b'SCAT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHxxQI4x')
+RECORD = struct.Struct('<qd6I')
+PRODUCT_ID = struct.Struct('<q')
+# Длина, которой обозначается None
+NULL_LENGTH = 0xFFFFFFFF
+
+def write_catalog_file(path, products, version):
+    """Атомарно записать файл снимка каталога (через временный файл и os.replace)"""
+    products = sorted(products, key=lambda product: product.id)
+    base = HEADER.size + RECORD.size * len(products)
+    records = []
+    strings = bytearray()
+    for product in products:
+        refs = []
+        for value in (product.name, product.description, product.image_url):
+            if value is None:
+                refs.extend((0, NULL_LENGTH))
+                continue
+            data = value.encode('utf-8')
+            refs.extend((base + len(strings), len(data)))
+            strings += data
+        records.append(RECORD.pack(product.id, product.price, *refs))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.catalog-', dir=directory)
+    try:
+        # mkstemp создает файл с правами 0600, а читать его должны все процессы бота
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, version, len(products)))
+            f.write(b''.join(records))
+            f.write(strings)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def read_catalog_version(path):
+    """Прочитать версию каталога из заголовка файла (None, если файла нет)"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    return _unpack_header(header)[0]
+
+@contextmanager
+def catalog_file_lock(path):
+    """Межпроцессная блокировка записи файла снимка"""
+    if fcntl is None:
+        yield
+        return
+
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def file_key(stat):
+    """Идентификатор конкретного файла: меняется при каждой замене через os.replace"""
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _unpack_header(data):
+    """Разобрать и проверить заголовок: (версия каталога, количество товаров)"""
+    if len(data) < HEADER.size:
+        raise ValueError("Catalog snapshot file is truncated")
+    magic, format_version, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise ValueError("Unsupported catalog snapshot file")
+    return version, count
+
+class SharedCatalogFile(Sequence):
+    """Файл снимка каталога, отображенный в память. Записи читаются по запросу, без загрузки всего файла"""
+
+    def __init__(self, path, record_factory=tuple):
+        self.path = path
+        self.record_factory = record_factory
+        with open(path, 'rb') as f:
+            self.key = file_key(os.fstat(f.fileno()))
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        self.version, self._count = _unpack_header(self._map)
+        if HEADER.size + RECORD.size * self._count > len(self._map):
+            raise ValueError("Catalog snapshot file is truncated")
+        self._ids = _IdColumn(self._map, self._count)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self._record(i) for i in range(*index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return self._record(index)
+
+    def lookup(self, product_id):
+        """Найти товар по ID (бинарный поиск по таблице записей)"""
+        index = bisect_left(self._ids, product_id)
+        if index < self._count and self._ids[index] == product_id:
+            return self._record(index)
+        return None
+
+    def _record(self, index):
+        """Прочитать запись товара"""
+        product_id, price, *refs = RECORD.unpack_from(self._map, HEADER.size + RECORD.size * index)
+        name, description, image_url = (
+            self._string(refs[i], refs[i + 1]) for i in range(0, 6, 2)
+        )
+        return self.record_factory((product_id, name, description, price, image_url))
+
+    def _string(self, offset, length):
+        """Прочитать строку из области строк"""
+        if length == NULL_LENGTH:
+            return None
+        return str(self._view[offset:offset + length], 'utf-8')
+
+class _IdColumn(Sequence):
+    """Столбец ID товаров из таблицы записей (для bisect)"""
+
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return PRODUCT_ID.unpack_from(self._data, HEADER.size + RECORD.size * index)[0]
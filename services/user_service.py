@@ -1,49 +1,104 @@
+from collections import namedtuple
 from database.repositories.user_repository import UserRepository
 from database.db_manager import db_manager
+from config.bot_config import BotConfig
+from utils.cache import LRUCache
 from utils.helpers import load_locale
 
+# Данные пользователя, которые нужны почти каждому обработчику
+UserProfile = namedtuple('UserProfile', ['id', 'telegram_id', 'language', 'is_admin'])
+
+# Кеш профилей общий для всех экземпляров сервиса
+profile_cache = LRUCache(maxsize=BotConfig.USER_CACHE_SIZE, ttl=BotConfig.USER_CACHE_TTL)
+
+def make_profile(user):
+    """Собрать профиль из модели пользователя"""
+    return UserProfile(
+        id=user.id,
+        telegram_id=user.telegram_id,
+        language=user.language.value if user.language else BotConfig.DEFAULT_LANGUAGE,
+        is_admin=bool(user.is_admin)
+    )
+
 class UserService:
     """Сервис для работы с пользователями"""
     
     def get_user(self, telegram_id, create_if_not_exists=True, **user_data):
         """Получить пользователя по telegram_id"""
-        session = db_manager.get_session()
-        try:
-            user_repo = UserRepository(session)
-            user = user_repo.get_by_telegram_id(telegram_id)
-            
-            if not user and create_if_not_exists:
-                user = user_repo.create_user(
+        user, _ = self._load_user(telegram_id, create_if_not_exists, user_data)
+        return user
+    
+    def get_profile(self, telegram_id, refresh=False, **user_data):
+        """Получить профиль пользователя (из кеша, если он там есть).
+        
+        refresh=True (команда /start) - обновить имя пользователя в БД, даже если профиль есть в кеше.
+        """
+        profile = None if refresh else profile_cache.get(telegram_id)
+        if profile is None:
+            _, profile = self._load_user(telegram_id, True, user_data, refresh)
+        return profile
+    
+    def _load_user(self, telegram_id, create_if_not_exists, user_data, refresh=False):
+        """Загрузить пользователя из БД и обновить кеш профилей.
+        
+        Существующий пользователь только читается; upsert (с блокировкой записи) выполняется
+        для нового пользователя или при refresh.
+        """
+        user = None
+        if not refresh:
+            session = db_manager.get_session()
+            try:
+                user = UserRepository(session).get_by_telegram_id(telegram_id)
+            finally:
+                db_manager.close_session(session)
+        
+        if user is None and (create_if_not_exists or refresh):
+            # Создание или обновление одним запросом, без гонки между SELECT и INSERT
+            user = db_manager.run_write(
+                lambda session: UserRepository(session).upsert_user(
                     telegram_id=telegram_id,
                     username=user_data.get('username'),
                     first_name=user_data.get('first_name'),
                     last_name=user_data.get('last_name')
                 )
-            
-            return user
-        finally:
-            db_manager.close_session(session)
+            )
+        
+        if not user:
+            return None, None
+        
+        profile = make_profile(user)
+        profile_cache.set(telegram_id, profile)
+        return user, profile
     
     def set_language(self, telegram_id, language):
         """Установить язык пользователя"""
-        session = db_manager.get_session()
-        try:
-            user_repo = UserRepository(session)
-            return user_repo.update_language(telegram_id, language)
-        finally:
-            db_manager.close_session(session)
+        updated = db_manager.run_write(
+            lambda session: UserRepository(session).update_language(telegram_id, language)
+        )
+        
+        profile = profile_cache.pop(telegram_id)
+        if updated and profile:
+            profile_cache.set(telegram_id, profile._replace(language=language))
+        
+        return updated
     
     def get_language(self, telegram_id):
         """Получить язык пользователя"""
-        user = self.get_user(telegram_id)
-        if user:
-            return user.language.value
+        profile = self.get_profile(telegram_id)
+        if profile:
+            return profile.language
         return 'uk'  # язык по умолчанию
     
     def is_admin(self, telegram_id):
         """Проверить, является ли пользователь админом"""
-        user = self.get_user(telegram_id)
-        return user and user.is_admin
+        profile = self.get_profile(telegram_id)
+        return bool(profile and profile.is_admin)
+    
+    def import_users(self, users):
+        """Импортировать пользователей (создать новых, обновить имена существующих)"""
+        return db_manager.run_write(
+            lambda session: UserRepository(session).upsert_users(users)
+        )
     
     def get_all_admins(self):
         """Получить всех админов"""
@@ -52,4 +107,8 @@ class UserService:
             user_repo = UserRepository(session)
             return user_repo.get_all_admins()
         finally:
-            db_manager.close_session(session)
\ No newline at end of file
+            db_manager.close_session(session)
+    
+    def cache_stats(self):
+        """Статистика кеша профилей"""
+        return profile_cache.stats()
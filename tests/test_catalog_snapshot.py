@@ -0,0 +1,46 @@
+import threading
+import time
+
+from services.catalog_service import CatalogSnapshotStore, ProductView
+
+def make_store(path, products):
+    """Снимок каталога поверх общего файла path; товары в БД - текущее содержимое списка products"""
+    store = CatalogSnapshotStore(shared_path=str(path), check_interval=0)
+    store._load_products = lambda: list(products)
+    return store
+
+def product(product_id, name):
+    return ProductView(id=product_id, name=name, description=None, price=1.0, image_url=None)
+
+def test_rebuild_does_not_publish_list_read_before_another_edit(tmp_path):
+    path = tmp_path / 'catalog.bin'
+    products = [product(1, 'old')]
+    worker_a = make_store(path, products)
+    worker_b = make_store(path, products)
+
+    # Воркер A читает товары и задерживается, пока воркер B сохраняет изменение и пересобирает снимок
+    loading = threading.Event()
+    resume = threading.Event()
+
+    def slow_load():
+        loaded = list(products)
+        loading.set()
+        resume.wait(5)
+        return loaded
+
+    worker_a._load_products = slow_load
+    thread_a = threading.Thread(target=worker_a.rebuild)
+    thread_a.start()
+    assert loading.wait(5)
+
+    products[:] = [product(1, 'new')]
+    thread_b = threading.Thread(target=worker_b.rebuild)
+    thread_b.start()
+    time.sleep(0.2)
+    resume.set()
+    thread_a.join(5)
+    thread_b.join(5)
+
+    # Последней версией в файле должен быть список после изменения
+    reader = make_store(path, [])
+    assert reader.current().get(1).name == 'new'
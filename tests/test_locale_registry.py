@@ -0,0 +1,40 @@
+import json
+import os
+
+from utils.helpers import LocaleRegistry
+
+def write_locale(directory, language, content, mtime):
+    """Записать файл локализации с заданным mtime"""
+    path = directory / f'{language}.json'
+    path.write_text(content, encoding='utf-8')
+    os.utime(path, (mtime, mtime))
+
+def test_broken_locale_file_keeps_last_good_version(tmp_path):
+    write_locale(tmp_path, 'uk', json.dumps({'help_btn': 'Допомога'}), 1000)
+    write_locale(tmp_path, 'en', json.dumps({'help_btn': 'Help'}), 1000)
+    registry = LocaleRegistry(locales_dir=str(tmp_path), default_language='uk', check_interval=0)
+    registry.load()
+    reloads = []
+    registry.add_reload_listener(lambda: reloads.append(True))
+
+    # Файл сохранен не до конца
+    write_locale(tmp_path, 'en', '{"help_btn": "He', 2000)
+    assert registry.get_message('help_btn', 'uk') == 'Допомога'
+    assert registry.get_message('help_btn', 'en') == 'Help'
+    assert reloads == []
+
+    # Исправленный файл подхватывается при следующей проверке
+    write_locale(tmp_path, 'en', json.dumps({'help_btn': 'Help!'}), 3000)
+    assert registry.get_message('help_btn', 'en') == 'Help!'
+    assert reloads == [True]
+
+def test_broken_new_locale_file_is_ignored_until_fixed(tmp_path):
+    write_locale(tmp_path, 'uk', json.dumps({'help_btn': 'Допомога'}), 1000)
+    registry = LocaleRegistry(locales_dir=str(tmp_path), default_language='uk', check_interval=0)
+    registry.load()
+
+    write_locale(tmp_path, 'en', '[', 2000)
+    assert registry.languages == ('uk',)
+
+    write_locale(tmp_path, 'en', json.dumps({'help_btn': 'Help'}), 3000)
+    assert sorted(registry.languages) == ['en', 'uk']
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+from utils.message_builder import MessageBuilder, scan_markdown, text_length
+
+def build_parts(builder, timeout=5):
+    """Собрать сообщения; тест падает, если build() не завершился за timeout секунд"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(builder.build()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "MessageBuilder.build() did not finish"
+    return result[0]
+
+def test_short_blocks_are_coalesced_into_one_message():
+    builder = MessageBuilder(limit=100).extend(['first', 'second', 'third'])
+
+    assert build_parts(builder) == ['first\nsecond\nthird']
+
+@pytest.mark.parametrize('parse_mode', [None, 'Markdown'])
+def test_word_longer_than_limit_is_cut(parse_mode):
+    builder = MessageBuilder(limit=10, parse_mode=parse_mode).add('a' * 35)
+
+    parts = build_parts(builder)
+    assert ''.join(parts) == 'a' * 35
+    assert all(text_length(part) <= 10 for part in parts)
+
+def test_split_entity_is_closed_and_reopened():
+    builder = MessageBuilder(limit=20, parse_mode='Markdown').add('*' + 'bold words ' * 6 + '*')
+
+    parts = build_parts(builder)
+    assert len(parts) > 1
+    for part in parts:
+        assert text_length(part) <= 20
+        assert part.startswith('*') and part.endswith('*')
+        assert scan_markdown(part)[0] is None
+
+def test_reopened_entity_followed_by_long_piece_does_not_loop():
+    # После переноса в части остается только открытый заново маркер, а следующее слово не помещается
+    builder = MessageBuilder(limit=20, parse_mode='Markdown').add(' _[\n `_abdcab]_)[_*e[ ]`ff\n`a fdfde[ *b')
+
+    parts = build_parts(builder)
+    assert parts
+    assert all(text_length(part) <= 20 for part in parts)
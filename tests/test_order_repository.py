@@ -0,0 +1,76 @@
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database.db_manager import Base
+from database.models import User, Product, Order, OrderItem, OrderStatus
+from database.repositories.order_repository import OrderRepository
+
+def create_orders(session, count):
+    """Создать count заказов по две позиции в каждом"""
+    user = User(telegram_id=1)
+    products = [Product(name='Cup', price=10.0), Product(name='Kettle', price=25.0)]
+    session.add(user)
+    session.add_all(products)
+    session.flush()
+
+    for _ in range(count):
+        order = Order(user_id=user.id, status=OrderStatus.NEW)
+        session.add(order)
+        session.flush()
+        for product in products:
+            session.add(OrderItem(order_id=order.id, product_id=product.id, quantity=1, price=product.price))
+    session.commit()
+
+@pytest.fixture
+def make_session(tmp_path):
+    """Фабрика сессий к новой базе SQLite; statements - список выполненных SQL-запросов"""
+    engines = []
+
+    def make(name):
+        engine = create_engine(f"sqlite:///{tmp_path / name}")
+        Base.metadata.create_all(engine)
+        engines.append(engine)
+        session = sessionmaker(bind=engine)()
+        session.statements = []
+        event.listen(
+            engine,
+            'before_cursor_execute',
+            lambda connection, cursor, statement, *args: session.statements.append(statement)
+        )
+        return session
+
+    yield make
+    for engine in engines:
+        engine.dispose()
+
+def count_statements(session, load):
+    """Сколько SQL-запросов выполняет load() вместе с обращением к позициям и товарам заказов"""
+    session.expunge_all()
+    session.statements.clear()
+    orders = load(OrderRepository(session))
+    for order in orders:
+        for item in order.items:
+            item.product.name
+    return len(session.statements)
+
+@pytest.mark.parametrize('load', [
+    lambda repository: repository.get_all_orders(with_items=True),
+    lambda repository: repository.get_orders_page(limit=100, with_items=True).items,
+])
+def test_orders_with_items_use_constant_number_of_queries(make_session, load):
+    counts = {}
+    for count in (5, 50):
+        session = make_session(f'orders_{count}.db')
+        create_orders(session, count)
+        counts[count] = count_statements(session, load)
+        session.close()
+
+    # Заказы, позиции и товары - по одному запросу, независимо от количества заказов
+    assert counts[5] == counts[50] == 3
+
+def test_orders_without_items_load_items_lazily(make_session):
+    session = make_session('orders_lazy.db')
+    create_orders(session, 5)
+
+    assert count_statements(session, lambda repository: repository.get_all_orders()) > 3
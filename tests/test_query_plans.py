@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+import database.models  # noqa: F401 - модели регистрируются в Base.metadata
+from database.db_manager import Base
+from database.migrations import run_migrations
+from database.migrations.query_plans import check_query_plans
+
+# Сколько строк в каждой таблице моделирует статистика и сколько строк в среднем на значение индекса
+MODEL_ROWS = 1000000
+ROWS_PER_VALUE = 100
+
+def seed_statistics(connection):
+    """Заполнить sqlite_stat1 так, будто в каждой таблице MODEL_ROWS строк"""
+    connection.execute(text("ANALYZE"))
+    connection.execute(text("DELETE FROM sqlite_stat1"))
+    tables = connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+    )).scalars().all()
+    for table in tables:
+        for index in connection.execute(text(f"PRAGMA index_list('{table}')")).fetchall():
+            name, unique = index[1], index[2]
+            columns = connection.execute(text(f"PRAGMA index_info('{name}')")).fetchall()
+            stat = [MODEL_ROWS] + [ROWS_PER_VALUE] * (len(columns) - 1) + [1 if unique else ROWS_PER_VALUE]
+            connection.execute(
+                text("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (:table, :index, :stat)"),
+                {'table': table, 'index': name, 'stat': ' '.join(map(str, stat))}
+            )
+        connection.execute(
+            text("INSERT INTO sqlite_stat1 (tbl, idx, stat) VALUES (:table, NULL, :stat)"),
+            {'table': table, 'stat': str(MODEL_ROWS)}
+        )
+    # Планировщик перечитывает статистику
+    connection.execute(text("ANALYZE sqlite_master"))
+
+@pytest.mark.parametrize('model_rows', [False, True], ids=['analyzed', 'seeded-1m'])
+def test_hot_queries_use_their_indexes(tmp_path, model_rows):
+    engine = create_engine(f"sqlite:///{tmp_path / 'shop.db'}")
+    Base.metadata.create_all(engine)
+    run_migrations(engine)
+    with engine.begin() as connection:
+        if model_rows:
+            seed_statistics(connection)
+        else:
+            connection.execute(text("ANALYZE"))
+    engine.dispose()
+
+    results = check_query_plans(engine)
+    assert results
+    failed = [(query.name, plan) for query, plan, ok in results if not ok]
+    assert failed == []
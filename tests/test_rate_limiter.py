@@ -0,0 +1,73 @@
+import json
+import threading
+import time
+
+import requests
+from telebot import apihelper
+
+from utils.rate_limiter import OutboundRateLimiter
+
+URL = 'https://api.telegram.org/bot123:abc/sendMessage'
+
+def make_response(status_code, payload):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(payload).encode()
+    return response
+
+class FakeSession:
+    """Сессия requests, которая запоминает тексты отправленных сообщений; ответы берутся из responses"""
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+        self.sent = []
+        self.done = threading.Event()
+        self.expected = None
+
+    def request(self, method, url, params=None, files=None, **kwargs):
+        self.sent.append(params['text'])
+        if self.expected is not None and len(self.sent) >= self.expected:
+            self.done.set()
+        if self.responses:
+            return self.responses.pop(0)
+        return make_response(200, {'ok': True, 'result': {'message_id': len(self.sent)}})
+
+def make_limiter(monkeypatch, session, chat_rate=20):
+    """Ограничитель с ведром чата на одно сообщение и ожиданием токена чата не дольше 0.1 с"""
+    monkeypatch.setattr(apihelper, '_get_req_session', lambda: session)
+    limiter = OutboundRateLimiter(global_rate=1000, chat_rate=chat_rate, burst=1)
+    limiter.max_chat_wait = 0.1
+    return limiter
+
+def test_send_over_chat_wait_is_deferred_in_order(monkeypatch):
+    session = FakeSession()
+    session.expected = 4
+    limiter = make_limiter(monkeypatch, session, chat_rate=5)
+
+    started = time.monotonic()
+    responses = [limiter.send('post', URL, params={'chat_id': 1, 'text': str(n)}) for n in range(4)]
+    # Поток обработчика не ждет токена чата
+    assert time.monotonic() - started < 0.5
+    assert all(response.status_code == 200 for response in responses)
+    assert limiter.stats()['deferred'] >= 2
+
+    assert session.done.wait(5)
+    assert session.sent == ['0', '1', '2', '3']
+
+def test_long_retry_after_is_deferred_instead_of_failing(monkeypatch):
+    too_many = make_response(429, {
+        'ok': False, 'error_code': 429, 'description': 'Too Many Requests: retry after 1',
+        'parameters': {'retry_after': 1},
+    })
+    session = FakeSession([too_many])
+    session.expected = 3
+    limiter = make_limiter(monkeypatch, session)
+
+    response = limiter.send('post', URL, params={'chat_id': 1, 'text': 'first'})
+    assert response.status_code == 200
+    # Пока чат заблокирован, следующие отправки встают в ту же очередь
+    limiter.send('post', URL, params={'chat_id': 1, 'text': 'second'})
+
+    assert session.done.wait(5)
+    assert session.sent == ['first', 'first', 'second']
+    assert limiter.stats()['rate_limited'] == 1
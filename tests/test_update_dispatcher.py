@@ -0,0 +1,45 @@
+import asyncio
+
+from telebot import types
+
+from utils.update_dispatcher import AsyncUpdateDispatcher
+
+def make_update(update_id, chat_id):
+    return types.Update.de_json({'update_id': update_id, 'message': {
+        'message_id': update_id, 'date': 0, 'text': str(update_id),
+        'chat': {'id': chat_id, 'type': 'private'},
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': 'U'},
+    }})
+
+class FakeBot:
+    """Бот, который обрабатывает обновление тем дольше, чем раньше оно пришло"""
+
+    def __init__(self):
+        self.handled = []
+        self.active = 0
+        self.max_active = 0
+
+    async def process_new_updates(self, updates):
+        for update in updates:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.05 / update.update_id)
+            self.active -= 1
+            self.handled.append((update.message.chat.id, update.update_id))
+
+def test_updates_of_one_chat_are_handled_in_order():
+    bot = FakeBot()
+    dispatcher = AsyncUpdateDispatcher(bot)
+    dispatcher.install()
+
+    async def run():
+        # Две пачки подряд, как их передает polling, не дожидаясь обработки предыдущей
+        await bot.process_new_updates([make_update(1, 10), make_update(2, 20), make_update(3, 10)])
+        await bot.process_new_updates([make_update(4, 10), make_update(5, 20)])
+        await dispatcher.drain()
+
+    asyncio.run(run())
+    assert [update_id for chat_id, update_id in bot.handled if chat_id == 10] == [1, 3, 4]
+    assert [update_id for chat_id, update_id in bot.handled if chat_id == 20] == [2, 5]
+    # Разные чаты обрабатываются параллельно
+    assert bot.max_active == 2
@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+
+import telebot
+from telebot.apihelper import ApiTelegramException
+
+from utils.image_store import image_store
+from utils.rate_limiter import outbound_limiter, PRIORITY_LOW
+
+try:
+    from telebot.asyncio_helper import ApiTelegramException as AsyncApiTelegramException
+except ImportError:
+    # Без aiohttp asyncio-режим недоступен, синхронный режим работает как обычно
+    AsyncApiTelegramException = ApiTelegramException
+
+# Ошибки Bot API в обоих режимах (у TeleBot и AsyncTeleBot это разные классы)
+API_ERRORS = (ApiTelegramException, AsyncApiTelegramException)
+
+def run_sync(coroutine):
+    """Выполнить корутину общего обработчика в синхронном режиме.
+
+    Все await внутри нее - вызовы синхронных адаптеров, поэтому она завершается за один шаг.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("Shared handler awaited an asynchronous operation in sync mode")
+
+class SyncAdapter:
+    """Синхронный объект (бот, сервис, модуль), методы которого вызываются через await"""
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return attr(*args, **kwargs)
+        return method
+
+class SyncBotAdapter(SyncAdapter):
+    """TeleBot с интерфейсом AsyncTeleBot"""
+
+    @asynccontextmanager
+    async def retrieve_data(self, user_id, chat_id=None):
+        """Данные состояния (async with, как у AsyncTeleBot)"""
+        with self._target.retrieve_data(user_id, chat_id) as data:
+            yield data
+
+class HandlerIO:
+    """Ввод-вывод общих обработчиков: бот, сервисы и контекст обновления.
+
+    Обработчики пишутся один раз как корутины handler(io, update) и вызывают бота и сервисы
+    через await: в asyncio-режиме это AsyncTeleBot и асинхронные сервисы, в синхронном -
+    TeleBot и синхронные сервисы за адаптерами (см. run_sync).
+    """
+
+    def __init__(self, bot, users, catalog, orders, context, text_router, file_bot):
+        self.bot = bot
+        self.users = users
+        self.catalog = catalog
+        self.orders = orders
+        self.context = context
+        self.text_router = text_router
+        # Синхронный клиент для скачивания файлов Telegram в потоках хранилища изображений
+        self.file_bot = file_bot
+
+    def handler(self, func):
+        """Обработчик для регистрации в боте: вызывает func(io, update)"""
+        raise NotImplementedError
+
+    async def wait(self, future, timeout):
+        """Дождаться результата concurrent.futures.Future"""
+        raise NotImplementedError
+
+    async def sleep(self, seconds):
+        """Пауза"""
+        raise NotImplementedError
+
+    def start_background(self, func, *args, name=None):
+        """Выполнить func(io, *args) в фоне, не дожидаясь ее завершения"""
+        raise NotImplementedError
+
+    def ingest_telegram_file(self, file_id):
+        """Скачать файл Telegram и сохранить его в хранилище изображений в фоне. Возвращает Future"""
+        return image_store.submit(image_store.ingest_telegram_file, self.file_bot, file_id)
+
+class SyncHandlerIO(HandlerIO):
+    """Ввод-вывод общих обработчиков для TeleBot"""
+
+    def __init__(self, bot, users, catalog, orders, context, text_router):
+        super().__init__(
+            SyncBotAdapter(bot),
+            SyncAdapter(users),
+            SyncAdapter(catalog),
+            SyncAdapter(orders),
+            SyncAdapter(context),
+            text_router,
+            file_bot=bot
+        )
+
+    def handler(self, func):
+        def handle(update):
+            return run_sync(func(self, update))
+        return handle
+
+    async def wait(self, future, timeout):
+        return future.result(timeout=timeout)
+
+    async def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def start_background(self, func, *args, name=None):
+        def run():
+            # Фоновые отправки пропускают вперед ответы пользователям
+            with outbound_limiter.priority(PRIORITY_LOW):
+                run_sync(func(self, *args))
+
+        thread = threading.Thread(target=run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+class AsyncHandlerIO(HandlerIO):
+    """Ввод-вывод общих обработчиков для AsyncTeleBot"""
+
+    def __init__(self, bot, users, catalog, orders, context, text_router):
+        super().__init__(
+            bot, users, catalog, orders, context, text_router,
+            file_bot=telebot.TeleBot(bot.token, threaded=False)
+        )
+        # Ссылки на фоновые задачи, чтобы их не удалил сборщик мусора
+        self._tasks = set()
+
+    def handler(self, func):
+        async def handle(update):
+            return await func(self, update)
+        return handle
+
+    async def wait(self, future, timeout):
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def start_background(self, func, *args, name=None):
+        async def run():
+            # Фоновые отправки пропускают вперед ответы пользователям
+            with outbound_limiter.priority(PRIORITY_LOW):
+                await func(self, *args)
+
+        task = asyncio.get_running_loop().create_task(run(), name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
@@ -1,19 +1,182 @@
 import json
 import os
+import threading
+import time
+from types import MappingProxyType
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+
+logger = setup_logger()
+
+DEFAULT_MESSAGE_KEY = 'default_message'
+MESSAGE_NOT_FOUND = 'Message not found'
+
+class LocaleRegistry:
+    """Реестр локализаций: все файлы из locales/ разбираются один раз и хранятся в памяти"""
+
+    def __init__(self, locales_dir=None, default_language=None, check_interval=None):
+        self.locales_dir = locales_dir or BotConfig.LOCALES_DIR
+        self.default_language = default_language or BotConfig.DEFAULT_LANGUAGE
+        self.check_interval = BotConfig.LOCALE_RELOAD_INTERVAL if check_interval is None else check_interval
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._last_check = 0.0
+        self._mtimes = {}
+        self._raw = {}
+        self._resolved = {}
+        self._listeners = []
+
+        # Счетчики
+        self.hits = 0
+        self.reloads = 0
+        self.missing = 0
+        self.missing_keys = set()
+
+    def load(self):
+        """Загрузить (или перезагрузить) все файлы локализации"""
+        with self._lock:
+            self._reload_changed(force=True)
+        self._notify_listeners()
+
+    def get_locale(self, language):
+        """Получить локализацию с уже разрешенной цепочкой fallback"""
+        self.refresh()
+        locale = self._resolved.get(language)
+        if locale is None:
+            locale = self._resolved.get(self.default_language, MappingProxyType({}))
+        return locale
+
+    def get_message(self, key, language):
+        """Получить сообщение: язык -> язык по умолчанию -> default_message"""
+        locale = self.get_locale(language)
+        message = locale.get(key)
+        if message is not None:
+            self.hits += 1
+            return message
+
+        self.missing += 1
+        self.missing_keys.add(key)
+        return locale.get(DEFAULT_MESSAGE_KEY, MESSAGE_NOT_FOUND)
+
+    def get_translations(self, key):
+        """Получить перевод ключа на все языки, где он явно задан (без fallback)"""
+        self.refresh()
+        return {
+            language: locale[key]
+            for language, locale in self._raw.items()
+            if key in locale
+        }
+
+    @property
+    def languages(self):
+        """Загруженные языки"""
+        self.refresh()
+        return tuple(self._raw)
+
+    def add_reload_listener(self, callback):
+        """Подписаться на перезагрузку локализаций"""
+        self._listeners.append(callback)
+
+    def stats(self):
+        """Статистика реестра"""
+        return {
+            'languages': len(self._raw),
+            'hits': self.hits,
+            'reloads': self.reloads,
+            'missing': self.missing,
+            'missing_keys': sorted(self.missing_keys),
+        }
+
+    def refresh(self):
+        """Загрузить локализации при первом обращении, затем проверять mtime не чаще check_interval"""
+        if self._loaded:
+            if self.check_interval < 0:
+                return
+            if time.monotonic() - self._last_check < self.check_interval:
+                return
+
+        with self._lock:
+            if self._loaded and time.monotonic() - self._last_check < self.check_interval:
+                return
+            changed = self._reload_changed(force=not self._loaded)
+
+        if changed:
+            self._notify_listeners()
+
+    def _reload_changed(self, force=False):
+        """Перечитать файлы, у которых изменился mtime. Вызывается под блокировкой"""
+        self._last_check = time.monotonic()
+
+        mtimes = {}
+        try:
+            entries = list(os.scandir(self.locales_dir))
+        except FileNotFoundError:
+            entries = []
+        for entry in entries:
+            name, ext = os.path.splitext(entry.name)
+            if ext == '.json' and entry.is_file():
+                try:
+                    mtimes[name] = entry.stat().st_mtime
+                except OSError:
+                    continue
+
+        raw = dict(self._raw)
+        changed = force
+        for language in set(raw) - set(mtimes):
+            del raw[language]
+            changed = True
+        for language, mtime in list(mtimes.items()):
+            if not force and self._mtimes.get(language) == mtime:
+                continue
+            path = os.path.join(self.locales_dir, f"{language}.json")
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    locale = json.load(f)
+                if not isinstance(locale, dict):
+                    raise ValueError("locale must be a JSON object")
+            except (OSError, ValueError) as e:
+                # Файл мог быть сохранен не до конца: остается прежняя версия, а старый mtime
+                # (или его отсутствие) заставит прочитать файл при следующей проверке
+                logger.warning(f"Cannot load locale {path}: {e}")
+                if language in self._mtimes:
+                    mtimes[language] = self._mtimes[language]
+                else:
+                    del mtimes[language]
+                continue
+            raw[language] = MappingProxyType(locale)
+            changed = True
+
+        self._mtimes = mtimes
+        self._loaded = True
+        if not changed:
+            return False
+
+        # Заранее разрешаем цепочку fallback: язык поверх языка по умолчанию
+        default = raw.get(self.default_language, {})
+        resolved = {
+            language: MappingProxyType({**default, **locale})
+            for language, locale in raw.items()
+        }
+
+        self._raw = raw
+        self._resolved = resolved
+        self.reloads += 1
+        return True
+
+    def _notify_listeners(self):
+        """Уведомить подписчиков о перезагрузке"""
+        for callback in self._listeners:
+            callback()
+
+# Создание экземпляра реестра локализаций
+locale_registry = LocaleRegistry()
 
 def load_locale(language):
     """Загрузить локализацию для выбранного языка"""
-    locale_path = os.path.join('locales', f"{language}.json")
-    
-    try:
-        with open(locale_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Возвращаем локализацию по умолчанию
-        with open(os.path.join('locales', 'uk.json'), 'r', encoding='utf-8') as f:
-            return json.load(f)
+    return locale_registry.get_locale(language)
 
 def get_message(key, language='uk'):
     """Получить сообщение по ключу и языку"""
-    locale = load_locale(language)
-    return locale.get(key, locale.get('default_message', 'Message not found'))
\ No newline at end of file
+    return locale_registry.get_message(key, language)
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import requests
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    # Без Pillow изображения сохраняются как есть, без уменьшения и миниатюр
+    Image = None
+
+logger = setup_logger()
+
+# Ссылка на изображение из локального хранилища в Product.image_url
+LOCAL_PREFIX = 'local:'
+
+# Сохраненное изображение: хеш оригинала, путь к изображению для отправки и к миниатюре (или None)
+StoredImage = namedtuple('StoredImage', ['digest', 'image_path', 'thumbnail_path'])
+
+def _resize_image(source_path, image_path, thumbnail_path, max_size, thumbnail_size, quality):
+    """Уменьшить изображение и создать миниатюру (выполняется в дочернем процессе)"""
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    for path, size in ((image_path, max_size), (thumbnail_path, thumbnail_size)):
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.LANCZOS)
+        _save_atomically(path, lambda f: resized.save(f, 'JPEG', quality=quality, optimize=True))
+
+def _save_atomically(path, write):
+    """Записать файл через временный файл в том же каталоге и os.replace"""
+    fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+class ImageStore:
+    """Локальное хранилище изображений товаров с адресацией по содержимому.
+
+    Оригинал хранится в <root>/<sha[:2]>/<sha>, рядом - уменьшенная копия для отправки
+    и миниатюра. Одинаковые загрузки сохраняются один раз.
+    """
+
+    def __init__(self, root=None, max_size=None, thumbnail_size=None, workers=None):
+        self.root = root or BotConfig.MEDIA_DIR
+        self.max_size = max_size or BotConfig.IMAGE_MAX_SIZE
+        self.thumbnail_size = thumbnail_size or BotConfig.IMAGE_THUMBNAIL_SIZE
+        self.workers = workers or BotConfig.IMAGE_WORKERS
+        self.quality = BotConfig.IMAGE_JPEG_QUALITY
+        self.max_bytes = BotConfig.IMAGE_MAX_BYTES
+
+        self._lock = threading.Lock()
+        self._process_pool = None
+        self._thread_pool = None
+
+    def start(self):
+        """Запустить процессы для обработки изображений (лучше до запуска потоков бота)"""
+        if Image is None:
+            logger.warning("Pillow is not installed: product images are stored without resizing")
+            return
+        self._get_process_pool().submit(os.getpid).result()
+
+    def shutdown(self):
+        """Остановить пулы обработки"""
+        with self._lock:
+            pools = (self._thread_pool, self._process_pool)
+            self._thread_pool = self._process_pool = None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=True)
+
+    @staticmethod
+    def reference(digest):
+        """Ссылка на изображение для Product.image_url"""
+        return f"{LOCAL_PREFIX}{digest}"
+
+    @staticmethod
+    def is_local(image_url):
+        """Ссылается ли image_url на локальное хранилище"""
+        return bool(image_url) and image_url.startswith(LOCAL_PREFIX)
+
+    def get(self, image_url):
+        """Найти сохраненное изображение по ссылке (None, если его нет)"""
+        if not self.is_local(image_url):
+            return None
+        digest = image_url[len(LOCAL_PREFIX):]
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            return None
+        return self._stored(digest)
+
+    def submit(self, func, *args):
+        """Выполнить загрузку в фоновом потоке, не блокируя обработчик. Возвращает Future"""
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-store')
+            return self._thread_pool.submit(func, *args)
+
+    def ingest_url(self, url):
+        """Скачать изображение по URL и сохранить"""
+        with requests.get(url, stream=True, timeout=BotConfig.IMAGE_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            data = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                data += chunk
+                if len(data) > self.max_bytes:
+                    raise ValueError(f"Image is larger than {self.max_bytes} bytes: {url}")
+        return self.ingest(bytes(data))
+
+    def ingest_telegram_file(self, bot, file_id):
+        """Скачать файл из Telegram (например, фото от администратора) и сохранить"""
+        file_info = bot.get_file(file_id)
+        if file_info.file_size and file_info.file_size > self.max_bytes:
+            raise ValueError(f"Image is larger than {self.max_bytes} bytes")
+        return self.ingest(bot.download_file(file_info.file_path))
+
+    def ingest(self, data):
+        """Сохранить изображение: повторная загрузка того же файла не обрабатывается заново"""
+        if len(data) > self.max_bytes:
+            raise ValueError(f"Image is larger than {self.max_bytes} bytes")
+
+        digest = hashlib.sha256(data).hexdigest()
+        stored = self._stored(digest)
+        if stored is not None:
+            return stored
+
+        original_path = self._path(digest)
+        os.makedirs(os.path.dirname(original_path), exist_ok=True)
+        if not os.path.exists(original_path):
+            _save_atomically(original_path, lambda f: f.write(data))
+
+        if Image is not None:
+            # Уменьшение - работа для CPU, поэтому выполняется в отдельном процессе
+            self._get_process_pool().submit(
+                _resize_image,
+                original_path,
+                self._path(digest, '.jpg'),
+                self._path(digest, '_thumb.jpg'),
+                self.max_size,
+                self.thumbnail_size,
+                self.quality
+            ).result()
+
+        return self._stored(digest)
+
+    def _stored(self, digest):
+        """Сохраненное изображение по хешу (None, если его нет)"""
+        image_path = self._path(digest, '.jpg')
+        thumbnail_path = self._path(digest, '_thumb.jpg')
+        if os.path.exists(image_path):
+            return StoredImage(digest, image_path, thumbnail_path if os.path.exists(thumbnail_path) else None)
+
+        # Сохранено без Pillow - отправляем оригинал
+        original_path = self._path(digest)
+        if Image is None and os.path.exists(original_path):
+            return StoredImage(digest, original_path, None)
+        return None
+
+    def _path(self, digest, suffix=''):
+        """Путь к файлу в хранилище"""
+        return os.path.join(self.root, digest[:2], f"{digest}{suffix}")
+
+    def _get_process_pool(self):
+        """Пул процессов создается при первом использовании"""
+        with self._lock:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._process_pool
+
+# Создание экземпляра хранилища изображений
+image_store = ImageStore()
@@ -0,0 +1,195 @@
+import io
+import re
+
+from telebot.types import InputFile
+
+from config.bot_config import BotConfig
+
+# Ограничения Telegram на длину текста (в единицах UTF-16)
+MESSAGE_LIMIT = 4096
+CAPTION_LIMIT = 1024
+
+# Разметка legacy Markdown: сущности не вкладываются друг в друга, '```' проверяется раньше '`'
+MARKDOWN_MARKERS = ('```', '`', '*', '_')
+# Запасные символы в каждой части для закрытия сущности, разорванной на границе частей
+MARKER_RESERVE = max(len(marker) for marker in MARKDOWN_MARKERS)
+
+# Места, где можно разорвать слишком длинный блок: после перевода строки или пробела
+BREAK_RE = re.compile(r'(?<=\n)|(?<= )')
+
+def text_length(text):
+    """Длина текста так, как ее считает Telegram (в единицах UTF-16)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def scan_markdown(text, marker=None):
+    """Разобрать разметку legacy Markdown.
+
+    marker - сущность, открытая до начала text. Возвращает (сущность, открытая в конце text,
+    или None; позиция начала незакрытой ссылки или None; text без разметки).
+    """
+    plain = []
+    link_start = None
+    i = 0
+    while i < len(text):
+        if marker is not None:
+            # Внутри сущности разметка не действует до закрывающего маркера
+            if text.startswith(marker, i):
+                i += len(marker)
+                marker = None
+            else:
+                plain.append(text[i])
+                i += 1
+            continue
+
+        char = text[i]
+        if char == '\\' and i + 1 < len(text) and text[i + 1] in '_*`[':
+            plain.append(text[i + 1])
+            i += 2
+            continue
+
+        opened = next((m for m in MARKDOWN_MARKERS if text.startswith(m, i)), None)
+        if opened is not None:
+            marker = opened
+            i += len(opened)
+            continue
+
+        if char == '[':
+            link_start = i
+        elif char == ')' and link_start is not None:
+            link_start = None
+        plain.append(char)
+        i += 1
+
+    return marker, link_start, ''.join(plain)
+
+class MessageBuilder:
+    """Собирает блоки текста (например, строки отчета) в как можно меньшее число сообщений.
+
+    Блоки не разрываются, пока помещаются в одно сообщение; слишком длинный блок делится
+    по строкам и словам, а разорванная сущность Markdown закрывается и открывается заново.
+    Если сообщений получается больше MESSAGE_DOCUMENT_THRESHOLD, отправляется текстовый файл.
+    """
+
+    def __init__(self, limit=MESSAGE_LIMIT, parse_mode=None, separator='\n'):
+        self.limit = limit
+        self.parse_mode = parse_mode
+        self.separator = separator
+        self.blocks = []
+
+    def add(self, block):
+        """Добавить блок"""
+        self.blocks.append(block.rstrip('\n'))
+        return self
+
+    def extend(self, blocks):
+        """Добавить несколько блоков"""
+        for block in blocks:
+            self.add(block)
+        return self
+
+    def build(self):
+        """Тексты сообщений"""
+        messages = []
+        current = None
+        for block in self.blocks:
+            for part in self._split(block):
+                if current is not None:
+                    candidate = current + self.separator + part
+                    if text_length(candidate) <= self.limit:
+                        current = candidate
+                        continue
+                    messages.append(current)
+                current = part
+        if current is not None:
+            messages.append(current)
+        return messages
+
+    def plain_text(self):
+        """Весь текст без разметки (для отправки файлом)"""
+        text = self.separator.join(self.blocks)
+        if self.parse_mode == 'Markdown':
+            text = scan_markdown(text)[2]
+        return text
+
+    async def send(self, bot, chat_id, reply_markup=None, document_name='report.txt', document_caption=None, **kwargs):
+        """Отправить собранные сообщения (клавиатура - у последнего) или файл, если сообщений слишком много.
+
+        bot - бот общего обработчика (io.bot), методы которого вызываются через await
+        """
+        messages = self.build()
+        if not messages:
+            return []
+
+        if len(messages) > BotConfig.MESSAGE_DOCUMENT_THRESHOLD:
+            document = InputFile(io.BytesIO(self.plain_text().encode('utf-8')), file_name=document_name)
+            return [await bot.send_document(
+                chat_id,
+                document,
+                caption=document_caption,
+                reply_markup=reply_markup
+            )]
+
+        sent = []
+        for number, text in enumerate(messages, 1):
+            sent.append(await bot.send_message(
+                chat_id,
+                text,
+                parse_mode=self.parse_mode,
+                reply_markup=reply_markup if number == len(messages) else None,
+                **kwargs
+            ))
+        return sent
+
+    def _split(self, block):
+        """Разбить блок на части не длиннее лимита"""
+        if text_length(block) <= self.limit:
+            return [block]
+
+        markdown = self.parse_mode == 'Markdown'
+        limit = self.limit - MARKER_RESERVE if markdown else self.limit
+        pieces = [piece for piece in BREAK_RE.split(block) if piece]
+
+        parts = []
+        # reopened - маркер сущности, открытой заново в начале текущей части
+        current = reopened = ''
+        while pieces:
+            piece = pieces.pop(0)
+            if text_length(current + piece) <= limit:
+                current += piece
+                continue
+            if not current[len(reopened):].strip():
+                # Слово длиннее лимита режем по символам. Кроме открытой заново сущности
+                # в части ничего нет, поэтому пробелы перед словом отбрасываются
+                current = reopened
+                room = limit - text_length(current)
+                cut = max(room, 1)
+                while cut > 1 and text_length(piece[:cut]) > room:
+                    cut -= 1
+                current, pieces = current + piece[:cut], [piece[cut:]] + pieces
+            else:
+                pieces.insert(0, piece)
+
+            part = current.rstrip()
+            marker = None
+            if markdown:
+                part, marker, carry = self._close_part(part)
+                if carry:
+                    pieces.insert(0, carry)
+            parts.append(part)
+            # Разорванная сущность открывается заново в начале следующей части
+            current = reopened = marker or ''
+
+        if current.strip():
+            parts.append(current.rstrip())
+        return parts
+
+    def _close_part(self, part):
+        """Закрыть сущность, открытую в конце части. Возвращает (часть, открытая сущность, перенос в следующую часть)"""
+        marker, link_start, _ = scan_markdown(part)
+        carry = ''
+        if marker is None and link_start:
+            # Ссылку нельзя закрыть и открыть заново - переносим ее целиком в следующую часть
+            part, carry = part[:link_start].rstrip(), part[link_start:]
+        if marker is not None:
+            part += marker
+        return part, marker, carry
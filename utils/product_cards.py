@@ -0,0 +1,38 @@
+from collections import namedtuple
+
+from config.bot_config import BotConfig
+from keyboards.inline_keyboards import get_product_detail_keyboard
+from utils.cache import LRUCache
+from utils.helpers import get_message, locale_registry
+
+# Готовая карточка товара: подпись, режим разметки и JSON клавиатуры
+ProductCard = namedtuple('ProductCard', ['caption', 'parse_mode', 'reply_markup'])
+
+# Отрисованные карточки: (ID товара, язык, версия каталога) -> ProductCard.
+# Изменение товара меняет версию каталога, поэтому старые карточки просто вытесняются
+product_card_cache = LRUCache(maxsize=BotConfig.PRODUCT_CARD_CACHE_SIZE)
+
+# Карточки содержат тексты локализации
+locale_registry.add_reload_listener(product_card_cache.clear)
+
+def render_product_card(product, language):
+    """Отрисовать карточку товара"""
+    caption = (
+        f"*{product.name}*\n\n"
+        f"{product.description}\n\n"
+        f"_{get_message('price_label', language)}: {product.price} грн_"
+    )
+    return ProductCard(
+        caption=caption,
+        parse_mode='Markdown',
+        reply_markup=get_product_detail_keyboard(product.id, language).to_json()
+    )
+
+def get_product_card(product, language, version):
+    """Карточка товара из кеша (отрисовывается только при первом просмотре в этой версии каталога)"""
+    key = (product.id, language, version)
+    card = product_card_cache.get(key)
+    if card is None:
+        card = render_product_card(product, language)
+        product_card_cache.set(key, card)
+    return card
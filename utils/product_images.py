@@ -0,0 +1,95 @@
+import threading
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from utils.handler_io import API_ERRORS
+from utils.helpers import get_message
+from utils.image_store import image_store
+
+logger = setup_logger()
+
+# Одновременно выполняется только один прогрев изображений
+_warm_lock = threading.Lock()
+
+# Описания ошибок 400, с которыми Telegram отклоняет сохраненный file_id. Другие ошибки 400
+# (неверная разметка, слишком длинная подпись) повторятся и при отправке по URL
+FILE_ID_ERRORS = (
+    'wrong file identifier',
+    'wrong remote file identifier',
+    'invalid file identifier',
+    'invalid remote file identifier',
+    'wrong file_id',
+    'invalid file_id',
+)
+
+def is_file_id_rejected(error):
+    """Отклонил ли Telegram file_id (а не запрос в целом)"""
+    description = (getattr(error, 'description', None) or '').lower()
+    return error.error_code == 400 and any(text in description for text in FILE_ID_ERRORS)
+
+async def send_product_photo(io, chat_id, product, **kwargs):
+    """Отправить изображение товара: по сохраненному file_id, иначе по URL или из локального хранилища с сохранением file_id"""
+    file_id = await io.catalog.get_image_file_id(product)
+    if file_id:
+        try:
+            return await io.bot.send_photo(chat_id, file_id, **kwargs)
+        except API_ERRORS as e:
+            if not is_file_id_rejected(e):
+                raise
+            # Telegram не принял file_id - забываем его и отправляем по URL
+            logger.warning(f"Stored file_id of product {product.id} was rejected: {e}")
+            await io.catalog.save_image_file_id(product, None)
+
+    if image_store.is_local(product.image_url):
+        stored = image_store.get(product.image_url)
+        if stored is None:
+            raise FileNotFoundError(f"Image of product {product.id} is missing: {product.image_url}")
+        with open(stored.image_path, 'rb') as photo:
+            message = await io.bot.send_photo(chat_id, photo, **kwargs)
+    else:
+        message = await io.bot.send_photo(chat_id, product.image_url, **kwargs)
+    if message.photo:
+        await io.catalog.save_image_file_id(product, message.photo[-1].file_id)
+    return message
+
+def warm_product_images(io, chat_id, language, interval=None):
+    """Запустить в фоне получение file_id для всех изображений каталога.
+
+    Изображения отправляются в чат chat_id и сразу удаляются. Возвращает фоновый поток
+    (задачу в asyncio-режиме) или None, если прогрев уже выполняется.
+    """
+    if not _warm_lock.acquire(blocking=False):
+        return None
+
+    interval = BotConfig.IMAGE_WARM_INTERVAL if interval is None else interval
+    try:
+        return io.start_background(_warm_images, chat_id, language, interval, name='image-warmup')
+    except BaseException:
+        _warm_lock.release()
+        raise
+
+async def _warm_images(io, chat_id, language, interval):
+    """Прогрев изображений (выполняется в фоне)"""
+    warmed = failed = 0
+    try:
+        for product in await io.catalog.get_all_products():
+            if not product.image_url or await io.catalog.get_image_file_id(product):
+                continue
+            try:
+                message = await send_product_photo(io, chat_id, product, disable_notification=True)
+                await io.bot.delete_message(chat_id, message.message_id)
+                warmed += 1
+            except Exception as e:
+                failed += 1
+                logger.warning(f"Cannot warm image of product {product.id}: {e}")
+            await io.sleep(interval)
+
+        await io.bot.send_message(
+            chat_id,
+            get_message('warm_images_done', language).format(warmed=warmed, failed=failed)
+        )
+        logger.info(f"Image warm-up finished: {warmed} cached, {failed} failed")
+    except Exception as e:
+        logger.error(f"Image warm-up failed: {e}")
+    finally:
+        _warm_lock.release()
@@ -0,0 +1,489 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+from telebot import apihelper
+from telebot.types import InputFile
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+from utils.cache import LRUCache
+
+logger = setup_logger()
+
+# Приоритеты отправки: меньше - раньше
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Методы, которые отправляют или меняют сообщения в чате и попадают под лимиты Telegram
+LIMITED_METHOD_PREFIXES = ('send', 'edit', 'copy', 'forward')
+# Изменение сообщения - ответ на нажатие кнопки, пользователь ждет его сразу
+METHOD_PRIORITIES = {
+    'editMessageText': PRIORITY_HIGH,
+    'editMessageCaption': PRIORITY_HIGH,
+    'editMessageReplyMarkup': PRIORITY_HIGH,
+}
+
+# Приоритет отправок текущего потока или задачи asyncio (None - по методу)
+_priority = ContextVar('outbound_priority', default=None)
+
+class TokenBucket:
+    """Ведро токенов: rate токенов в секунду, не больше capacity"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        # После 429 токены не выдаются до этого момента
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now):
+        """Взять токен, если он есть. Возвращает 0 или сколько секунд ждать до следующей попытки"""
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def delay(self, now):
+        """Сколько секунд ждать до следующего токена (не занимая его)"""
+        self._refill(now)
+        wait = (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def reserve(self, now):
+        """Занять токен заранее (в долг). Возвращает, сколько секунд ждать до его появления"""
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def block(self, until):
+        """Не выдавать токены до момента until (time.monotonic())"""
+        self.blocked_until = max(self.blocked_until, until)
+
+def _retry_after(response):
+    """retry_after из ответа 429 (None, если его нет)"""
+    try:
+        return float(response.json()['parameters']['retry_after'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def _deferred_response(method_name, chat_id):
+    """Ответ Bot API для отложенной отправки: вместо отправленного сообщения - заглушка с message_id 0"""
+    if method_name.startswith('edit'):
+        result = True
+    elif method_name == 'sendMediaGroup':
+        result = []
+    elif method_name == 'copyMessage':
+        result = {'message_id': 0}
+    else:
+        result = {'message_id': 0, 'date': int(time.time()), 'chat': {'id': chat_id, 'type': 'private'}}
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({'ok': True, 'result': result}).encode()
+    return response
+
+def _detach(files):
+    """Прочитать файлы запроса в память: к отложенной отправке обработчик их уже закроет"""
+    detached = {}
+    for key, value in (files or {}).items():
+        if isinstance(value, tuple):
+            name, file, rest = value[0], value[1], value[2:]
+        else:
+            name, file, rest = os.path.basename(str(getattr(value, 'name', key))), value, ()
+        if hasattr(file, 'read'):
+            if hasattr(file, 'seek'):
+                file.seek(0)
+            file = file.read()
+        detached[key] = (name, file) + rest
+    return detached
+
+def _rewind(files):
+    """Вернуть файлы запроса в начало перед повторной отправкой"""
+    for value in (files or {}).values():
+        file = value[1] if isinstance(value, tuple) else value
+        if isinstance(file, InputFile):
+            file = file.file
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+class OutboundRateLimiter:
+    """Ограничение исходящих запросов к Bot API.
+
+    Общее ведро (RATE_LIMIT_GLOBAL сообщений в секунду) выдает токены по приоритету,
+    у каждого чата свое ведро (RATE_LIMIT_CHAT в секунду, для групп и каналов -
+    RATE_LIMIT_GROUP_PER_MINUTE в минуту). Ответ 429 блокирует чат на retry_after,
+    после чего запрос повторяется (если retry_after не больше RATE_LIMIT_MAX_RETRY_AFTER).
+
+    Потоки обработки обновлений обслуживают и другие чаты, поэтому ждут токена чата не дольше
+    RATE_LIMIT_MAX_CHAT_WAIT: более долгая отправка откладывается в очередь чата и выполняется
+    фоновым потоком ограничителя по порядку, а обработчик сразу получает заглушку сообщения.
+    Фоновые отправки (PRIORITY_LOW) ждут в своем потоке до RATE_LIMIT_MAX_RETRY_AFTER.
+    В asyncio-режиме ожидание не занимает поток, поэтому отправки просто ждут токенов.
+    Подключается через apihelper.CUSTOM_REQUEST_SENDER (install) или
+    asyncio_helper._process_request (install_async).
+    """
+
+    def __init__(self, global_rate=None, chat_rate=None, group_rate_per_minute=None, burst=None):
+        self.global_rate = global_rate or BotConfig.RATE_LIMIT_GLOBAL
+        self.chat_rate = chat_rate or BotConfig.RATE_LIMIT_CHAT
+        self.group_rate = (group_rate_per_minute or BotConfig.RATE_LIMIT_GROUP_PER_MINUTE) / 60
+        self.burst = burst or BotConfig.RATE_LIMIT_BURST
+        self.max_retries = BotConfig.RATE_LIMIT_MAX_RETRIES
+        self.max_retry_after = BotConfig.RATE_LIMIT_MAX_RETRY_AFTER
+        self.max_chat_wait = min(BotConfig.RATE_LIMIT_MAX_CHAT_WAIT, self.max_retry_after)
+
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        # Общие токены не копятся: лимит Telegram действует на любом отрезке в секунду
+        self._global = TokenBucket(self.global_rate, 1)
+        self._chats = LRUCache(maxsize=BotConfig.USER_CACHE_SIZE)
+        # Очередь ожидающих общий токен: (приоритет, порядковый номер)
+        self._waiters = []
+        self._sequence = itertools.count()
+        # Отложенные отправки: очередь каждого чата и расписание чатов (момент, порядковый номер, чат)
+        self._deferred = {}
+        self._schedule = []
+        self._scheduled = threading.Condition(self._lock)
+        self._worker = None
+        # Пробуждение ожидающих общий токен в asyncio-режиме (создается в цикле событий)
+        self._async_released = None
+
+        # Счетчики
+        self.sent = 0
+        self.throttled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.rate_limited = 0
+        self.deferred = 0
+        self.dropped = 0
+
+    def install(self):
+        """Пропускать все запросы TeleBot через ограничитель"""
+        apihelper.CUSTOM_REQUEST_SENDER = self.send
+
+    def install_async(self):
+        """Пропускать все запросы AsyncTeleBot через ограничитель"""
+        from telebot import asyncio_helper
+
+        process_request = asyncio_helper._process_request
+
+        async def limited_process_request(token, url, method='get', params=None, files=None, **kwargs):
+            return await self.send_async(process_request, token, url, method, params, files, **kwargs)
+
+        asyncio_helper._process_request = limited_process_request
+
+    @contextmanager
+    def priority(self, priority):
+        """Приоритет отправок текущего потока или задачи внутри блока with (например, PRIORITY_LOW для фоновых рассылок)"""
+        token = _priority.set(priority)
+        try:
+            yield
+        finally:
+            _priority.reset(token)
+
+    def send(self, method, url, params=None, files=None, **kwargs):
+        """Отправить запрос с учетом лимитов (сигнатура CUSTOM_REQUEST_SENDER)"""
+        method_name = url.rsplit('/', 1)[-1]
+        chat_id = params.get('chat_id') if params else None
+        limited = chat_id is not None and method_name.startswith(LIMITED_METHOD_PREFIXES)
+        priority = self._current_priority(method_name)
+        max_wait = self._max_wait(priority)
+
+        attempt = 0
+        while True:
+            if limited and not self.acquire(chat_id, priority):
+                # Токен чата появится нескоро - не задерживаем поток, отправка выполнится позже
+                return self._defer(chat_id, priority, attempt, method_name, method, url, params, files, kwargs)
+            response = apihelper._get_req_session().request(method, url, params=params, files=files, **kwargs)
+            if response.status_code != 429:
+                return response
+
+            retry_after = _retry_after(response)
+            with self._lock:
+                self.rate_limited += 1
+            if limited and retry_after is not None:
+                # Следующие отправки в чат подождут, пока он разблокируется
+                self.block_chat(chat_id, retry_after)
+            if attempt >= self.max_retries or retry_after is None or retry_after > self.max_retry_after:
+                # Ошибку 429 получит обработчик
+                return response
+
+            attempt += 1
+            _rewind(files)
+            if limited and retry_after > max_wait:
+                logger.warning(f"{method_name} to chat {chat_id} was rate limited, deferring for {retry_after:.0f}s")
+                return self._defer(chat_id, priority, attempt, method_name, method, url, params, files, kwargs)
+            logger.warning(f"{method_name} to chat {chat_id} was rate limited, retrying in {retry_after:.0f}s")
+            if not limited:
+                time.sleep(retry_after)
+
+    async def send_async(self, process_request, token, url, method='get', params=None, files=None, **kwargs):
+        """Отправить запрос AsyncTeleBot с учетом лимитов (обертка asyncio_helper._process_request)"""
+        from telebot.asyncio_helper import ApiTelegramException
+
+        chat_id = params.get('chat_id') if params else None
+        limited = chat_id is not None and url.startswith(LIMITED_METHOD_PREFIXES)
+        priority = self._current_priority(url)
+
+        attempt = 0
+        while True:
+            if limited:
+                await self.acquire_async(chat_id, priority)
+            try:
+                # _process_request забирает timeout из params, поэтому каждой попытке - своя копия
+                return await process_request(token, url, method, dict(params) if params else params, files, **kwargs)
+            except ApiTelegramException as error:
+                if error.error_code != 429:
+                    raise
+                retry_after = (error.result_json.get('parameters') or {}).get('retry_after')
+                with self._lock:
+                    self.rate_limited += 1
+                if limited and retry_after is not None:
+                    self.block_chat(chat_id, retry_after)
+                if attempt >= self.max_retries or retry_after is None or retry_after > self.max_retry_after:
+                    raise
+
+            attempt += 1
+            logger.warning(f"{url} to chat {chat_id} was rate limited, retrying in {retry_after:.0f}s")
+            _rewind(files)
+            if not limited:
+                await asyncio.sleep(retry_after)
+
+    def acquire(self, chat_id, priority=PRIORITY_NORMAL):
+        """Дождаться токенов чата и общего ведра.
+
+        Возвращает False (ничего не занимая), если токен чата появится позже, чем через допустимое
+        для priority время, или в чате уже ждут отложенные отправки - тогда отправку нужно отложить.
+        """
+        started = time.monotonic()
+        with self._lock:
+            bucket = self._chat_bucket(chat_id)
+            if str(chat_id) in self._deferred or bucket.delay(started) > self._max_wait(priority):
+                return False
+            wait = bucket.reserve(started)
+        self._wait_tokens(chat_id, priority, started, wait)
+        return True
+
+    async def acquire_async(self, chat_id, priority=PRIORITY_NORMAL):
+        """Дождаться токенов чата и общего ведра, не занимая поток"""
+        started = time.monotonic()
+        with self._lock:
+            wait = self._chat_bucket(chat_id).reserve(started)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        await self._acquire_global_async(priority)
+        self._record_wait(chat_id, started)
+
+    def block_chat(self, chat_id, seconds):
+        """Не отправлять в чат seconds секунд (после 429)"""
+        with self._lock:
+            self._chat_bucket(chat_id).block(time.monotonic() + seconds)
+
+    def stats(self):
+        """Статистика ограничителя"""
+        with self._lock:
+            return {
+                'sent': self.sent,
+                'throttled': self.throttled,
+                'wait_avg': self.wait_total / self.throttled if self.throttled else 0.0,
+                'wait_max': self.wait_max,
+                'rate_limited': self.rate_limited,
+                'deferred': self.deferred,
+                'dropped': self.dropped,
+                'pending': sum(len(queue) for queue in self._deferred.values()),
+                'waiting': len(self._waiters),
+            }
+
+    def _current_priority(self, method_name):
+        """Приоритет отправки: заданный блоком priority() или по методу"""
+        priority = _priority.get()
+        if priority is None:
+            priority = METHOD_PRIORITIES.get(method_name, PRIORITY_NORMAL)
+        return priority
+
+    def _max_wait(self, priority):
+        """Сколько секунд отправка с приоритетом priority может ждать токена чата или повтора после 429 в своем потоке"""
+        return self.max_retry_after if priority >= PRIORITY_LOW else self.max_chat_wait
+
+    def _chat_bucket(self, chat_id):
+        """Ведро чата. Вызывается под блокировкой"""
+        key = str(chat_id)
+        bucket = self._chats.get(key)
+        if bucket is None:
+            # Отрицательный ID или @username - группа или канал
+            is_group = key.startswith(('-', '@'))
+            bucket = TokenBucket(self.group_rate if is_group else self.chat_rate, self.burst)
+            self._chats.set(key, bucket)
+        return bucket
+
+    def _wait_tokens(self, chat_id, priority, started, wait):
+        """Дождаться занятого токена чата (wait секунд) и общего токена"""
+        if wait > 0:
+            time.sleep(wait)
+        self._acquire_global(priority)
+        self._record_wait(chat_id, started)
+
+    def _record_wait(self, chat_id, started):
+        """Учесть отправку и время ожидания токенов в статистике"""
+        waited = time.monotonic() - started
+        with self._lock:
+            self.sent += 1
+            if waited > 0.001:
+                self.throttled += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+        if waited >= BotConfig.SLOW_UPDATE_THRESHOLD:
+            logger.warning(f"Message to chat {chat_id} was throttled for {waited:.3f}s")
+
+    def _acquire_global(self, priority):
+        """Взять общий токен: первым его получает ожидающий с наивысшим приоритетом"""
+        entry = (priority, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self._global.take(time.monotonic())
+                        if timeout <= 0:
+                            return
+                    self._released.wait(timeout)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                # Следующий по приоритету проверяет, не его ли очередь
+                self._released.notify_all()
+
+    async def _acquire_global_async(self, priority):
+        """Взять общий токен в asyncio-режиме (тот же порядок по приоритету, что и у _acquire_global)"""
+        if self._async_released is None:
+            self._async_released = asyncio.Condition()
+        released = self._async_released
+        entry = (priority, next(self._sequence))
+        async with released:
+            with self._lock:
+                heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    timeout = None
+                    with self._lock:
+                        if self._waiters[0] == entry:
+                            timeout = self._global.take(time.monotonic())
+                    if timeout is not None and timeout <= 0:
+                        return
+                    try:
+                        await asyncio.wait_for(released.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                with self._lock:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                released.notify_all()
+
+    def _defer(self, chat_id, priority, attempt, method_name, method, url, params, files, kwargs):
+        """Поставить отправку в очередь чата. Возвращает заглушку ответа для обработчика"""
+        request = {
+            'priority': priority,
+            'attempt': attempt,
+            'method_name': method_name,
+            'method': method,
+            'url': url,
+            'params': params,
+            'files': _detach(files),
+            'kwargs': kwargs,
+        }
+        key = str(chat_id)
+        with self._lock:
+            queue = self._deferred.get(key)
+            if queue is None:
+                queue = self._deferred[key] = deque()
+                self._schedule_chat(key, self._chat_bucket(key).delay(time.monotonic()))
+            queue.append(request)
+            self.deferred += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._deliver_deferred, name='rate-limiter', daemon=True)
+                self._worker.start()
+        return _deferred_response(method_name, chat_id)
+
+    def _schedule_chat(self, key, delay):
+        """Выполнить первую отложенную отправку чата через delay секунд. Вызывается под блокировкой"""
+        heapq.heappush(self._schedule, (time.monotonic() + delay, next(self._sequence), key))
+        self._scheduled.notify()
+
+    def _deliver_deferred(self):
+        """Поток отложенных отправок: очередь каждого чата по порядку, когда в чате появляется токен"""
+        while True:
+            with self._lock:
+                while not self._schedule or self._schedule[0][0] > time.monotonic():
+                    self._scheduled.wait(self._schedule[0][0] - time.monotonic() if self._schedule else None)
+                _, _, key = heapq.heappop(self._schedule)
+                request = self._deferred[key][0]
+
+            retry_after = self._deliver(key, request)
+
+            with self._lock:
+                queue = self._deferred[key]
+                if retry_after is None:
+                    queue.popleft()
+                    if not queue:
+                        del self._deferred[key]
+                        continue
+                    retry_after = self._chat_bucket(key).delay(time.monotonic())
+                self._schedule_chat(key, retry_after)
+
+    def _deliver(self, chat_id, request):
+        """Выполнить отложенную отправку. Возвращает None или через сколько секунд ее повторить (после 429)"""
+        started = time.monotonic()
+        with self._lock:
+            wait = self._chat_bucket(chat_id).reserve(started)
+        self._wait_tokens(chat_id, request['priority'], started, wait)
+
+        method_name = request['method_name']
+        try:
+            response = apihelper._get_req_session().request(
+                request['method'], request['url'],
+                params=request['params'], files=request['files'], **request['kwargs']
+            )
+        except requests.RequestException as error:
+            with self._lock:
+                self.dropped += 1
+            logger.error(f"Deferred {method_name} to chat {chat_id} failed: {error}")
+            return None
+
+        if response.status_code == 429:
+            retry_after = _retry_after(response)
+            with self._lock:
+                self.rate_limited += 1
+            if retry_after is not None:
+                self.block_chat(chat_id, retry_after)
+            request['attempt'] += 1
+            if request['attempt'] <= self.max_retries and retry_after is not None and retry_after <= self.max_retry_after:
+                logger.warning(f"Deferred {method_name} to chat {chat_id} was rate limited, retrying in {retry_after:.0f}s")
+                return retry_after
+        if response.status_code != 200:
+            with self._lock:
+                self.dropped += 1
+            logger.error(f"Deferred {method_name} to chat {chat_id} failed: {response.status_code} {response.text}")
+        return None
+
+# Создание экземпляра ограничителя
+outbound_limiter = OutboundRateLimiter()
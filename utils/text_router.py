@@ -0,0 +1,70 @@
+from config.logging_config import setup_logger
+from utils.helpers import locale_registry
+
+logger = setup_logger()
+
+class TextRouter:
+    """Маршрутизатор текстовых кнопок: текст кнопки на любом языке -> действие"""
+
+    def __init__(self, registry=locale_registry):
+        self.registry = registry
+        self._actions = {}
+        self._index = {}
+        registry.add_reload_listener(self.rebuild)
+
+    def route(self, key):
+        """Декоратор: привязать обработчик к кнопке с ключом локализации key"""
+        def decorator(func):
+            self.add_route(key, func)
+            return func
+        return decorator
+
+    def add_route(self, key, callback):
+        """Привязать обработчик к кнопке с ключом локализации key"""
+        self._actions[key] = callback
+        self.rebuild()
+
+    def rebuild(self):
+        """Перестроить индекс текстов кнопок по всем языкам"""
+        index = {}
+        for key in self._actions:
+            for language, text in self.registry.get_translations(key).items():
+                if index.get(text, key) != key:
+                    logger.warning(f"Button text '{text}' ({language}) is used by '{index[text]}' and '{key}'")
+                    continue
+                index[text] = key
+        self._index = index
+
+    def resolve(self, text):
+        """Получить ключ действия по тексту кнопки"""
+        self.registry.refresh()
+        return self._index.get(text)
+
+    def matches(self, message):
+        """Фильтр для message_handler"""
+        return self.resolve(message.text) is not None
+
+    def dispatch(self, message):
+        """Вызвать обработчик, соответствующий тексту кнопки"""
+        key = self._index.get(message.text)
+        if key is None:
+            return None
+        return self._actions[key](message)
+
+    def register(self, bot):
+        """Зарегистрировать единый обработчик кнопок в боте"""
+        bot.register_message_handler(self.dispatch, content_types=['text'], func=self.matches)
+
+class AsyncTextRouter(TextRouter):
+    """Маршрутизатор текстовых кнопок для AsyncTeleBot: обработчики - корутины"""
+
+    async def dispatch(self, message):
+        """Вызвать обработчик, соответствующий тексту кнопки"""
+        key = self._index.get(message.text)
+        if key is None:
+            return None
+        return await self._actions[key](message)
+
+# Создание экземпляров маршрутизатора
+text_router = TextRouter()
+async_text_router = AsyncTextRouter()
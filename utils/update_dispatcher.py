@@ -0,0 +1,236 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+
+logger = setup_logger()
+
+# Обновления, в которых чат берется из вложенного сообщения или объекта с полем chat
+CHAT_FIELDS = (
+    'message', 'edited_message', 'channel_post', 'edited_channel_post',
+    'business_message', 'edited_business_message',
+    'my_chat_member', 'chat_member', 'chat_join_request', 'message_reaction'
+)
+# Обновления без чата: ключом служит пользователь (его личный чат с ботом)
+USER_FIELDS = ('inline_query', 'chosen_inline_result', 'shipping_query', 'pre_checkout_query')
+
+def update_chat_id(update):
+    """Чат, к которому относится обновление (для обновлений без чата - id пользователя или обновления)"""
+    for field in CHAT_FIELDS:
+        value = getattr(update, field, None)
+        if value is not None:
+            return value.chat.id
+
+    callback_query = update.callback_query
+    if callback_query is not None:
+        if callback_query.message is not None:
+            return callback_query.message.chat.id
+        return callback_query.from_user.id
+
+    for field in USER_FIELDS:
+        value = getattr(update, field, None)
+        if value is not None:
+            return value.from_user.id
+
+    poll_answer = update.poll_answer
+    if poll_answer is not None and poll_answer.user is not None:
+        return poll_answer.user.id
+
+    # Порядок остальных обновлений не важен - распределяем их равномерно
+    return update.update_id
+
+class Shard:
+    """Очередь и поток обработки одного шарда со статистикой"""
+
+    def __init__(self, number, queue_size):
+        self.number = number
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self._lock = threading.Lock()
+
+        # Счетчики
+        self.processed = 0
+        self.errors = 0
+        self.dropped = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record(self, wait, failed):
+        """Учесть обработанное обновление и время его ожидания в очереди"""
+        with self._lock:
+            self.processed += 1
+            self.errors += failed
+            self.wait_total += wait
+            if wait > self.wait_max:
+                self.wait_max = wait
+
+    def drop(self):
+        """Учесть обновление, не поместившееся в очередь"""
+        with self._lock:
+            self.dropped += 1
+
+    def stats(self):
+        """Статистика шарда"""
+        with self._lock:
+            return {
+                'shard': self.number,
+                'depth': self.queue.qsize(),
+                'processed': self.processed,
+                'errors': self.errors,
+                'dropped': self.dropped,
+                'wait_avg': self.wait_total / self.processed if self.processed else 0.0,
+                'wait_max': self.wait_max,
+            }
+
+class UpdateDispatcher:
+    """Диспетчер обновлений: чат закрепляется за одним из N шардов по chat_id.
+
+    Обновления одного чата обрабатываются строго по очереди одним потоком,
+    разные чаты - параллельно в разных шардах. Бот должен быть создан с threaded=False.
+    """
+
+    def __init__(self, bot, shards=None, queue_size=None):
+        self.bot = bot
+        # Исходный обработчик бота: вызывается потоками шардов
+        self._process = bot.process_new_updates
+        queue_size = queue_size or BotConfig.DISPATCH_QUEUE_SIZE
+        self.shards = [Shard(number, queue_size) for number in range(shards or BotConfig.DISPATCH_SHARDS)]
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Направить обновления бота (polling и process_new_updates) через диспетчер и запустить шарды"""
+        self.bot.process_new_updates = self.dispatch
+        self.start()
+
+    def start(self):
+        """Запустить потоки шардов"""
+        with self._lock:
+            for shard in self.shards:
+                if shard.thread is None or not shard.thread.is_alive():
+                    shard.thread = threading.Thread(
+                        target=self._work,
+                        args=(shard,),
+                        name=f'dispatch-shard-{shard.number}',
+                        daemon=True
+                    )
+                    shard.thread.start()
+
+    def stop(self, timeout=None):
+        """Обработать уже принятые обновления и остановить потоки шардов"""
+        with self._lock:
+            threads = [shard.thread for shard in self.shards]
+            for shard in self.shards:
+                if shard.thread is not None:
+                    shard.queue.put(None)
+                shard.thread = None
+        for thread in threads:
+            if thread is not None:
+                thread.join(timeout)
+
+    def shard_for(self, update):
+        """Шард, в котором обрабатывается обновление"""
+        return self.shards[hash(update_chat_id(update)) % len(self.shards)]
+
+    def dispatch(self, updates, block=True):
+        """Разложить обновления по очередям шардов.
+
+        При block=True ждет места в очереди (polling притормаживает получение обновлений),
+        иначе не принятые обновления отбрасываются. Возвращает False, если что-то не принято.
+        """
+        accepted = True
+        for update in updates:
+            shard = self.shard_for(update)
+            try:
+                shard.queue.put((time.monotonic(), update), block=block)
+            except queue.Full:
+                shard.drop()
+                accepted = False
+                continue
+            # Polling запрашивает обновления после last_update_id, не дожидаясь их обработки
+            if update.update_id > self.bot.last_update_id:
+                self.bot.last_update_id = update.update_id
+        return accepted
+
+    def stats(self):
+        """Статистика по шардам"""
+        return [shard.stats() for shard in self.shards]
+
+    def _work(self, shard):
+        """Цикл потока шарда"""
+        while True:
+            item = shard.queue.get()
+            if item is None:
+                return
+
+            enqueued_at, update = item
+            wait = time.monotonic() - enqueued_at
+            if wait >= BotConfig.SLOW_UPDATE_THRESHOLD:
+                logger.warning(f"Update {update.update_id} waited {wait:.3f}s in shard {shard.number}")
+
+            failed = False
+            try:
+                # По одному обновлению: process_new_updates группирует пачку по типам и меняет порядок
+                self._process([update])
+            except Exception as e:
+                failed = True
+                logger.error(f"Error processing update {update.update_id}: {e}", exc_info=True)
+            shard.record(wait, failed)
+
+class AsyncUpdateDispatcher:
+    """Диспетчер обновлений asyncio-режима: обновления одного чата обрабатываются строго по очереди,
+    разные чаты - параллельно.
+
+    AsyncTeleBot обрабатывает пачку обновлений одновременно (asyncio.gather), группируя ее по типам,
+    а следующую пачку - не дожидаясь предыдущей. Диспетчер заводит на каждый чат с необработанными
+    обновлениями очередь и задачу, которая завершается, когда очередь пустеет.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        # Исходный обработчик бота: вызывается задачами чатов
+        self._process = bot.process_new_updates
+        self._chats = {}
+        # Ссылки на задачи чатов, чтобы их не удалил сборщик мусора
+        self._tasks = set()
+
+    def install(self):
+        """Направить обновления бота (polling и process_new_updates) через диспетчер"""
+        self.bot.process_new_updates = self.dispatch
+
+    async def dispatch(self, updates):
+        """Разложить обновления по очередям чатов"""
+        for update in updates:
+            chat_id = update_chat_id(update)
+            chat_queue = self._chats.get(chat_id)
+            if chat_queue is None:
+                chat_queue = self._chats[chat_id] = deque()
+                task = asyncio.get_running_loop().create_task(self._work(chat_id, chat_queue))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            chat_queue.append((time.monotonic(), update))
+
+    async def drain(self):
+        """Дождаться обработки уже принятых обновлений"""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _work(self, chat_id, chat_queue):
+        """Задача чата: обрабатывает его обновления по одному"""
+        try:
+            while chat_queue:
+                enqueued_at, update = chat_queue.popleft()
+                wait = time.monotonic() - enqueued_at
+                if wait >= BotConfig.SLOW_UPDATE_THRESHOLD:
+                    logger.warning(f"Update {update.update_id} waited {wait:.3f}s for chat {chat_id}")
+
+                try:
+                    # По одному обновлению: process_new_updates группирует пачку по типам и меняет порядок
+                    await self._process([update])
+                except Exception as e:
+                    logger.error(f"Error processing update {update.update_id}: {e}", exc_info=True)
+        finally:
+            del self._chats[chat_id]
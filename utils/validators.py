@@ -20,11 +20,10 @@ def validate_phone(phone_str):
     return False, "Некорректный формат номера телефона. Используйте формат +380XXXXXXXXX"
 
 def admin_required(func):
-    """Декоратор для проверки прав администратора"""
+    """Декоратор общего обработчика handler(io, message) для проверки прав администратора"""
     @wraps(func)
-    def wrapper(message, *args, **kwargs):
-        from config.bot_config import BotConfig
-        if message.from_user.id not in BotConfig.ADMIN_IDS:
-            return message.reply("У вас нет прав для выполнения этой команды.")
-        return func(message, *args, **kwargs)
+    async def wrapper(io, message, *args, **kwargs):
+        if not await io.context.is_admin(message.from_user.id):
+            return await io.bot.reply_to(message, "У вас нет прав для выполнения этой команды.")
+        return await func(io, message, *args, **kwargs)
     return wrapper
\ No newline at end of file
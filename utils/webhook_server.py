@@ -0,0 +1,138 @@
+import hmac
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from telebot.types import Update
+
+from config.bot_config import BotConfig
+from config.logging_config import setup_logger
+
+logger = setup_logger()
+
+SECRET_TOKEN_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+# Обновление от Telegram не бывает больше нескольких килобайт
+MAX_BODY_SIZE = 1024 * 1024
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """Прием обновлений: проверка секрета, постановка в очередь и немедленный ответ 200"""
+
+    # Telegram держит соединения открытыми и отправляет по ним следующие обновления
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server.webhook
+        if self.path != server.path:
+            self._reply(404)
+            return
+
+        secret = self.headers.get(SECRET_TOKEN_HEADER, '')
+        if not hmac.compare_digest(secret.encode(), server.secret_token.encode()):
+            server.count('rejected')
+            self._reply(403)
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', ''))
+        except ValueError:
+            self._reply(411)
+            return
+        if not 0 < length <= MAX_BODY_SIZE:
+            self._reply(413)
+            return
+
+        body = self.rfile.read(length)
+        try:
+            update = Update.de_json(json.loads(body))
+        except Exception as e:
+            logger.warning(f"Malformed webhook update: {e}")
+            self._reply(400)
+            return
+        if not server.enqueue(update):
+            # Очередь заполнена: Telegram повторит доставку позже
+            self._reply(503)
+            return
+        self._reply(200)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Запросы не пишем в лог: их слишком много
+        pass
+
+class WebhookHTTPServer(ThreadingHTTPServer):
+    """HTTP-сервер вебхука: поток на соединение"""
+
+    daemon_threads = True
+    # Telegram открывает до max_connections соединений одновременно
+    request_queue_size = 128
+
+class WebhookServer:
+    """Локальный HTTP-сервер для вебхука Telegram.
+
+    HTTP-поток только проверяет запрос и передает обновление диспетчеру;
+    обработка выполняется потоками его шардов.
+    """
+
+    def __init__(self, dispatcher, host=None, port=None, path=None, secret_token=None):
+        self.dispatcher = dispatcher
+        self.host = host or BotConfig.WEBHOOK_HOST
+        self.port = BotConfig.WEBHOOK_PORT if port is None else port
+        self.path = path or BotConfig.WEBHOOK_PATH
+        self.secret_token = secret_token or BotConfig.WEBHOOK_SECRET
+        if not self.secret_token:
+            raise ValueError("Webhook secret token is required")
+
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self._stats = {'received': 0, 'rejected': 0, 'dropped': 0}
+
+        self.httpd = WebhookHTTPServer((self.host, self.port), WebhookRequestHandler)
+        self.httpd.webhook = self
+
+    @property
+    def address(self):
+        """Адрес, на котором слушает сервер (host, port)"""
+        return self.httpd.server_address[:2]
+
+    def count(self, name, value=1):
+        """Увеличить счетчик"""
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def enqueue(self, update):
+        """Передать обновление диспетчеру (False, если очередь его шарда заполнена)"""
+        if not self.dispatcher.dispatch([update], block=False):
+            self.count('dropped')
+            return False
+        self.count('received')
+        return True
+
+    def start(self):
+        """Запустить HTTP-сервер в фоновом потоке"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='webhook-http', daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Запустить HTTP-сервер в текущем потоке"""
+        logger.info(f"Webhook server is listening on {self.host}:{self.port}{self.path}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Остановить прием обновлений"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        """Статистика сервера"""
+        with self._stats_lock:
+            return dict(self._stats)